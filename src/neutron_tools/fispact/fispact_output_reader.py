@@ -90,6 +90,7 @@ class FispactTimeStep:
     composition: pd.DataFrame = field(default_factory=pd.DataFrame)
 
 
+@ut.timed()
 def read_fis_out(path: str) -> FispactOutput:
     """ parse a fispact output file
         returns fo, a fispact output object
@@ -141,10 +142,12 @@ def read_fis_out(path: str) -> FispactOutput:
             end = None
         data = lines[start:end]
         fo.timestep_data.append(read_time_step(data, i))
+    ut.count("time_steps_read", len(fo.timestep_data))
 
     return fo
 
 
+@ut.timed()
 def read_time_step(lines: Lines, i: int) -> FispactTimeStep:
     """ reads a particular time step """
     if not isinstance(lines, (list, tuple)) or len(lines) == 0:
@@ -291,6 +294,7 @@ def add_time_columns(df: pd.DataFrame, base_time_col: str = "time_years") -> pd.
     return df
 
 
+@ut.timed()
 def read_summary_data(data: Lines) -> pd.DataFrame:
     """ Processes the summary block at the end of the file"""
 
@@ -30,6 +30,7 @@ def particle_filter(data: pd.DataFrame, particle: str) -> pd.DataFrame:
     return data[data["particle"] == particle]
 
 
+@ut.timed()
 def read_fispact_printlib(fpath: str) -> pd.DataFrame:
     """  processes a fispact printlib file """
     if not os.path.exists(fpath):
@@ -47,7 +48,7 @@ def read_fispact_printlib(fpath: str) -> pd.DataFrame:
     in_average = False
 
     try:
-        with open(fpath, "r") as plf:
+        with ut.open_file(fpath) as plf:
             for line in plf:
                 if "fispact run time" in line:
                     discrete_lines_df = pd.DataFrame(
@@ -82,6 +83,7 @@ def read_fispact_printlib(fpath: str) -> pd.DataFrame:
     except Exception as e:
         raise IOError(f"Failed to read FISPACT printlib file {fpath}: {e}") from e
 
+    ut.count("printlib_lines_read", len(discrete_lines_df))
     return discrete_lines_df
 
 
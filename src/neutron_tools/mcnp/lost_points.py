@@ -2,6 +2,7 @@
 Reads the output file and gets a list of the co-ordinates of the lost particles
 """
 import argparse
+from neutron_tools.utilities import neut_utilities as ut
 from neutron_tools.utilities import output_utilities as o_ut
 
 
@@ -11,7 +12,7 @@ def output_lost_points(path, outpath="lost"):
     y = []
     z = []
     n_points = 0
-    with open(path, 'r') as file:
+    with ut.open_file(path) as file:
         for line in file:
             if "x,y,z coordinates:" in line:
                 x.append(float(line[28:40].strip()))
@@ -149,26 +149,26 @@ def plot_spectra(data, fname, title, sp="proton", err=False,
         bw = calc_bin_width(d.eng)
         if d.tally_type == '1':
             plt.ylabel("current n/MeV/" + sp)
-            if len(d.surfaces) > 1:
-                if len(d.ang_bins) > 1:
-                    print("not implemented yet - plotting spectra, angle and multiple surfaces")
-                    raise NotImplementedError
+            if d.ang_bins is not None and len(d.ang_bins) > 1:
+                # surface x angle x energy array, summed over time bins
+                values = d.array.values
+                if list(d.array.axes)[-1] == "time":
+                    values = d.array.total if d.array.total is not None else values.sum(axis=-1)
+                for s, surf in enumerate(d.surfaces):
+                    for a in range(len(d.ang_bins) - 1):
+                        y_vals = values[s, a] / bw
+                        label = f"mu {d.ang_bins[a]:g} to {d.ang_bins[a + 1]:g}"
+                        if len(d.surfaces) > 1:
+                            label = f"{surf} {label}"
+                        splot = plt.step(np.asarray(d.eng), y_vals, label=label)
+                plt.legend()
+
+            else:
                 for surf, df in d.result.items():
                     df_plot = df[df["energy"] != "total"]
                     y_vals = df_plot["result"].values / bw
                     splot = plt.step(np.asarray(d.eng),  y_vals, label=surf)
-
-            else:
-                if len(d.ang_bins) > 1:
-                    for ang_df in d.result:
-                        y_vals = ang_df["result"].values / bw
-                        splot = plt.step(np.asarray(d.eng),  y_vals)
-                        legend = d.ang_bins
-                else:
-                    for surf, df in d.result.items():
-                        df_plot = df[df["energy"] != "total"]
-                        y_vals = df_plot["result"].values / bw
-                        splot = plt.step(np.asarray(d.eng),  y_vals, label=surf)
+                if len(d.surfaces) == 1:
                     plt.legend()
 
         elif d.tally_type == '2':
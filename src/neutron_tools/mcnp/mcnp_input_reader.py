@@ -380,6 +380,7 @@ def process_geom(geom, cell):
     return cell
 
 
+@ut.timed()
 def process_cell_block(bloc):
     """ split cell block into cell objects """
     cell_dict = {}
@@ -757,6 +758,7 @@ def read_tally_lines(tal_num, lines):
     return tally
 
 
+@ut.timed()
 def process_data_block(mc_in):
     """ """
     mc_in.mode = read_mode_card(mc_in.data_block)
@@ -783,6 +785,7 @@ def process_data_block(mc_in):
     return mc_in
 
 
+@ut.timed()
 def process_surface_block(surf_bloc):
     """ process surface block into a surface list """
     surface_dict = {}
@@ -839,6 +842,7 @@ def check_surf_transform(surf_line):
     return False
 
 
+@ut.timed()
 def read_mcnp_input(fpath):
     """ reads the mcnp input file,
         main entry point for this module
@@ -854,6 +858,7 @@ def read_mcnp_input(fpath):
     mc_in.surfaces_dict = process_surface_block(mc_in.surface_block)
     mc_in.comments = get_full_line_comments(ifile)
     mc_in = process_data_block(mc_in)
+    ut.count("cells_read", len(mc_in.cells))
 
     return mc_in
 
@@ -0,0 +1,263 @@
+"""
+Reads the criticality results of an MCNP KCODE output file
+
+the keff of each estimator, removal lifetimes, source points and Shannon
+entropy of every cycle are taken from print table 175 with a single regex
+pass over the memory mapped table, so memory follows the number of cycles
+rather than the size of the output. The source size and number of inactive
+cycles come from the echo of the kcode card, with the MCNP defaults for j
+or missing entries, and the final keff from the combined
+collision/absorption/track-length estimate.
+
+The convergence diagnostics work on whole arrays: running averages of
+keff over the active cycles, the MCNP entropy convergence check and a
+stationarity test of every possible number of inactive cycles at once.
+"""
+import argparse
+import logging as ntlogger
+import re
+import numpy as np
+from neutron_tools.utilities import neut_utilities as ut
+
+
+TABLE_175 = b"print table 175"
+
+KCODE_CARD = re.compile(rb"^ +\d+- +kcode\b([^\n]*)", re.MULTILINE | re.IGNORECASE)
+# a jump over n entries of a card, nj or j for one
+JUMP = re.compile(r"(\d*)j", re.IGNORECASE)
+FINAL_KEFF = re.compile(rb"final estimated combined collision/absorption/track-length keff"
+                        rb" = +(\S+) +with an estimated standard deviation of +(\S+)")
+# cycle, k(col), k(abs), k(trk len), removal lifetimes (col) (abs), source points
+CYCLE_ROW = rb"^ +(\d+) +(\S+) +(\S+) +(\S+) +(\S+) +(\S+) +(\d+)"
+
+
+class MCNP_kcode_data():
+    """ criticality results of a KCODE calculation, one entry per cycle """
+
+    def __init__(self):
+        self.file_name = ""
+        self.cycle = None
+        self.keff = None
+        self.lifetime = None
+        self.source_points = None
+        self.entropy = None
+        self.inactive = 0
+        self.source_size = None
+        self.initial_keff = None
+        self.total_cycles = None
+        self.final_keff = None
+        self.final_std = None
+
+    @property
+    def active(self):
+        """ True for the cycles after the inactive cycles """
+        return self.cycle > self.inactive
+
+    def average_keff(self, inactive=None):
+        """ running average of each estimator over the active cycles
+
+        Parameters:
+        - inactive (int): number of cycles to skip, the inactive cycles of
+          the run by default
+
+        Returns:
+        - tuple of np.ndarray: (active cycles x 3) averages and standard
+          deviations of the averages for the collision, absorption and
+          track length estimators, the standard deviation is NaN for the
+          first active cycle
+        """
+        if inactive is None:
+            inactive = self.inactive
+        keff = self.keff[inactive:]
+        n = np.arange(1, len(keff) + 1)[:, np.newaxis]
+        mean = np.cumsum(keff, axis=0) / n
+        var = np.cumsum(keff ** 2, axis=0) / n - mean ** 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.maximum(var, 0.0) / (n - 1))
+        return mean, std
+
+    def entropy_converged_cycle(self):
+        """ first cycle with a source entropy within one standard deviation
+            of the mean entropy of the second half of the cycles, the check
+            MCNP prints at the end of a run
+
+        Returns:
+        - int: cycle number, None without entropy results
+        """
+        if self.entropy is None:
+            return None
+        tail = self.entropy[len(self.entropy) // 2:]
+        within = np.abs(self.entropy - tail.mean()) <= tail.std(ddof=1)
+        return int(self.cycle[np.argmax(within)])
+
+    def stationarity(self, values=None, min_cycles=10):
+        """ stationarity test of every possible number of inactive cycles,
+            the cycles after each start are split in two halves and the
+            difference of their means is compared with its standard error
+
+        Parameters:
+        - values (np.ndarray): value per cycle, the entropy by default or
+          the combined keff without entropy results
+        - min_cycles (int): least number of cycles in each half
+
+        Returns:
+        - np.ndarray: z score of each start from cycle 1, |z| above 2 or 3
+          shows the values still drift after that start
+        """
+        if values is None:
+            values = self.entropy if self.entropy is not None else self.keff.mean(axis=1)
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        starts = np.arange(max(n - 2 * min_cycles + 1, 0))
+        if not len(starts):
+            return np.zeros(0)
+        first = np.append(0.0, np.cumsum(values))
+        second = np.append(0.0, np.cumsum(values ** 2))
+        mid = (starts + n) // 2
+
+        def half(lo, hi):
+            count = hi - lo
+            mean = (first[hi] - first[lo]) / count
+            var = (second[hi] - second[lo]) / count - mean ** 2
+            return mean, np.maximum(var, 0.0) * count / (count - 1) / count
+
+        mean_a, var_a = half(starts, mid)
+        mean_b, var_b = half(mid, np.full_like(mid, n))
+        spread = np.sqrt(var_a + var_b)
+        z = np.zeros(len(starts))
+        np.divide(mean_a - mean_b, spread, out=z, where=spread > 0)
+        return z
+
+    def suggest_inactive(self, values=None, threshold=2.0, min_cycles=10):
+        """ smallest number of inactive cycles after which the values pass
+            the stationarity test, later starts are not required to pass
+            as with thousands of starts some fail by chance
+
+        Parameters:
+        - values (np.ndarray): value per cycle, see stationarity
+        - threshold (float): largest |z| accepted
+        - min_cycles (int): least number of cycles in each half
+
+        Returns:
+        - int: cycles to discard, None if no start passes
+        """
+        passing = np.abs(self.stationarity(values, min_cycles)) <= threshold
+        if not passing.any():
+            return None
+        return int(np.argmax(passing))
+
+    def __str__(self):
+        print_list = []
+        print_list.append(f"Cycles: {len(self.cycle)}")
+        print_list.append(f"Inactive cycles: {self.inactive}")
+        print_list.append(f"Entropy: {self.entropy is not None}")
+        print_list.append(f"Final keff: {self.final_keff} +- {self.final_std}")
+        return "\n".join(print_list)
+
+
+def kcode_entries(text):
+    """ entries of a kcode card, entries skipped with j or left off take
+        the MCNP defaults
+
+    Parameters:
+    - text (str): the card after the kcode keyword
+
+    Returns:
+    - tuple: source size (default 1000), initial keff guess (1.0),
+      inactive cycles (30) and total cycles (inactive + 100)
+    """
+    words = []
+    for word in text.split("$")[0].split():
+        jump = JUMP.fullmatch(word)
+        if jump:
+            words += [None] * int(jump.group(1) or 1)
+        else:
+            words.append(word)
+    words = (words + [None] * 4)[:4]
+    source_size = 1000 if words[0] is None else int(float(words[0]))
+    initial_keff = 1.0 if words[1] is None else float(words[1])
+    inactive = 30 if words[2] is None else int(float(words[2]))
+    total = inactive + 100 if words[3] is None else int(float(words[3]))
+    return source_size, initial_keff, inactive, total
+
+
+def table_end(buf, start):
+    """ end of print table 175, the table repeats its title on every page
+        so the table ends at the next print table with another number
+    """
+    pos = start
+    while True:
+        pos = buf.find(b"print table", pos + 1)
+        if pos == -1:
+            return len(buf)
+        if buf[pos:pos + len(TABLE_175)] != TABLE_175:
+            return buf.rfind(b"\n", start, pos) + 1
+
+
+@ut.timed()
+def read_kcode(path):
+    """ reads the cycle by cycle criticality results of an MCNP output
+
+    Parameters:
+    - path (str): path to the output file, may be compressed
+
+    Returns:
+    - MCNP_kcode_data: the cycle arrays, keff is (cycles x 3) for the
+      collision, absorption and track length estimators, lifetime is
+      (cycles x 2) for collision and absorption, entropy is None when the
+      source entropy was not printed
+
+    Raises:
+    - ValueError: if the output has no print table 175 or no cycles in it
+    """
+    ntlogger.info("Reading kcode results: %s", path)
+    buf = ut.map_file(path)
+    try:
+        start = buf.find(TABLE_175)
+        if start == -1:
+            raise ValueError(f"{path} has no kcode cycle results, print table 175")
+        end = table_end(buf, start)
+        final = FINAL_KEFF.search(buf, start)
+        if final is not None:
+            end = min(end, final.start())
+        card = KCODE_CARD.search(buf, 0, start)
+
+        # the column titles are on the first page, entropy follows the
+        # source points when the run has an hsrc card
+        header = buf[start:buf.find(b"\n\n", buf.find(b"cycle", start))]
+        has_entropy = b"entropy" in header
+        pattern = CYCLE_ROW + (rb" +(\S+)" if has_entropy else b"")
+        rows = re.compile(pattern, re.MULTILINE).findall(buf, start, end)
+        if not rows:
+            raise ValueError(f"{path} print table 175 has no cycles")
+        ut.count("kcode_cycles", len(rows))
+
+        kcode = MCNP_kcode_data()
+        kcode.file_name = path
+        data = np.array(rows, dtype=float).reshape(len(rows), -1)
+        if final is not None:
+            kcode.final_keff, kcode.final_std = (float(v) for v in final.groups())
+        if card is not None:
+            (kcode.source_size, kcode.initial_keff, kcode.inactive,
+             kcode.total_cycles) = kcode_entries(card.group(1).decode())
+    finally:
+        buf.close()
+
+    kcode.cycle = data[:, 0].astype(int)
+    kcode.keff = np.ascontiguousarray(data[:, 1:4])
+    kcode.lifetime = np.ascontiguousarray(data[:, 4:6])
+    kcode.source_points = data[:, 6].astype(int)
+    if has_entropy:
+        kcode.entropy = data[:, 7].copy()
+    ntlogger.debug("kcode cycles: %s", len(kcode.cycle))
+    return kcode
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="reads the kcode results of an MCNP output")
+    parser.add_argument("input", help="path to the output file")
+    args = parser.parse_args()
+    kcode = read_kcode(args.input)
+    print(kcode)
+    print(f"Entropy converged at cycle: {kcode.entropy_converged_cycle()}")
+    print(f"Suggested inactive cycles: {kcode.suggest_inactive()}")
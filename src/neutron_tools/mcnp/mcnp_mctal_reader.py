@@ -0,0 +1,332 @@
+"""
+Reads MCNP mctal files
+
+the mctal file holds the same tally results and tally fluctuation charts as
+the output file in a fixed layout that does not change between MCNP
+versions. Each tally lists its bin counts in the order f (cells, surfaces
+or detectors), d (total / direct or flagged bins), u (user), s (segment),
+m (multiplier), c (cosine), e (energy) and t (time) followed by a vals
+block of result and rel error pairs with the time bin varying fastest.
+The counts give the shape of every tally before the values are read, the
+vals block is converted with a single numpy call straight into the
+TallyArray of the tally.
+"""
+import argparse
+import logging as ntlogger
+import re
+import numpy as np
+from neutron_tools.mcnp import mcnp_output_reader as mor
+from neutron_tools.utilities import neut_utilities as ut
+
+
+# bin types of a tally in the order of the vals block, the last fastest
+BIN_TYPES = ["f", "d", "u", "s", "m", "c", "e", "t"]
+
+# TallyArray axis of each bin type, f is always the object axis
+BIN_AXES = {"u": "user_bin", "s": "segment", "m": "multiplier", "c": "angle",
+            "e": "energy", "t": "time"}
+
+# particle number on the tally line of an MCNP5 style mctal
+PARTICLES = {1: "neutrons", 2: "photons", 3: "neutrons, photons", 4: "electrons",
+             5: "neutrons, electrons", 6: "photons, electrons",
+             7: "neutrons, photons, electrons"}
+
+# order of the particle flags listed after an MCNP6 tally line
+MCNP6_PARTICLES = ["neutrons", "photons", "electrons", "mu_minus", "anti_neutrons",
+                   "electron_neutrinos", "muon_neutrinos", "positrons", "protons"]
+
+TALLY_LINE = re.compile(rb"^tally +(-?\d+) +(-?\d+) +(-?\d+)", re.MULTILINE)
+BIN_LINE = re.compile(r"^([fdusmcet])([tc]?) +(\d+)")
+
+# fortran drops the E of a three digit exponent, e.g. 1.23456-100
+SHORT_EXPONENT = re.compile(rb"(\d)([+-]\d{3})")
+
+
+class MCTAL_bins():
+    """ bin counts and labels of one tally of a mctal file """
+
+    def __init__(self):
+        self.counts = {}
+        self.labels = {}
+        self.totals = {}
+        self.particle_flags = []
+        self.comment = []
+
+    @property
+    def shape(self):
+        """ shape of the vals block, one dimension per bin type """
+        return [max(self.counts.get(key, 0), 1) for key in BIN_TYPES]
+
+
+def read_mctal_header(text):
+    """ reads the first lines of a mctal file
+
+    Parameters:
+    - text (str): file text up to the first tally line
+
+    Returns:
+    - dict: code, version, date, time, dumps, nps, random numbers, title
+      and tally numbers
+    """
+    lines = text.splitlines()
+    words = lines[0].split()
+    header = {"code": words[0], "version": words[1], "date": words[2], "time": words[3],
+              "dumps": int(words[-3]), "nps": int(words[-2]), "random_numbers": int(words[-1]),
+              "title": lines[1].strip()}
+    tnums = []
+    for line in lines[3:]:
+        tnums += [int(t) for t in line.split()]
+    header["tally_numbers"] = tnums
+    return header
+
+
+def read_bin_lines(lines):
+    """ reads the lines between a tally line and its vals line
+
+    Parameters:
+    - lines (list of str): the bin lines
+
+    Returns:
+    - MCTAL_bins: counts, labels and total flags of each bin type
+    """
+    bins = MCTAL_bins()
+    key = None
+    for line in lines:
+        match = BIN_LINE.match(line)
+        if match:
+            key = match.group(1)
+            bins.counts[key] = int(match.group(3))
+            bins.totals[key] = match.group(2) == "t"
+            bins.labels[key] = []
+        elif key is not None:
+            bins.labels[key] += line.split()
+        elif line.split() and all(w.lstrip("-").isdigit() for w in line.split()):
+            bins.particle_flags += [int(w) for w in line.split()]
+        else:
+            bins.comment.append(line.strip())
+    return bins
+
+
+def read_vals(buf, size):
+    """ converts a vals block of result and rel error pairs
+
+    Parameters:
+    - buf (bytes): the vals block
+    - size (int): number of values expected from the bin counts
+
+    Returns:
+    - np.ndarray: (size / 2 x 2) array of result, rel_err
+    """
+    try:
+        data = np.fromstring(buf, sep=" ")
+    except ValueError:
+        data = None
+    if data is None or data.size != size:
+        data = np.fromstring(SHORT_EXPONENT.sub(rb"\1E\2", buf), sep=" ")
+    if data.size != size:
+        raise ValueError(f"vals block has {data.size} values, the bins need {size}")
+    ut.count("mctal_values", size)
+    return data.reshape(-1, 2)
+
+
+def read_tfc_rows(buf):
+    """ tally fluctuation chart of a tally, the tfc line and its rows """
+    lines = buf.split(b"\n", 1)
+    rows = int(lines[0].split()[1])
+    if not rows:
+        return None
+    data = np.fromstring(lines[1], sep=" ")[:rows * 4].reshape(rows, 4)
+    tfc = mor.MCNP_tfc_data()
+    tfc.nps = data[:, 0]
+    tfc.mean, tfc.error, tfc.fom = data[:, 1:].T.copy()
+    return tfc
+
+
+def tally_particle(particle, flags):
+    """ particle name(s) from the tally line number or the MCNP6 flags """
+    if particle > 0:
+        return PARTICLES.get(particle, f"particle {particle}")
+    names = [MCNP6_PARTICLES[i] if i < len(MCNP6_PARTICLES) else f"particle {i + 1}"
+             for i, flag in enumerate(flags) if flag]
+    return ", ".join(names)
+
+
+def bin_labels(bins, key):
+    """ labels of the bins of a bin type without its total bin, the bin
+        numbers where the mctal does not list them
+    """
+    count = bins.counts[key] - bins.totals[key]
+    labels = bins.labels[key]
+    if len(labels) >= count:
+        return [float(v) for v in labels[:count]]
+    return list(range(1, count + 1))
+
+
+def build_tally(tnum, particle, detector, bins, data, nps):
+    """ tally object of a mctal tally
+
+    Parameters:
+    - tnum (int): tally number
+    - particle (int): particle number of the tally line
+    - detector (int): detector type of the tally line, 0 for none
+    - bins (MCTAL_bins): bins of the tally
+    - data (np.ndarray): vals block as (bins x 2) result, rel_err
+    - nps (int): number of histories
+
+    Returns:
+    - MCNP_tally_data: tally object as read by mcnp_output_reader
+    """
+    tally_type = str(abs(tnum) % 10)
+    if tally_type == "5" or detector:
+        tally_data = mor.MCNP_type5_tally()
+    elif tally_type in ("4", "6", "7"):
+        tally_data = mor.MCNP_cell_tally()
+    elif tally_type in ("1", "2"):
+        tally_data = mor.MCNP_surface_tally()
+    elif tally_type == "8":
+        tally_data = mor.MCNP_pulse_tally()
+    else:
+        tally_data = mor.MCNP_tally_data()
+    tally_data.number = tnum
+    tally_data.tally_type = tally_type
+    tally_data.particle = tally_particle(particle, bins.particle_flags)
+    tally_data.nps = nps
+
+    values = data[:, 0].reshape(bins.shape)
+    rel_err = data[:, 1].reshape(bins.shape)
+
+    # the f bins, detectors are not numbered in the mctal
+    if detector or not bins.labels.get("f"):
+        ids = list(range(bins.shape[0]))
+    else:
+        ids = [int(v) for v in bins.labels["f"]]
+    axes = {"object": ids}
+
+    # a detector tally has total and uncollided d bins
+    uncollided = None
+    if detector and bins.shape[1] == 2:
+        uncollided = (values[:, 1], rel_err[:, 1])
+    values, rel_err = values[:, 0], rel_err[:, 0]
+
+    # drop the unbinned dimensions, and the total bin of all but the last
+    # binned dimension which becomes the TallyArray total
+    binned = [key for key in BIN_TYPES[2:] if bins.counts.get(key, 0) > 0]
+    index = [slice(None)]
+    for key in BIN_TYPES[2:]:
+        if key not in binned:
+            index.append(0)
+        elif bins.totals[key] and key != binned[-1] and key != "u":
+            index.append(slice(0, -1))
+        else:
+            index.append(slice(None))
+    values, rel_err = values[tuple(index)], rel_err[tuple(index)]
+    if uncollided is not None:
+        uncollided = tuple(u[tuple(index)] for u in uncollided)
+
+    total = total_err = None
+    if binned and bins.totals[binned[-1]] and binned[-1] != "u":
+        total, total_err = values[..., -1], rel_err[..., -1]
+        values, rel_err = values[..., :-1], rel_err[..., :-1]
+        if uncollided is not None:
+            uncollided = tuple(u[..., :-1] for u in uncollided)
+
+    for key in binned:
+        labels = bin_labels(bins, key)
+        if key == "u":
+            labels = [str(v) for v in labels] + ["total"] * bins.totals[key]
+        axes[BIN_AXES[key]] = labels
+    tally_data.array = mor.TallyArray(np.ascontiguousarray(values),
+                                      np.ascontiguousarray(rel_err), axes,
+                                      None if total is None else total.copy(),
+                                      None if total_err is None else total_err.copy())
+    tally_data.result = None
+
+    if "energy" in axes:
+        tally_data.eng = axes["energy"]
+    if "time" in axes:
+        tally_data.times = axes["time"]
+    if "user_bin" in axes:
+        tally_data.user_bins = axes["user_bin"]
+    if isinstance(tally_data, mor.MCNP_surface_tally):
+        tally_data.surfaces = [str(i) for i in ids]
+        if "angle" in axes:
+            tally_data.ang_bins = [-1.0] + axes["angle"]
+    elif isinstance(tally_data, mor.MCNP_type5_tally):
+        if list(axes) == ["object", "time"]:
+            tally_data.eng = [0.0]
+        if list(axes) in (["object", "energy", "time"], ["object", "time"]):
+            tally_data.result, tally_data.err = mor.detector_frames(tally_data.array)
+        if uncollided is not None:
+            tally_data.uncoll_flux = np.ascontiguousarray(uncollided[0])
+            tally_data.uncoll_err = np.ascontiguousarray(uncollided[1])
+    elif hasattr(tally_data, "cells"):
+        tally_data.cells = [str(i) for i in ids]
+    return tally_data
+
+
+@ut.timed()
+def read_mctal(path):
+    """ reads an mcnp mctal file
+
+    Parameters:
+    - path (str): path to the mctal file, may be compressed
+
+    Returns:
+    - MCNPOutput: the tallies in tally_data and their fluctuation charts
+      in tfc_data, the same tally objects as read_output_file gives
+      with the results in each tally's TallyArray. Detector positions,
+      volumes and the statistical checks are not in a mctal file.
+    """
+    ntlogger.info("Reading mctal file: %s", path)
+    buf = ut.map_file(path)
+    try:
+        tally_lines = list(TALLY_LINE.finditer(buf))
+        end_of_tallies = buf.find(b"\nkcode")
+        if end_of_tallies == -1:
+            end_of_tallies = len(buf)
+
+        first = tally_lines[0].start() if tally_lines else end_of_tallies
+        header = read_mctal_header(buf[:first].decode())
+        mc_data = mor.MCNPOutput()
+        mc_data.file_name = path
+        mc_data.version = f"{header['code']}, {header['version']}"
+        mc_data.date = header["date"]
+        mc_data.start_time = header["time"]
+        mc_data.comments = [header["title"]]
+
+        for i, match in enumerate(tally_lines):
+            end = tally_lines[i + 1].start() if i + 1 < len(tally_lines) else end_of_tallies
+            vals = buf.find(b"\nvals", match.start(), end)
+            tfc = buf.find(b"\ntfc", vals, end)
+            if tfc == -1:
+                tfc = end
+            bins = read_bin_lines(buf[match.end():vals].decode().splitlines()[1:])
+            size = 2 * int(np.prod(bins.shape))
+            data = read_vals(buf[buf.find(b"\n", vals + 1):tfc], size)
+            tnum, particle, detector = (int(g) for g in match.groups())
+            mc_data.tally_data.append(build_tally(tnum, particle, detector, bins, data,
+                                                  header["nps"]))
+            if tfc < end:
+                tfc_data = read_tfc_rows(buf[tfc + 1:end])
+                if tfc_data is not None:
+                    tfc_data.number = tnum
+                    mc_data.tfc_data.append(tfc_data)
+            ut.count("tallies_parsed")
+    finally:
+        buf.close()
+
+    mc_data.tally_numbers = [tal.number for tal in mc_data.tally_data]
+    mc_data.num_tallies = len(mc_data.tally_numbers)
+    if mc_data.tally_numbers != header["tally_numbers"]:
+        ntlogger.warning("Tallies read %s differ from the mctal header %s",
+                         mc_data.tally_numbers, header["tally_numbers"])
+    return mc_data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="reads an MCNP mctal file")
+    parser.add_argument("input", help="path to the mctal file")
+    args = parser.parse_args()
+    for tally in read_mctal(args.input).tally_data:
+        print(tally)
+        print(tally.array)
@@ -0,0 +1,311 @@
+"""
+Merges the tallies of independent MCNP runs of the same problem
+
+runs with different random number seeds are combined bin by bin weighted
+by the number of histories of each run. The relative errors are rebuilt
+from the first and second moments of each run,
+
+    sum x   = N m
+    sum x^2 = N ((N - 1) (R m)^2 + m^2)
+
+which are summed over the runs and converted back to the mean and
+relative error of the merged N. Every bin of every tally of a run is held
+in one flat array, so a run is added with a handful of numpy operations
+and only the moment sums are kept between runs. Tallies the output reader
+keeps as DataFrames only, such as time binned cell and surface tallies,
+are merged frame by frame in the same flat array.
+"""
+import argparse
+import copy
+import logging as ntlogger
+from os import PathLike
+import numpy as np
+import pandas as pd
+from neutron_tools.mcnp import mcnp_output_reader as mor
+from neutron_tools.mcnp import mcnp_mctal_reader
+from neutron_tools.utilities import neut_utilities as ut
+
+
+# per run statistics that do not carry over to the merged tallies
+RUN_ATTRIBUTES = ["stat_tests", "stat_values", "average_per_history", "largest_score",
+                  "largest_score_nps", "misses", "averages_per_history", "largest_scores",
+                  "largest_scores_nps", "miss_counts"]
+
+
+def frame_pairs(tally):
+    """ the (result, rel_err) arrays of each DataFrame of a tally without a
+        TallyArray, energy x time frames take their rel errors from err and
+        the other frames have result and rel_err columns
+
+    Raises:
+    - ValueError: if the tally has no results or a frame has no errors
+    """
+    if not tally.result:
+        raise ValueError(f"Tally {tally.number} has no results to merge")
+    pairs = []
+    for key, df in tally.result.items():
+        if isinstance(tally.err, dict) and key in tally.err:
+            pairs.append((df.to_numpy(dtype=float), tally.err[key].to_numpy(dtype=float)))
+        elif "result" in df.columns and "rel_err" in df.columns:
+            pairs.append((df["result"].to_numpy(dtype=float),
+                          df["rel_err"].to_numpy(dtype=float)))
+        else:
+            raise ValueError(f"Tally {tally.number} {key} has no rel errors to merge")
+    return pairs
+
+
+def tally_pairs(tally):
+    """ the (result, rel_err) arrays of a tally that are merged, the bins,
+        their totals and the uncollided detector results
+    """
+    if tally.array is None:
+        pairs = frame_pairs(tally)
+    else:
+        pairs = [(tally.array.values, tally.array.rel_err)]
+        if tally.array.total is not None:
+            pairs.append((tally.array.total, tally.array.total_err))
+    if getattr(tally, "uncoll_flux", None) is not None:
+        pairs.append((tally.uncoll_flux, tally.uncoll_err))
+    return pairs
+
+
+def check_binning(first, tally):
+    """ checks a tally has the same bins as the tally of the first run
+
+    Parameters:
+    - first (MCNP_tally_data): tally of the first run
+    - tally (MCNP_tally_data): tally of a later run
+
+    Raises:
+    - ValueError: if the tally type, axes, bin labels or shapes differ
+    """
+    if type(first) is not type(tally) or (first.array is None) != (tally.array is None):
+        raise ValueError(f"Tally {first.number} is a different type of tally")
+    if first.array is None:
+        check_frames(first, tally)
+    elif list(first.array.axes) != list(tally.array.axes):
+        raise ValueError(f"Tally {first.number} axes {list(tally.array.axes)} differ "
+                         f"from {list(first.array.axes)}")
+    else:
+        for name, labels in first.array.axes.items():
+            if not np.array_equal(labels, tally.array.axes[name]):
+                raise ValueError(f"Tally {first.number} {name} bins differ")
+    shapes = [v.shape for v, _ in tally_pairs(tally)]
+    if shapes != [v.shape for v, _ in tally_pairs(first)]:
+        raise ValueError(f"Tally {first.number} bins have shapes {shapes}")
+
+
+def check_frames(first, tally):
+    """ checks the DataFrames of a tally have the keys and bins of the
+        tally of the first run
+
+    Raises:
+    - ValueError: if the keys, index, columns or bin columns differ
+    """
+    if list(first.result) != list(tally.result or {}):
+        raise ValueError(f"Tally {first.number} has results for {list(tally.result or {})}")
+    for key, df in first.result.items():
+        other = tally.result[key]
+        same = df.index.equals(other.index) and df.columns.equals(other.columns)
+        if same and "result" in df.columns:
+            labels = [name for name in df.columns if name not in ("result", "rel_err")]
+            same = df[labels].equals(other[labels])
+        if not same:
+            raise ValueError(f"Tally {first.number} {key} bins differ")
+
+
+def merged_frames(first, pairs):
+    """ copies of the DataFrames of the first run's tally holding the
+        merged results, in the layout of frame_pairs
+
+    Returns:
+    - tuple of dict: results and rel errors, err is None when the first
+      run has no err dict
+    """
+    result = {}
+    err = {} if isinstance(first.err, dict) else None
+    for (key, df), (values, errors) in zip(first.result.items(), pairs):
+        if err is not None and key in first.err:
+            result[key] = pd.DataFrame(values, index=df.index, columns=df.columns)
+            err[key] = pd.DataFrame(errors, index=df.index, columns=df.columns)
+        else:
+            df = df.copy()
+            df["result"] = values
+            df["rel_err"] = errors
+            result[key] = df
+    return result, err
+
+
+class MomentSums():
+    """ running sums of the first and second moments of every merged bin """
+
+    def __init__(self, tallies):
+        """
+        Parameters:
+        - tallies (list of MCNP_tally_data): tallies of the first run, the
+          layout of the flat arrays
+        """
+        self.tallies = tallies
+        self.sizes = [sum(v.size for v, _ in tally_pairs(tal)) for tal in tallies]
+        size = sum(self.sizes)
+        self.nps = np.zeros(len(tallies))
+        self.first = np.zeros(size)
+        self.second = np.zeros(size)
+        self.runs = 0
+
+    def add(self, tallies):
+        """ adds the tallies of a run, in the order of the first run """
+        values = np.concatenate([v.ravel() for tal in tallies for v, _ in tally_pairs(tal)])
+        rel_err = np.concatenate([e.ravel() for tal in tallies for _, e in tally_pairs(tal)])
+        nps = np.array([tal.nps for tal in tallies], dtype=float)
+        weights = np.repeat(nps, self.sizes)
+
+        # sum x^2 = N ((N - 1) s^2 + m^2) with s = R m
+        rel_err *= values
+        np.square(rel_err, out=rel_err)
+        rel_err *= weights - 1
+        rel_err += values * values
+        rel_err *= weights
+        self.second += rel_err
+        values *= weights
+        self.first += values
+        self.nps += nps
+        self.runs += 1
+        ut.count("merged_bins", values.size)
+
+    def result(self):
+        """ merged mean and relative error of every bin
+
+        Returns:
+        - tuple of np.ndarray: flat mean and rel_err, rel_err is 0 where
+          the mean is 0 as MCNP prints it
+        """
+        weights = np.repeat(self.nps, self.sizes)
+        mean = self.first / weights
+        var = self.second / weights
+        var -= mean * mean
+        np.maximum(var, 0.0, out=var)
+        var /= np.maximum(weights - 1, 1)
+        rel_err = np.zeros_like(mean)
+        np.divide(np.sqrt(var), np.abs(mean), out=rel_err, where=mean != 0)
+        return mean, rel_err
+
+
+def merged_tally(first, mean, rel_err, nps):
+    """ copy of the first run's tally holding the merged results
+
+    Parameters:
+    - first (MCNP_tally_data): tally of the first run
+    - mean (np.ndarray): flat merged results of the tally
+    - rel_err (np.ndarray): flat merged rel errors of the tally
+    - nps (float): total histories of the runs
+
+    Returns:
+    - MCNP_tally_data: the merged tally
+    """
+    tally = copy.copy(first)
+    fresh = type(first)()
+    for name in RUN_ATTRIBUTES:
+        if hasattr(fresh, name):
+            setattr(tally, name, getattr(fresh, name))
+    tally.nps = int(nps)
+
+    pairs = []
+    start = 0
+    for values, _ in tally_pairs(first):
+        end = start + values.size
+        pairs.append((mean[start:end].reshape(values.shape),
+                      rel_err[start:end].reshape(values.shape)))
+        start = end
+    if getattr(first, "uncoll_flux", None) is not None:
+        tally.uncoll_flux, tally.uncoll_err = pairs.pop()
+    if first.array is None:
+        tally.result, tally.err = merged_frames(first, pairs)
+        return tally
+
+    values, errors = pairs[0]
+    total = total_err = None
+    if first.array.total is not None:
+        total, total_err = pairs[1]
+    tally.array = mor.TallyArray(values, errors, first.array.axes, total, total_err)
+    tally.result = None
+    tally.err = None
+    if isinstance(first.err, dict):
+        tally.result, tally.err = mor.detector_frames(tally.array)
+    return tally
+
+
+@ut.timed()
+def merge_outputs(runs, reader=mcnp_mctal_reader.read_mctal):
+    """ merges the tallies of independent runs of the same problem
+
+    Parameters:
+    - runs (iterable): MCNPOutput objects or paths of the runs, a generator
+      or paths keep only one run in memory at a time
+    - reader (callable): reads a path into an MCNPOutput, read_mctal by
+      default, e.g. mcnp_output_reader.read_output_file for output files
+
+    Returns:
+    - MCNPOutput: the first run's metadata with every tally merged and nps
+      summed. Fluctuation charts, statistical checks and detector score
+      diagnostics are per run and are not merged.
+
+    Raises:
+    - ValueError: if there are no runs, a tally has no results with errors
+      to merge, or the tally numbers or binning of a run differ from the
+      first run
+    """
+    template = None
+    sums = None
+    for run in runs:
+        if isinstance(run, (str, PathLike)):
+            run = reader(run)
+        if template is None:
+            template = run
+            tallies = list(run.tally_data)
+            sums = MomentSums(tallies)
+            numbers = [tal.number for tal in tallies]
+        else:
+            by_number = {tal.number: tal for tal in run.tally_data}
+            missing = [tnum for tnum in numbers if tnum not in by_number]
+            if missing:
+                raise ValueError(f"Run {sums.runs + 1} does not have tallies {missing}")
+            for first in sums.tallies:
+                check_binning(first, by_number[first.number])
+            tallies = [by_number[tnum] for tnum in numbers]
+        sums.add(tallies)
+        ntlogger.debug("Merged run %s: %s", sums.runs, run.file_name)
+    if template is None:
+        raise ValueError("No runs to merge")
+
+    mean, rel_err = sums.result()
+    mc_data = mor.MCNPOutput()
+    mc_data.file_name = template.file_name
+    mc_data.version = template.version
+    mc_data.date = template.date
+    mc_data.start_time = template.start_time
+    mc_data.comments = template.comments
+    mc_data.cell_mass_volume = template.cell_mass_volume
+    mc_data.surface_area = template.surface_area
+    mc_data.t60 = template.t60
+    start = 0
+    for first, size, nps in zip(sums.tallies, sums.sizes, sums.nps):
+        mc_data.tally_data.append(merged_tally(first, mean[start:start + size],
+                                               rel_err[start:start + size], nps))
+        start += size
+    mc_data.tally_numbers = numbers
+    mc_data.num_tallies = len(numbers)
+    ntlogger.info("Merged %s runs, %s tallies", sums.runs, len(numbers))
+    return mc_data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="merges the tallies of MCNP runs")
+    parser.add_argument("inputs", nargs="+", help="paths to the mctal files of the runs")
+    parser.add_argument("--output", action="store_true",
+                        help="inputs are output files rather than mctal files")
+    args = parser.parse_args()
+    reader = mor.read_output_file if args.output else mcnp_mctal_reader.read_mctal
+    for tally in merge_outputs(args.inputs, reader).tally_data:
+        print(tally)
+        print(tally.array if tally.array is not None else tally.result)
@@ -0,0 +1,290 @@
+"""
+Persistent on disk cache of parsed MCNP output files
+
+entries are keyed on the path, size, modification time and a hash of the
+start and end of the output file together with a stamp of the parser
+source and the numpy and pandas versions, so editing the parsing code or
+upgrading the libraries invalidates them
+
+each entry is an npz file, the numeric and string arrays of the output,
+e.g. the TallyArray values, rel_err and axes and the DataFrame columns,
+are stored as arrays and the structure holding them as JSON. Loading
+never unpickles, only the reader classes in OBJECT_CLASSES are rebuilt,
+so an entry placed in a shared cache directory cannot run code.
+"""
+import argparse
+import hashlib
+import json
+import logging as ntlogger
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from neutron_tools.mcnp import mcnp_output_reader as mor
+from neutron_tools.mcnp import mcnp_print_tables as mpt
+
+CACHE_ENV = "NEUTRON_TOOLS_CACHE"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+HASH_BYTES = 1024 ** 2
+ENTRY_SUFFIX = ".npz"
+# array dtypes stored as they are, the rest are stored as lists of values
+ARRAY_KINDS = "biufcUSMm"
+# classes an entry may hold, rebuilt from their attributes
+OBJECT_CLASSES = {name: cls for name, cls in vars(mor).items()
+                  if isinstance(cls, type) and cls.__module__ == mor.__name__}
+
+
+def default_cache_dir():
+    """ cache directory from $NEUTRON_TOOLS_CACHE or ~/.cache/neutron_tools """
+    env = os.environ.get(CACHE_ENV)
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "neutron_tools"
+
+
+def parser_version():
+    """ stamp of the output reader source and the numpy and pandas versions,
+        changes whenever the parser or the pickled objects may
+    """
+    digest = hashlib.sha1()
+    for source in (mor.__file__, mpt.__file__, __file__):
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    digest.update(f"numpy={np.__version__}|pandas={pd.__version__}".encode())
+    return digest.hexdigest()[:16]
+
+
+def file_fingerprint(path, hash_bytes=HASH_BYTES):
+    """ fingerprint of a file from its path, size, mtime and a hash of the
+        first and last hash_bytes of its contents
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        digest.update(f.read(hash_bytes))
+        if stat.st_size > hash_bytes:
+            f.seek(max(stat.st_size - hash_bytes, hash_bytes))
+            digest.update(f.read())
+    return f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{digest.hexdigest()}"
+
+
+def encode(obj, arrays):
+    """ JSON compatible description of obj, its arrays are added to arrays
+        under the names the description refers to them by
+
+    Parameters:
+    - obj: MCNPOutput or any of its attributes
+    - arrays (dict): name -> np.ndarray, filled in
+
+    Returns:
+    - JSON compatible value, every dict in it is a tagged container
+
+    Raises:
+    - TypeError: for values that cannot be stored without pickling
+    """
+    if obj is None or (isinstance(obj, (bool, int, float, str)) and not isinstance(obj, np.generic)):
+        return obj
+    if isinstance(obj, (np.ndarray, np.generic)):
+        arr = np.asarray(obj)
+        if arr.dtype.kind in ARRAY_KINDS:
+            name = f"a{len(arrays)}"
+            arrays[name] = arr
+            return {"array": name}
+        return {"objects": [encode(v, arrays) for v in arr.ravel().tolist()],
+                "shape": list(arr.shape)}
+    if isinstance(obj, list):
+        return [encode(v, arrays) for v in obj]
+    if isinstance(obj, tuple):
+        return {"tuple": [encode(v, arrays) for v in obj]}
+    if isinstance(obj, dict):
+        return {"dict": [[encode(k, arrays), encode(v, arrays)] for k, v in obj.items()]}
+    if isinstance(obj, pd.DataFrame):
+        return {"frame": [encode_series(obj.iloc[:, i], arrays) for i in range(obj.shape[1])],
+                "columns": encode_index(obj.columns, arrays),
+                "index": encode_index(obj.index, arrays)}
+    if isinstance(obj, pd.Series):
+        return {"series": encode_series(obj, arrays), "name": encode(obj.name, arrays),
+                "index": encode_index(obj.index, arrays)}
+    if OBJECT_CLASSES.get(type(obj).__name__) is type(obj):
+        return {"object": type(obj).__name__, "attributes": encode(vars(obj), arrays)}
+    raise TypeError(f"Cannot cache values of type {type(obj).__name__}")
+
+
+def encode_series(series, arrays):
+    """ the values and dtype of a DataFrame column or Series """
+    values = series.to_numpy()
+    if values.dtype.kind in ARRAY_KINDS and values.dtype == series.dtype:
+        return {"values": encode(values, arrays), "dtype": None}
+    return {"values": [encode(v, arrays) for v in values.tolist()], "dtype": str(series.dtype)}
+
+
+def encode_index(index, arrays):
+    """ the labels, dtype and name of a DataFrame index """
+    if isinstance(index, pd.MultiIndex):
+        raise TypeError("Cannot cache a MultiIndex")
+    if isinstance(index, pd.RangeIndex):
+        return {"range": [index.start, index.stop, index.step], "name": encode(index.name, arrays)}
+    return {"labels": encode_series(index.to_series(), arrays), "name": encode(index.name, arrays)}
+
+
+def decode(node, arrays):
+    """ rebuilds the value described by encode
+
+    Parameters:
+    - node: JSON value from encode
+    - arrays (mapping): name -> np.ndarray, e.g. an NpzFile
+
+    Returns:
+    - the stored value
+    """
+    if isinstance(node, list):
+        return [decode(v, arrays) for v in node]
+    if not isinstance(node, dict):
+        return node
+    if "array" in node:
+        arr = arrays[node["array"]]
+        return arr[()] if arr.ndim == 0 else arr
+    if "objects" in node:
+        arr = np.empty(len(node["objects"]), dtype=object)
+        arr[:] = [decode(v, arrays) for v in node["objects"]]
+        return arr.reshape(node["shape"])
+    if "tuple" in node:
+        return tuple(decode(v, arrays) for v in node["tuple"])
+    if "dict" in node:
+        return {decode(k, arrays): decode(v, arrays) for k, v in node["dict"]}
+    if "frame" in node:
+        df = pd.DataFrame({i: decode_series(col, arrays) for i, col in enumerate(node["frame"])})
+        df.columns = decode_index(node["columns"], arrays)
+        df.index = decode_index(node["index"], arrays)
+        return df
+    if "series" in node:
+        return pd.Series(decode_series(node["series"], arrays), name=decode(node["name"], arrays),
+                         index=decode_index(node["index"], arrays))
+    if "object" in node:
+        cls = OBJECT_CLASSES[node["object"]]
+        obj = cls.__new__(cls)
+        obj.__dict__.update(decode(node["attributes"], arrays))
+        return obj
+    raise ValueError(f"Unknown cache entry node {sorted(node)}")
+
+
+def decode_series(node, arrays):
+    """ the values of a column stored by encode_series """
+    if node["dtype"] is None:
+        return pd.Series(decode(node["values"], arrays))
+    values = np.empty(len(node["values"]), dtype=object)
+    values[:] = [decode(v, arrays) for v in node["values"]]
+    return pd.Series(values, dtype=node["dtype"])
+
+
+def decode_index(node, arrays):
+    """ the index stored by encode_index """
+    name = decode(node["name"], arrays)
+    if "range" in node:
+        return pd.RangeIndex(*node["range"], name=name)
+    return pd.Index(decode_series(node["labels"], arrays), name=name)
+
+
+class OutputCache():
+    """ size bounded least recently used cache of MCNPOutput objects """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.version = parser_version()
+
+    def key(self, path, **options):
+        """ cache key for the file at path read with the given options """
+        parts = [file_fingerprint(path), self.version]
+        parts += [f"{k}={options[k]!r}" for k in sorted(options)]
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def entry_path(self, key):
+        """ location of the cache entry for key """
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, path, **options):
+        """ returns the cached MCNPOutput for path or None if not cached """
+        entry = self.entry_path(self.key(path, **options))
+        if not entry.exists():
+            ntlogger.debug("cache miss: %s", path)
+            return None
+        try:
+            with np.load(entry, allow_pickle=False) as data:
+                tree = json.loads(data["tree"].tobytes().decode())
+                mc_data = decode(tree, data)
+        except Exception as e:
+            # any failure to read, e.g. a truncated entry or one from an
+            # older layout, is treated as a miss
+            ntlogger.warning("removing unreadable cache entry %s: %s", entry, e)
+            entry.unlink(missing_ok=True)
+            return None
+        # mark as recently used
+        os.utime(entry)
+        ntlogger.debug("cache hit: %s", path)
+        return mc_data
+
+    def put(self, path, mc_data, **options):
+        """ stores mc_data for path then evicts old entries over the size
+            limit, an output holding values encode cannot store is not
+            cached
+        """
+        arrays = {}
+        try:
+            tree = encode(mc_data, arrays)
+        except TypeError as e:
+            ntlogger.warning("not caching %s: %s", path, e)
+            return
+        arrays["tree"] = np.frombuffer(json.dumps(tree).encode(), dtype=np.uint8)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self.entry_path(self.key(path, **options))
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, entry)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def entries(self):
+        """ cache entries, least recently used first """
+        if not self.cache_dir.exists():
+            return []
+        return sorted(self.cache_dir.glob(f"*{ENTRY_SUFFIX}"), key=lambda p: p.stat().st_mtime_ns)
+
+    def size(self):
+        """ total size in bytes of the cache entries """
+        return sum(p.stat().st_size for p in self.entries())
+
+    def evict(self):
+        """ removes least recently used entries until within max_bytes """
+        entries = self.entries()
+        total = sum(p.stat().st_size for p in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            ntlogger.debug("evicting cache entry %s", entry)
+            entry.unlink()
+
+    def clear(self):
+        """ removes every cache entry """
+        for entry in self.entries():
+            entry.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCNP output cache maintenance")
+    parser.add_argument("--dir", help="cache directory", default=None)
+    parser.add_argument("--clear", action="store_true", help="remove all entries")
+    args = parser.parse_args()
+
+    cache = OutputCache(args.dir)
+    if args.clear:
+        cache.clear()
+    print(f"{cache.cache_dir}: {len(cache.entries())} entries, {cache.size()} bytes")
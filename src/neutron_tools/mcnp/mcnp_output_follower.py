@@ -0,0 +1,176 @@
+"""
+Follows an MCNP output file while the run is still writing to it,
+parsing only the data appended since the last poll
+"""
+import argparse
+import logging as ntlogger
+import os
+import time
+
+from neutron_tools.mcnp import mcnp_output_reader as mor
+
+CHUNK_BYTES = 16 * 1024 ** 2
+RENDEZVOUS = b"master set rendezvous nps"
+
+
+class MCNPOutputFollower():
+    """ incremental reader for a growing MCNP output file
+
+        the first poll starts from the last complete set of tallies, the
+        second last rendezvous as find_last_rendevous gives, and each later
+        poll reads from the byte offset reached by the previous one. The
+        file is read in chunks of at most chunk_bytes and tally blocks are
+        parsed with the standard tally handlers once the next 1tally line
+        shows they are complete. A file that shrinks, e.g. a rerun writing
+        over it, is read again from the start. The run is finished once the
+        closing run terminated or computer time line has been read.
+    """
+
+    def __init__(self, path, callback=None, chunk_bytes=CHUNK_BYTES):
+        self.path = path
+        self.callback = callback
+        self.chunk_bytes = chunk_bytes
+        self.reset()
+
+    def reset(self):
+        """ forgets everything read so far """
+        self.offset = 0
+        self.started = False
+        self.num_rendevous = 0
+        self.finished = False
+        self.latest = {}
+        self.block = None
+        self.block_tnum = None
+
+    def chunks(self, f):
+        """ complete lines of the file from the current position in blocks
+            of about chunk_bytes, a partial last line is left for later
+
+        Returns:
+        - generator of (bytes, int): the lines and the offset they start at
+        """
+        start = f.tell()
+        pending = b""
+        while True:
+            chunk = f.read(self.chunk_bytes)
+            if not chunk:
+                return
+            data = pending + chunk
+            end = data.rfind(b"\n") + 1
+            pending = data[end:]
+            if end:
+                yield data[:end], start
+                start += end
+
+    def last_rendezvous(self, f):
+        """ offset of the line of the second last rendezvous, where the
+            last complete set of tallies starts, and the number of
+            rendezvous before it
+
+        Returns:
+        - tuple of int: (offset, rendezvous), (0, 0) with fewer than two
+        """
+        f.seek(0)
+        starts = []
+        count = 0
+        for data, start in self.chunks(f):
+            pos = data.find(RENDEZVOUS)
+            while pos != -1:
+                count += 1
+                starts = starts[-1:] + [start + data.rfind(b"\n", 0, pos) + 1]
+                pos = data.find(RENDEZVOUS, pos + 1)
+        if count < 2:
+            return 0, 0
+        return starts[0], count - 2
+
+    def poll(self):
+        """ reads any complete lines appended since the last poll
+
+        Returns:
+        - list of MCNP_tally_data: tallies completed during this poll
+        """
+        updates = []
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self.offset:
+                ntlogger.info("%s shrank, reading it again from the start", self.path)
+                self.reset()
+            if not self.started:
+                self.offset, self.num_rendevous = self.last_rendezvous(f)
+                self.started = True
+                ntlogger.debug("starting %s at byte %s", self.path, self.offset)
+            f.seek(self.offset)
+            for data, start in self.chunks(f):
+                self.offset = start + len(data)
+                ntlogger.debug("read %s new bytes from %s", len(data), self.path)
+                updates += self._read_lines(data)
+        return updates
+
+    def _read_lines(self, data):
+        """ follows the tally blocks and run progress through complete lines """
+        updates = []
+        for line in data.decode(errors="replace").splitlines():
+            if line.startswith("1tally"):
+                if self.block is not None:
+                    updates.append(self._finish_block())
+                if line[0:11] == "1tally     " and "nps =" in line:
+                    self.block = [line]
+                    self.block_tnum = int(line.split()[1])
+                continue
+            if self.block is not None:
+                self.block.append(line)
+            if "master set rendezvous nps" in line:
+                self.num_rendevous += 1
+            elif line[:20] == " run terminated when" or line[:16] == " computer time =":
+                # the closing lines after the final tallies, the indented
+                # run terminated line is printed before them
+                self.finished = True
+        return updates
+
+    def _finish_block(self):
+        """ parses the tally block just completed and records it """
+        tally = mor.read_tally_block(self.block, self.block_tnum)
+        self.block = None
+        self.block_tnum = None
+        self.latest[tally.number] = tally
+        if self.callback is not None:
+            self.callback(tally)
+        return tally
+
+    def follow(self, interval=60.0, timeout=None):
+        """ generator polling the file every interval seconds, yielding the
+            list of tallies updated by each poll that found any
+
+        Parameters:
+        - interval (float): seconds between polls
+        - timeout (float): stop after this many seconds without new data,
+          None keeps polling until the run terminates and the file stops
+          growing
+        """
+        idle = 0.0
+        while True:
+            if os.path.exists(self.path):
+                before = self.offset
+                updates = self.poll()
+                if updates:
+                    yield updates
+                if self.offset != before:
+                    idle = 0.0
+                elif self.finished:
+                    return
+            if timeout is not None and idle >= timeout:
+                return
+            time.sleep(interval)
+            idle += interval
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follow a running MCNP output file")
+    parser.add_argument("input", help="path to the output file")
+    parser.add_argument("-i", "--interval", type=float, default=60.0,
+                        help="seconds between polls of the file")
+    args = parser.parse_args()
+
+    follower = MCNPOutputFollower(args.input)
+    for tallies in follower.follow(args.interval):
+        for tal in tallies:
+            print(f"tally {tal.number} updated at nps {tal.nps}")
@@ -2,11 +2,16 @@
 Reads MCNP output file
 """
 import argparse
+import bisect
+import glob
 import logging as ntlogger
 import numpy as np
 import pandas as pd
 import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from neutron_tools.mcnp import mcnp_print_tables as mpt
 from neutron_tools.utilities import neut_utilities as ut
 
 
@@ -27,15 +32,88 @@ class MCNPOutput():
         self.summary_data = []
         self.tfc_data = []
         self.t60 = None
+        self.print_tables = {}
         self.warnings = []
         self.comments = []
         self.tables = []
         self.fatal = False
+        self.tally_numbers = []
+        self.index = None
+        self.source = None
+        self._cell_index = None
+
+    def tally(self, tnum):
+        """ returns the tally object for tally number tnum, when the file
+            was read lazily the tally is parsed on first access and cached
+            in tally_data
+        """
+        for tal in self.tally_data:
+            if tal.number == int(tnum):
+                return tal
+        if self.source is None:
+            raise ValueError(f"Tally {tnum} not found")
+
+        start, end = self.index.tally_block(tnum)
+        tal = read_tally_block(decode_lines(self.source, start, end), tnum)
+        self.tally_data.append(tal)
+        return tal
+
+    def table(self, number):
+        """ returns print table number as a DataFrame, when the file was
+            read lazily the table is parsed on first access and cached in
+            print_tables
+        """
+        number = str(number)
+        if number in self.print_tables:
+            return self.print_tables[number]
+        if self.source is None or number not in self.tables:
+            raise ValueError(f"Print table {number} not read")
+
+        start = self.tables[number]
+        table = mpt.read_print_table(decode_lines(self.source, start, page_end(self.source, start)),
+                                     number)
+        self.print_tables[number] = table
+        return table
+
+    def cell_props(self, cells):
+        """ properties of many cells at once from print table 60
+
+        Parameters:
+        - cells (list or array of int): cell numbers
+
+        Returns:
+        - pd.DataFrame: indexed by cell in the order of cells, with the mat,
+          atom density, gram density, volume, mass, pieces and importance
+          columns of table 60
+
+        Raises:
+        - ValueError: if table 60 was not read
+        - KeyError: if any cell is not in table 60
+        """
+        if self.t60 is None:
+            self.t60 = table60_frame(self.table(60))
+        if self._cell_index is None:
+            # hash index of cell number to row, built once
+            self._cell_index = pd.Index(self.t60["cell"])
+        cells = np.atleast_1d(np.asarray(cells, dtype=np.int64))
+        rows = self._cell_index.get_indexer(cells)
+        if (rows < 0).any():
+            raise KeyError(f"Cells {cells[rows < 0].tolist()} not in table 60")
+        return self.t60.iloc[rows].set_index("cell")
+
+    def close(self):
+        """ releases the memory map of a lazily read file """
+        if self.source is not None:
+            self.source.close()
+            self.source = None
 
 
 class MCNP_tally_data():
     """ generic tally object for data common to all tally types """
 
+    # whether energy result frames end with a "total" row
+    total_row = True
+
     def __init__(self):
         # general data all tallies have
         self.number = 1
@@ -46,13 +124,31 @@ class MCNP_tally_data():
         self.err = None
         self.eng = None
         self.stat_tests = None
+        self.stat_values = None
         self.times = None
         self.user_bins = None
+        self.array = None
+
+    @property
+    def result(self):
+        """ results as a dict of DataFrames keyed on cell, surface or
+            detector, when the tally was read into a TallyArray the dict is
+            only built on first access
+        """
+        if self._result is None and self.array is not None:
+            self._result = self.array.to_dict(self.total_row)
+        return self._result
+
+    @result.setter
+    def result(self, value):
+        self._result = value
 
 
 class MCNP_type5_tally(MCNP_tally_data):
     """ specific tally object for a type 5 point detector tally """
 
+    total_row = False
+
     def __init__(self):
         MCNP_tally_data.__init__(self)
         # for type 5 tallies
@@ -67,11 +163,31 @@ class MCNP_type5_tally(MCNP_tally_data):
         self.largest_score_nps = 0.0
         self.average_per_history = 0.0
         self.misses = None
+        # one row per detector
+        self.positions = None
+        self.radii = None
+        self.averages_per_history = None
+        self.largest_scores = None
+        self.largest_scores_nps = None
+        self.miss_counts = None
+
+    @property
+    def uncollided_fraction(self):
+        """ uncollided results as a fraction of the results, nan where the
+            result is zero
+        """
+        if self.uncoll_flux is None or self.array is None:
+            return None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.array.values != 0,
+                            self.uncoll_flux / self.array.values, np.nan)
 
     def __str__(self):
         print_list = []
         print_list.append(f"Tally number: {self.number}")
         print_list.append(f"Particle: {self.particle}")
+        if self.positions is not None:
+            print_list.append(f"Detectors: {len(self.positions)}")
         print_list.append(f"X: {self.x}")
         print_list.append(f"Y: {self.y}")
         print_list.append(f"Z: {self.z}")
@@ -125,12 +241,29 @@ class MCNP_cell_tally(MCNP_tally_data):
         # for type 4
         self.cells = None
         self.vols = None
+        self.lattice = None
+
+    def lattice_grid(self):
+        """ results and rel errors of a lattice tally placed on the lattice
+
+        Returns:
+        - tuple of np.ndarray: (chain, i, j, k, ...) arrays of the results
+          and rel errors, see LatticeBins.grid
+
+        Raises:
+        - ValueError: if the tally bins are not lattice elements
+        """
+        if self.lattice is None:
+            raise ValueError(f"Tally {self.number} is not over lattice elements")
+        return self.lattice.grid(self.array.values), self.lattice.grid(self.array.rel_err)
 
     def __str__(self):
         print_list = []
         print_list.append(f"Tally number: {self.number}")
         print_list.append(f"Particle: {self.particle}")
         print_list.append(f"Number of Cells: {len(self.cells)}")
+        if self.lattice is not None:
+            print_list.append(f"Lattice: {self.lattice}")
         if self.eng is not None:
             print_list.append("Energy Bins: True")
         else:
@@ -145,6 +278,8 @@ class MCNP_cell_tally(MCNP_tally_data):
 class MCNP_pulse_tally(MCNP_tally_data):
     """ specific tally object for a type 8 pulse height tally"""
 
+    total_row = False
+
     def __init__(self):
         MCNP_tally_data.__init__(self)
         # for type 8
@@ -174,6 +309,8 @@ class MCNP_summary_data():
         self.summary_type = 1
         self.nps = 1
         self.particle = "Neutron"
+        self.creation = None
+        self.loss = None
 
     def __str__(self):
         print_list = []
@@ -182,6 +319,465 @@ class MCNP_summary_data():
         return "\n".join(print_list)
 
 
+class MCNP_tally_history():
+    """ results of every printout of a tally, one row per printout """
+
+    def __init__(self):
+        self.number = 1
+        self.rendevous = None
+        self.nps = None
+        self.bins = None
+        self.result = None
+        self.rel_err = None
+
+    def relative_fom(self):
+        """ figure of merit per bin using nps in place of computer time,
+            proportional to the true fom while the run rate is constant
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fom = 1.0 / (self.rel_err ** 2 * self.nps[:, np.newaxis])
+        fom[~np.isfinite(fom)] = 0.0
+        return fom
+
+    def __str__(self):
+        print_list = []
+        print_list.append(f"Tally number: {self.number}")
+        print_list.append(f"Printouts: {len(self.nps)}")
+        print_list.append(f"Bins: {len(self.bins)}")
+        return "\n".join(print_list)
+
+
+class MCNP_tfc_data():
+    """ tally fluctuation chart of a tally, one entry per nps printed """
+
+    def __init__(self):
+        self.number = 1
+        self.nps = None
+        self.mean = None
+        self.error = None
+        self.vov = None
+        self.slope = None
+        self.fom = None
+
+    def fom_trend(self):
+        """ slope of a straight line fit to the fom over the second half of
+            the run, relative to the mean fom there. Close to zero when the
+            fom is constant as it should be, negative when it is falling.
+        """
+        half = len(self.nps) // 2
+        nps = self.nps[half:]
+        fom = self.fom[half:]
+        if len(nps) < 2 or not fom.mean():
+            return 0.0
+        slope = np.polyfit(nps / nps[-1], fom, 1)[0]
+        return slope / fom.mean()
+
+    def __str__(self):
+        print_list = []
+        print_list.append(f"Tally number: {self.number}")
+        print_list.append(f"Printouts: {len(self.nps)}")
+        return "\n".join(print_list)
+
+
+class TallyArray():
+    """ dense storage of tally results, value and rel_err arrays with one
+        labelled axis per bin type, the first axis is always "object" (cell,
+        surface or detector). The total over the last axis, if the tally
+        prints one, is kept separately in total and total_err.
+    """
+
+    def __init__(self, values, rel_err, axes, total=None, total_err=None):
+        """
+        Parameters:
+        - values (np.ndarray): results, one dimension per axis
+        - rel_err (np.ndarray): relative errors, same shape as values
+        - axes (dict): axis name -> bin labels, in the order of the
+          dimensions, e.g. {"object": cells, "energy": energies}
+        - total (np.ndarray): total over the last axis for each of the
+          other bins, shape values.shape[:-1]
+        - total_err (np.ndarray): relative error of total
+        """
+        self.values = values
+        self.rel_err = rel_err
+        self.axes = {name: np.asarray(labels) for name, labels in axes.items()}
+        self.total = total
+        self.total_err = total_err
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        """ memory used by the arrays """
+        arrays = [self.values, self.rel_err, self.total, self.total_err]
+        arrays += list(self.axes.values())
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def positions(self, axis, labels):
+        """ positions along axis of the given bin labels """
+        lookup = {label: i for i, label in enumerate(self.axes[axis].tolist())}
+        return np.array([lookup[label] for label in np.atleast_1d(labels).tolist()], dtype=int)
+
+    def sel(self, **labels):
+        """ sub array for the given bin labels on one or more axes,
+            e.g. arr.sel(object=[10, 11]) picks two cells
+        """
+        values = self.values
+        rel_err = self.rel_err
+        total = self.total
+        total_err = self.total_err
+        axes = dict(self.axes)
+        last = len(axes) - 1
+        for dim, name in enumerate(self.axes):
+            if name not in labels:
+                continue
+            pos = self.positions(name, labels[name])
+            values = np.take(values, pos, axis=dim)
+            rel_err = np.take(rel_err, pos, axis=dim)
+            axes[name] = self.axes[name][pos]
+            if dim == last:
+                # totals no longer match a subset of the summed bins
+                total = None
+                total_err = None
+            elif total is not None:
+                total = np.take(total, pos, axis=dim)
+                total_err = np.take(total_err, pos, axis=dim)
+        return TallyArray(values, rel_err, axes, total, total_err)
+
+    def to_dict(self, total_row=True):
+        """ the results in the dict of DataFrames layout of
+            MCNP_tally_data.result, with more than two axes the keys are
+            tuples of the labels of all but the last axis
+
+        Parameters:
+        - total_row (bool): end energy frames with the "total" row, type 5
+          and type 8 frames have never had one
+        """
+        ids = self.axes["object"].tolist()
+        if self.values.ndim == 1:
+            return {oid: pd.DataFrame({"result": [v], "rel_err": [e]})
+                    for oid, v, e in zip(ids, self.values.tolist(), self.rel_err.tolist())}
+
+        names = list(self.axes)
+        labels = [self.axes[name].tolist() for name in names[:-1]]
+        last = self.axes[names[-1]]
+        data_dict = {}
+        for index in np.ndindex(*self.values.shape[:-1]):
+            key = tuple(label[i] for label, i in zip(labels, index))
+            total = None
+            if self.total is not None and total_row:
+                total = (self.total[index], self.total_err[index])
+            if names[-1] == "energy":
+                rows = np.column_stack([last, self.values[index], self.rel_err[index]])
+                df = energy_result_df(rows, total)
+            else:
+                df = pd.DataFrame({names[-1]: last, "result": self.values[index],
+                                   "rel_err": self.rel_err[index]})
+            data_dict[key[0] if len(key) == 1 else key] = df
+        return data_dict
+
+    def to_dataframe(self):
+        """ long format table with a column per axis plus result and
+            rel_err, total bins have a coordinate of inf
+        """
+        ids = self.axes["object"]
+        if self.values.ndim == 1:
+            return pd.DataFrame({"object": ids, "result": self.values,
+                                 "rel_err": self.rel_err})
+        coords = {name: labels if labels.dtype.kind in "iuf" else _bin_coords(labels)
+                  for name, labels in self.axes.items()}
+        values = self.values
+        rel_err = self.rel_err
+        if self.total is not None:
+            last = list(coords)[-1]
+            coords[last] = np.append(coords[last], np.inf)
+            values = np.concatenate([values, self.total[..., None]], axis=-1)
+            rel_err = np.concatenate([rel_err, self.total_err[..., None]], axis=-1)
+        grid = np.meshgrid(*coords.values(), indexing="ij")
+        data = {name: g.ravel() for name, g in zip(coords, grid)}
+        data["result"] = values.ravel()
+        data["rel_err"] = rel_err.ravel()
+        return pd.DataFrame(data)
+
+    def __str__(self):
+        print_list = []
+        for name, labels in self.axes.items():
+            print_list.append(f"{name}: {len(labels)}")
+        print_list.append(f"Totals: {self.total is not None}")
+        return "\n".join(print_list)
+
+
+class LatticeBins():
+    """ lattice element of each bin of a repeated structure tally, bins
+        such as 1<2[3 4 0]<5 are split into the (i, j, k) index of the
+        innermost lattice and the universe chain 1 < 2 < 5 around it
+    """
+
+    def __init__(self, labels):
+        """
+        Parameters:
+        - labels (list of str): bin labels in the order of the tally bins
+
+        Raises:
+        - ValueError: if a label has no lattice index
+        """
+        index = []
+        chain_id = []
+        chains = {}
+        for label in labels:
+            match = LATTICE_INDEX.search(label)
+            if match is None:
+                raise ValueError(f"Bin {label} has no lattice index")
+            index.append(match.groups())
+            chain = label[:match.start()] + label[match.end():]
+            chain = tuple(level.strip() for level in chain.split("<"))
+            chain_id.append(chains.setdefault(chain, len(chains)))
+        self.index = np.array(index, dtype=int).reshape(-1, 3)
+        self.chain_id = np.array(chain_id, dtype=int)
+        self.chains = list(chains)
+        self.lower = self.index.min(axis=0)
+        self.shape = tuple(int(n) for n in self.index.max(axis=0) - self.lower + 1)
+
+    def grid(self, values):
+        """ places the values of each bin at its lattice element
+
+        Parameters:
+        - values (np.ndarray): one row per bin, e.g. TallyArray.values
+
+        Returns:
+        - np.ndarray: (chain, i, j, k, ...) array offset by lower, NaN
+          where an element was not tallied
+        """
+        out = np.full((len(self.chains),) + self.shape + values.shape[1:], np.nan)
+        i, j, k = (self.index - self.lower).T
+        out[self.chain_id, i, j, k] = values
+        return out
+
+    def __str__(self):
+        return f"{len(self.chains)} chains of {self.shape}, lower index {self.lower.tolist()}"
+
+
+class OutputIndex():
+    """ index of the sections of an MCNP output file, built in a single
+        pass by build_output_index (line numbers) or build_byte_index
+        (byte offsets)
+    """
+
+    def __init__(self):
+        self.in_bytes = False
+        self.end = 0
+        self.term_line = None
+        self.rendevous = []
+        self.tally_headers = defaultdict(list)
+        self.tally_bounds = []
+        self.tfc = []
+        self.summaries = []
+        self.tables = {}
+        self.fatal = []
+        self.warnings = []
+        self.comments = []
+
+    def tally_numbers(self):
+        """ tally numbers in the file in numerical order """
+        return sorted(self.tally_headers)
+
+    def last_result_line(self):
+        """ line the final result set starts from, the term line or if the
+            run did not finish the last complete rendevous
+        """
+        if self.term_line is not None:
+            return self.term_line
+        ntlogger.debug("trying to find last complete rendevous")
+        # the last one is generally at the end of the file, if not a complete run
+        # therefore index of last complete set is the second last one
+        if len(self.rendevous) < 2:
+            ntlogger.debug("not enough rendevous points found")
+            return None
+        return self.rendevous[-2]
+
+    def rendevous_of(self, line_id):
+        """ position in the rendevous list of the last rendevous before
+            line_id, -1 if there is none
+        """
+        return bisect.bisect_right(self.rendevous, line_id) - 1
+
+    def tally_block(self, tnum, start=None):
+        """ finds the first printout of tally tnum after line start
+
+        Parameters:
+        - tnum (int or str): tally number
+        - start (int): line to search from, defaults to the final result set
+
+        Returns:
+        - tuple: (header line, end line), the end line is the next line
+          beginning with 1tally or the end of the file
+        """
+        if start is None:
+            start = self.last_result_line() or 0
+        headers = self.tally_headers.get(int(tnum), [])
+        pos = bisect.bisect_left(headers, start)
+        if pos == len(headers):
+            raise ValueError(f"Tally {tnum} not found after line {start}")
+        header = headers[pos]
+        bound = bisect.bisect_right(self.tally_bounds, header)
+        if bound < len(self.tally_bounds):
+            end = self.tally_bounds[bound]
+        else:
+            end = self.end
+        return header, end
+
+    def tfc_start(self):
+        """ line the tally fluctuation charts of the final result set start
+            at, None if there are none
+        """
+        if not self.tfc:
+            return None
+        pos = bisect.bisect_left(self.tfc, self.last_result_line() or 0)
+        return self.tfc[min(pos, len(self.tfc) - 1)]
+
+    def tally_printouts(self, tnum):
+        """ all printouts of a tally as a list of (rendevous position,
+            header line) tuples
+        """
+        return [(self.rendevous_of(h), h) for h in self.tally_headers.get(int(tnum), [])]
+
+
+@ut.timed()
+def build_output_index(lines):
+    """ single scan of the output file lines recording where each section
+        of interest starts
+
+    Parameters:
+    - lines (list of str): lines of an MCNP output file
+
+    Returns:
+    - OutputIndex: line numbers of the term line, rendevous, tally headers,
+      print tables, problem summaries, fatal errors, warnings and comments
+    """
+    index = OutputIndex()
+    index.end = len(lines)
+    for i, line in enumerate(lines):
+        if line.startswith("1tally"):
+            index.tally_bounds.append(i)
+            if line[0:11] == "1tally     ":
+                index.tally_headers[int(line.split()[1])].append(i)
+            elif line.startswith("1tally fluctuation charts"):
+                index.tfc.append(i)
+        elif line.startswith("1problem summary"):
+            index.summaries.append(i)
+        elif line.startswith("  comment."):
+            index.comments.append(i)
+        elif line.startswith("  warning."):
+            index.warnings.append(i)
+        elif index.term_line is None and line[:21] == "      run terminated ":
+            index.term_line = i
+
+        if "master set rendezvous nps" in line:
+            index.rendevous.append(i)
+        if "print table" in line:
+            key = line.split(" ")[-1]
+            if not (key == '160' or key == '161' or len(key) > 3):
+                index.tables[key] = i
+        if "fatal" in line.lower():
+            index.fatal.append(i)
+
+    index.tally_headers = dict(index.tally_headers)
+    ntlogger.debug("Tally numbers: %s", index.tally_numbers())
+    ut.count("lines_scanned", len(lines))
+    return index
+
+
+BYTE_INDEX_PATTERN = re.compile(
+    rb"(?P<tally>^1tally(?P<header> {5} *(?P<tnum>\d+))?)"
+    rb"|(?P<summary>^1problem summary)"
+    rb"|(?P<comment>^  comment\.)"
+    rb"|(?P<warning>^  warning\.)"
+    rb"|(?P<term>^      run terminated )"
+    rb"|(?P<rendevous>master set rendezvous nps)"
+    rb"|(?P<table>print table)"
+    rb"|(?P<fatal>[Ff][Aa][Tt][Aa][Ll])",
+    re.M)
+
+
+@ut.timed()
+def build_byte_index(buf):
+    """ equivalent of build_output_index for the raw bytes of an output
+        file, e.g. a memory map, recording byte offsets of line starts
+        rather than line numbers
+
+    Parameters:
+    - buf (bytes or mmap.mmap): contents of an MCNP output file
+
+    Returns:
+    - OutputIndex: byte offsets of the start of each indexed line
+    """
+    index = OutputIndex()
+    index.in_bytes = True
+    index.end = len(buf)
+    for match in BYTE_INDEX_PATTERN.finditer(buf):
+        kind = match.lastgroup
+        if kind in ("tally", "header", "tnum"):
+            pos = match.start()
+            index.tally_bounds.append(pos)
+            if match.group("header") is not None:
+                index.tally_headers[int(match.group("tnum"))].append(pos)
+            elif buf[pos:pos + 25] == b"1tally fluctuation charts":
+                index.tfc.append(pos)
+            continue
+        pos = buf.rfind(b"\n", 0, match.start()) + 1
+        if kind == "summary":
+            index.summaries.append(pos)
+        elif kind == "comment":
+            index.comments.append(pos)
+        elif kind == "warning":
+            index.warnings.append(pos)
+        elif kind == "term":
+            if index.term_line is None:
+                index.term_line = pos
+        elif kind == "rendevous":
+            index.rendevous.append(pos)
+        elif kind == "table":
+            key = decode_line(buf, pos).split(" ")[-1]
+            if not (key == '160' or key == '161' or len(key) > 3):
+                index.tables[key] = pos
+        elif not index.fatal or index.fatal[-1] != pos:
+            index.fatal.append(pos)
+
+    index.tally_headers = dict(index.tally_headers)
+    ntlogger.debug("Tally numbers: %s", index.tally_numbers())
+    ut.count("bytes_scanned", len(buf))
+    return index
+
+
+def decode_line(buf, pos):
+    """ decodes the single line starting at byte offset pos """
+    end = buf.find(b"\n", pos)
+    if end == -1:
+        end = len(buf)
+    line = decode_lines(buf, pos, end)
+    return line[0] if line else ""
+
+
+def decode_lines(buf, start, end):
+    """ decodes the bytes between two offsets into a list of lines """
+    return buf[start:end].decode(errors="replace").splitlines()
+
+
+def page_end(buf, start):
+    """ byte offset of the end of the page starting at start, pages that
+        repeat its title line are treated as part of it
+    """
+    title = decode_line(buf, start)
+    end = start
+    while True:
+        end = buf.find(b"\n1", end + 1)
+        if end == -1:
+            return len(buf)
+        if decode_line(buf, end + 1) != title:
+            return end
+
+
 def read_version(lines):
     """ from 1st line of output get the MCNP version
     Parameters:
@@ -299,11 +895,78 @@ def process_ang_string(line):
     return ang_float
 
 
-def read_summary(data, ptype, rnum):
-    """ reads the summary tables in the output file """
-    return 1
+def read_summary_half(line):
+    """ splits one side of a creation or loss row into its event label and
+        tracks, weight and energy, None for a blank side
+    """
+    words = line.split()
+    if len(words) < 4:
+        return None
+    try:
+        return " ".join(words[:-3]), int(words[-3]), float(words[-2]), float(words[-1])
+    except ValueError:
+        return None
+
 
+@ut.timed()
+def read_summary(lines, start=0):
+    """ reads the particle creation and loss tables of a problem summary
 
+    Parameters:
+    - lines (list of str): lines of the output file
+    - start (int): line the problem summary starts at
+
+    Returns:
+    - list of MCNP_summary_data: one per particle type, creation and loss
+      are DataFrames of tracks, weight and energy (per source particle)
+      indexed by event
+    """
+    summaries = []
+    nps = None
+    i = start + 1
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("1"):
+            break
+        if nps is None and "run terminated when" in line:
+            nps = int(line.split()[3])
+        match = re.match(r" (\S+) creation +tracks", line)
+        if match is None:
+            i += 1
+            continue
+
+        particle = match.group(1)
+        split = line.index(f"{particle} loss")
+        rows = {"creation": [], "loss": []}
+        i += 1
+        while i < len(lines):
+            row = lines[i]
+            i += 1
+            if row.strip() == "":
+                continue
+            for key, half in (("creation", row[:split]), ("loss", row[split:])):
+                values = read_summary_half(half)
+                if values is not None:
+                    rows[key].append(values)
+            if row.split()[0] == "total":
+                break
+
+        summary = MCNP_summary_data()
+        summary.number = len(summaries) + 1
+        summary.summary_type = "creation and loss"
+        summary.particle = particle
+        if nps is not None:
+            summary.nps = nps
+        for key, values in rows.items():
+            df = pd.DataFrame(values, columns=["event", "tracks", "weight", "energy"])
+            setattr(summary, key, df.set_index("event"))
+        summaries.append(summary)
+
+    ntlogger.debug("Read %s problem summary tables", len(summaries))
+    return summaries
+
+
+@ut.timed()
 def read_table101(lines, start_line):
     """
     Read particle energy limits and table limits from print table 101.
@@ -340,35 +1003,15 @@ def read_table101(lines, start_line):
 def read_table60(lines, start_line):
     """ read print table 60
         input a list of strings
-        returns a dataframe with table 60 data
+        returns a dataframe with table 60 data, one row per cell with
+        numeric columns
     """
+    return table60_frame(mpt.read_print_table(lines[start_line:], 60))
 
-    term_line = ut.find_line("    minimum source weight", lines, 25)
-
-    table_lines = [ut.string_cleaner(line) for line in lines[start_line:term_line]]
-
-    # header is split over two lines
-    header1 = table_lines[2]
-    header1 = header1.split(" ")
-    header2 = table_lines[3]
-    header2 = header2.split(" ")
-    # density headings
-    header2[2] = header1[0] + " " + header2[2]
-    header2[3] = header1[1] + " " + header2[3]
-    # importances -
-    # TODO more than 1 importance
-    header2[-1] = header1[-1] + " " + header2[-1]
 
-    # process the data section
-    datalines = table_lines[5:-3]
-    data = []
-    for line in datalines:
-        dataline = line.split(" ")
-        data.append(dataline[1:])
-
-    t60df = pd.DataFrame(data, columns=header2)
-
-    return t60df
+def table60_frame(table):
+    """ t60 from the parsed print table, without the cell index column """
+    return table.drop(columns="index")
 
 
 def print_tally_lines_to_file(lines, fname, tnum):
@@ -455,6 +1098,170 @@ def eng_time_get_eng_bins(data):
     return energy_bins
 
 
+def float_rows(text, ncols=None):
+    """ converts a block of whitespace separated numbers to a 2d array with
+        a single bulk conversion rather than a float() per value
+
+    Parameters:
+    - text (str): block of text, one row per line
+    - ncols (int): number of values on each line, by default the number
+      on the first line
+
+    Returns:
+    - np.ndarray: array of shape (rows, ncols)
+    """
+    nrows = text.count("\n") + (len(text) > 0 and not text.endswith("\n"))
+    if ncols is None:
+        ncols = len(text.split("\n", 1)[0].split())
+    try:
+        values = np.fromstring(text, sep=" ")
+    except ValueError:
+        values = None
+    # older numpy versions stop at a bad value with only a warning
+    if values is None or values.size != nrows * ncols:
+        values = np.array(text.split(), dtype=float)
+    return values.reshape(-1, ncols)
+
+
+def energy_result_df(data, total=None):
+    """ builds the energy, result, rel_err DataFrame from an array of rows
+        of energy ... result rel_err, optionally appending the total row
+    """
+    if total is None:
+        return pd.DataFrame({"energy": data[:, 0], "result": data[:, -2],
+                             "rel_err": data[:, -1]})
+    energy = np.empty(len(data) + 1, dtype=object)
+    energy[:-1] = data[:, 0].tolist()
+    energy[-1] = "total"
+    return pd.DataFrame({"energy": energy,
+                         "result": np.append(data[:, -2], total[0]),
+                         "rel_err": np.append(data[:, -1], total[1])})
+
+
+@ut.timed()
+def split_energy_blocks(lines, label):
+    """ finds the energy binned results for each cell or surface of a tally
+
+        the result lines between every "label N" header and its total line
+        are gathered and converted together by float_rows
+
+    Parameters:
+    - lines (list of str): tally block lines
+    - label (str): "cell" or "surface"
+
+    Returns:
+    - tuple: (ids, blocks, totals), the cell or surface numbers, a list of
+      (energy bins x 3) arrays of energy, result, rel_err and a list of
+      (result, rel_err) totals or None where there is no total line
+    """
+    text = "\n" + "\n".join(lines) + "\n"
+    headers = [m for m in re.finditer(rf"\n *{label} +(\d+)[^\n]*\n(?: *energy *\n)?", text)
+               if int(m.group(1))]
+
+    ids = []
+    chunks = []
+    totals = []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        total = text.find(" total ", header.end(), end)
+        if total == -1:
+            # no total line, keep only the lines that look like results
+            rows = [line for line in text[header.end():end].splitlines()
+                    if len(line.split()) == 3 and line.split()[0][:1].isdigit()]
+            chunks.append("".join(line + "\n" for line in rows))
+            totals.append(None)
+        else:
+            line_end = text.find("\n", total)
+            parts = text[total:line_end].split()
+            chunks.append(text[header.end():text.rfind("\n", header.end() - 1, total) + 1])
+            totals.append((float(parts[1]), float(parts[2])) if len(parts) == 3 else None)
+        ids.append(int(header.group(1)))
+
+    data = float_rows("".join(chunks), 3)
+    ut.count("result_rows", len(data))
+    counts = np.cumsum([chunk.count("\n") for chunk in chunks])[:-1]
+    return ids, np.split(data, counts), totals
+
+
+def read_energy_blocks(lines, label):
+    """ reads the energy binned results for each cell or surface of a tally
+
+    Parameters:
+    - lines (list of str): tally block lines
+    - label (str): "cell" or "surface"
+
+    Returns:
+    - dict[int, pd.DataFrame]: id -> DataFrame with columns energy, result,
+      rel_err and a final energy == "total" row
+    """
+    ids, blocks, totals = split_energy_blocks(lines, label)
+    return {bid: energy_result_df(rows, total)
+            for bid, rows, total in zip(ids, blocks, totals)}
+
+
+def read_energy_array(lines, label):
+    """ reads the energy binned results for each cell or surface of a tally
+        into a TallyArray with object and energy axes
+
+    Parameters:
+    - lines (list of str): tally block lines
+    - label (str): "cell" or "surface"
+
+    Returns:
+    - TallyArray or dict: the array, or the read_energy_blocks dict if the
+      cells or surfaces do not share the same energy bins and totals
+    """
+    ids, blocks, totals = split_energy_blocks(lines, label)
+    has_total = [total is not None for total in totals]
+    if not ids or any(len(rows) != len(blocks[0]) for rows in blocks) or \
+            len(set(has_total)) > 1:
+        return {bid: energy_result_df(rows, total)
+                for bid, rows, total in zip(ids, blocks, totals)}
+
+    data = np.stack(blocks)
+    energy = data[0, :, 0].copy()
+    if not (data[:, :, 0] == energy).all():
+        return {bid: energy_result_df(rows, total)
+                for bid, rows, total in zip(ids, blocks, totals)}
+
+    total = total_err = None
+    if has_total[0]:
+        total, total_err = np.array(totals).T
+    return TallyArray(data[:, :, 1].copy(), data[:, :, 2].copy(),
+                      {"object": ids, "energy": energy}, total, total_err)
+
+
+def single_value_array(ids, values):
+    """ TallyArray of a tally with a single result per cell or surface
+
+    Parameters:
+    - ids (list of int): cell or surface numbers
+    - values (list of tuple): (result, rel_err) for each id
+    """
+    values = np.array(values, dtype=float).reshape(-1, 2)
+    return TallyArray(values[:, 0].copy(), values[:, 1].copy(), {"object": ids})
+
+
+def set_energy_results(tally_data, lines, label):
+    """ reads an energy binned cell or surface tally into tally_data, as
+        a TallyArray when the binning is regular
+    """
+    result = read_energy_array(lines, label)
+    if isinstance(result, TallyArray):
+        tally_data.array = result
+        tally_data.result = None
+        tally_data.eng = result.axes["energy"].tolist()
+    else:
+        tally_data.result = result
+        first_key = next(iter(result))
+        tally_data.eng = (
+            result[first_key]
+            .loc[result[first_key]["energy"] != "total", "energy"]
+            .tolist()
+        )
+    return tally_data
+
+
 def process_energy_lines(erg_lines):
     """ Process the results section for a tally with only energy bins.
 
@@ -465,18 +1272,9 @@ def process_energy_lines(erg_lines):
         A ``"total"`` row is **not** appended here; callers that need it
         should add it after calling this function.
     """
-    erg = []
-    res = []
-    rel_err = []
-
-    for line in erg_lines:
-        line = line.strip()
-        line = line.split(" ")
-        erg.append(float(line[0]))
-        res.append(float(line[3]))
-        rel_err.append(float(line[4]))
-
-    return pd.DataFrame({"energy": erg, "result": res, "rel_err": rel_err})
+    if not erg_lines:
+        return energy_result_df(np.empty((0, 3)))
+    return energy_result_df(float_rows("\n".join(erg_lines)))
 
 
 def convert_energy_time_data_to_df(data, time_bins, energy_bins):
@@ -617,30 +1415,48 @@ def find_last_rendevous(lines):
         return indexes[-2]
 
 
-def read_tally(lines, tnum, rnum=-1):
-    """ reads the lines and extracts the tally results"""
+def read_tally(lines, tnum, rnum=-1, index=None):
+    """ reads the lines and extracts the tally results
 
-    # todo add ability to do all rendevous
-    # reduce to only the final result set
-    term_line = find_term_line(lines)
-    if term_line is None:
-        ntlogger.debug("trying to find last complete rendevous")
-        term_line = find_last_rendevous(lines)
+    Parameters:
+    - lines (list of str): lines of the output file
+    - tnum (int or str): tally number
+    - rnum (int): rendevous number, -1 for the final result set otherwise
+      the printout following that rendevous in the index
+    - index (OutputIndex): index of lines, built if not given
+
+    Returns:
+    - MCNP_tally_data: the tally object for the selected result set
+    """
+    if index is None:
+        index = build_output_index(lines)
+
+    # reduce to only the selected result set
+    start = None if rnum == -1 else index.rendevous[rnum]
+    res_start_line, tal_end_line = index.tally_block(tnum, start)
+    ntlogger.debug('Run term line number: %s', str(index.term_line))
 
-    lines = lines[term_line:]
+    return read_tally_block(lines[res_start_line:tal_end_line], tnum)
 
-    # reduce to only the tally results section
-    fline = "1tally" + ((9 - len(str(tnum))) * " ")
-    res_start_line = ut.find_line(fline + str(tnum), lines, 15)
 
-    # add an error catch
+@ut.timed()
+def read_tally_block(block, tnum):
+    """ extracts the tally results from a single tally printout
 
+    Parameters:
+    - block (list of str): lines from the 1tally header line up to but not
+      including the next line starting 1tally
+    - tnum (int or str): tally number
+
+    Returns:
+    - MCNP_tally_data: the appropriate tally object for the tally type
+    """
     # Check if tally comment
-    tal_comment_bool = lines[res_start_line + 1][0] == "+"
+    tal_comment_bool = block[1][0] == "+"
 
     # Find tally type and create an appropriate class
     type_index = 2 if tal_comment_bool else 1
-    tally_type = lines[res_start_line+type_index][22]
+    tally_type = block[type_index][22]
 
     if tally_type == '5':
         tally_data = MCNP_type5_tally()
@@ -658,10 +1474,10 @@ def read_tally(lines, tnum, rnum=-1):
 
     # get particle type
     particle_index = 3 if tal_comment_bool else 2
-    tally_data.particle = lines[res_start_line+particle_index][24:33]
+    tally_data.particle = block[particle_index][24:33]
 
     tally_data.particle = ut.string_cleaner(tally_data.particle)
-    tally_data.nps = ut.string_cleaner(lines[res_start_line][28:40])
+    tally_data.nps = ut.string_cleaner(block[0][28:40])
     try:
         tally_data.nps = int(tally_data.nps)
     except ValueError:
@@ -670,18 +1486,14 @@ def read_tally(lines, tnum, rnum=-1):
     tally_data.tally_type = tally_type
 
     # limit lines to just the tally data
-    lines = lines[res_start_line + 1:]
-    tal_end_line = ut.find_line("1tally", lines, 6)
-    lines = lines[:tal_end_line - 1]
+    lines = block[1:-1]
 
     # print tally test file
     print_tally_lines_to_file(lines, "tally_test", tnum)
 
     # debug
     ntlogger.info('Reading tally %s', str(tnum))
-    ntlogger.debug('Run term line number: %s', str(term_line))
-    ntlogger.debug('Result start line number: %s', str(res_start_line))
-    ntlogger.debug('tally end line number: %s', str(tal_end_line))
+    ntlogger.debug('tally block length: %s', str(len(block)))
     ntlogger.debug('tally particle: %s', tally_data.particle)
     ntlogger.debug('tally nps: %s', str(tally_data.nps))
     ntlogger.debug('tally type: %s', str(tally_data.tally_type))
@@ -698,50 +1510,147 @@ def read_tally(lines, tnum, rnum=-1):
     else:
         ntlogger.info("Tally type not recognised or supported")
 
-    # get statistical test outcomes
-    # first check not all zeros
-    # if np.array(tally_data.result).any():
-    #    tally_data.stat_tests = read_stat_tests(lines)
+    # get statistical test outcomes, not printed for every tally
+    checks = read_stat_checks(lines)
+    if checks is not None:
+        tally_data.stat_tests, tally_data.stat_values = checks
 
     return tally_data
 
 
+PULSE_HEIGHT_HEADER = re.compile(
+    r"^ (?:cell +(\d+)|user bin +(\S+))[^\n]*\n( *energy *\n)?", re.MULTILINE)
+
+
+@ut.timed()
+def split_pulse_height_blocks(lines):
+    """ finds the results of each cell, and user bin if the tally has them,
+        of a pulse height tally
+
+        the cells are discovered from the " cell N" headers, every energy
+        binned block is gathered and converted together by float_rows
+
+    Parameters:
+    - lines (list of str): tally block lines
+
+    Returns:
+    - tuple: (keys, blocks, totals), (cell, user bin) pairs with a user bin
+      of None if the tally has none, a list of arrays of energy, result,
+      rel_err rows, or a single result, rel_err row if there are no energy
+      bins, and a list of (result, rel_err) totals or None
+    """
+    text = "\n" + "\n".join(lines) + "\n"
+    stop = text.find("\n ===")
+    if stop != -1:
+        text = text[:stop + 1]
+    headers = list(PULSE_HEIGHT_HEADER.finditer(text))
+
+    keys = []
+    chunks = []
+    energy_binned = []
+    totals = []
+    cell = None
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        if header.group(1) is not None:
+            cell = int(header.group(1))
+            user_bin = None
+        else:
+            user_bin = header.group(2)
+        chunk = text[header.end():end]
+        if not chunk.strip():
+            # cell header followed directly by its first user bin
+            continue
+        total = chunk.find(" total ")
+        if header.group(3) is not None and total != -1:
+            parts = chunk[total:chunk.find("\n", total)].split()
+            totals.append((float(parts[1]), float(parts[2])) if len(parts) == 3 else None)
+            chunk = chunk[:chunk.rfind("\n", 0, total) + 1]
+        else:
+            totals.append(None)
+        keys.append((cell, user_bin))
+        chunks.append(chunk.strip() + "\n")
+        energy_binned.append(header.group(3) is not None)
+
+    if not keys:
+        return keys, [], totals
+    if not all(energy_binned):
+        data = float_rows("".join(chunks), 2)
+        return keys, list(data[:, None, :]), totals
+
+    data = float_rows("".join(chunks), 3)
+    ut.count("result_rows", len(data))
+    counts = np.cumsum([chunk.count("\n") for chunk in chunks])[:-1]
+    return keys, np.split(data, counts), totals
+
+
 def read_type_8(tally_data, lines):
     """ process type 8 tally output data
         note: type 8 tally cannot have time bins
+
+        regular results, every cell with the same user and energy bins, are
+        read into a TallyArray with object, user_bin (if used) and energy
+        axes
     """
     ntlogger.debug("pulse height tally")
-    # TODO: fix this hard coded part
-    tally_data.cells = ["2"]  # this should not be hard coded
-
-    # loop for each cell
-    for cell in tally_data.cells:
-        cell_id = int(cell)
-        cline = " cell  "
-        cell_res_start = ut.find_line(cline + cell, lines,
-                                      len(cell) + len(cline))
-        if lines[cell_res_start + 1] == "      energy   ":
-            ntlogger.debug("noticed energy")
-            loc_line_id2 = ut.find_line("      total    ",
-                                        lines[cell_res_start + 1:], 15)
-            erg_lines = lines[cell_res_start + 2:cell_res_start +
-                              1 + loc_line_id2]
-            df = process_energy_lines(erg_lines)
-            tally_data.eng = df["energy"].tolist()
-            tally_data.result = {cell_id: df}
+    keys, blocks, totals = split_pulse_height_blocks(lines)
+    cells = list(dict.fromkeys(cell for cell, _ in keys))
+    tally_data.cells = [str(cell) for cell in cells]
+    if not keys:
+        ntlogger.info("No cell results found for pulse height tally")
+        return tally_data
+
+    user_bins = list(dict.fromkeys(ubin for _, ubin in keys))
+    if user_bins != [None]:
+        tally_data.user_bins = user_bins
+    energy_binned = blocks[0].shape[1] == 3
+
+    regular = (len(keys) == len(cells) * len(user_bins)
+               and all(len(rows) == len(blocks[0]) for rows in blocks)
+               and len({total is None for total in totals}) == 1)
+    if regular and energy_binned:
+        data = np.stack(blocks)
+        regular = bool((data[:, :, 0] == data[0, :, 0]).all())
+
+    if not regular:
+        ntlogger.debug("irregular pulse height bins, reading as DataFrames")
+        if energy_binned:
+            tally_data.eng = blocks[0][:, 0].tolist()
+        tally_data.result = {
+            key if tally_data.user_bins is not None else key[0]:
+                energy_result_df(rows) if energy_binned else
+                pd.DataFrame({"result": rows[:, 0], "rel_err": rows[:, 1]})
+            for key, rows in zip(keys, blocks)}
+        return tally_data
+
+    axes = {"object": cells}
+    shape = [len(cells)]
+    if tally_data.user_bins is not None:
+        axes["user_bin"] = user_bins
+        shape.append(len(user_bins))
+    if not energy_binned:
+        values = np.array([rows[0] for rows in blocks])
+        if tally_data.user_bins is None:
+            tally_data.array = single_value_array(cells, values)
         else:
-            # single value result
-            ntlogger.debug('tally e bin count = 1')
-            line = lines[cell_res_start + 1]
-            line = line.strip()
-            line = line.split(" ")
-            tally_data.result = {
-                cell_id: pd.DataFrame({"result": [float(line[0])],
-                                       "rel_err": [float(line[1])]})
-            }
-
-    if tally_data.eng is not None:
-        ntlogger.debug('tally e bin count: %s', len(tally_data.eng))
+            tally_data.array = TallyArray(values[:, 0].reshape(shape).copy(),
+                                          values[:, 1].reshape(shape).copy(), axes)
+        tally_data.result = None
+        return tally_data
+
+    energy = data[0, :, 0].copy()
+    axes["energy"] = energy
+    shape.append(len(energy))
+    total = total_err = None
+    if totals[0] is not None:
+        total, total_err = np.array(totals).T
+        total = total.reshape(shape[:-1])
+        total_err = total_err.reshape(shape[:-1])
+    tally_data.array = TallyArray(data[:, :, 1].reshape(shape), data[:, :, 2].reshape(shape),
+                                  axes, total, total_err)
+    tally_data.result = None
+    tally_data.eng = energy.tolist()
+    ntlogger.debug('tally e bin count: %s', len(tally_data.eng))
 
     return tally_data
 
@@ -782,55 +1691,157 @@ def get_type1_surface_numbers(lines):
     return surface_list
 
 
-def process_energy_angle_tally(tally_data, lines, first_surface_line_id):
-    """Process a surface tally with angle and energy bins.
+ANGLE_HEADER = re.compile(
+    r"^ (?:surface +(\d+)|angle  bin: *(\S+) +to +(\S+))[^\n]*\n", re.MULTILINE)
 
-    Returns
-    -------
-    tuple[list[pd.DataFrame], list[float]]
-        ``(angle_dfs, angles_bins)`` where ``angle_dfs`` is a list of
-        DataFrames (one per angle bin) with columns ``energy``,
-        ``result``, ``rel_err``, and ``angles_bins`` is the list of
-        upper angle-bin edges starting with ``-1.0``.
+# header lines dropped before the bulk conversion of an angle bin or
+# detector, the total row of each energy block is kept with an inf energy
+BIN_LABEL_LINES = re.compile(r"\n *(?:time:|energy)[^\n]*")
+BIN_TOTAL_ROW = re.compile(r"\n *total ")
+
+
+def bin_layout(chunk):
+    """ energy and time bins of the results of one angle bin or detector
+
+    Returns:
+    - tuple: (energies, time_blocks, time_total), the energy bins (None if
+      not energy binned), the labels of each time block (None if not time
+      binned) and whether the last time column is the total
     """
+    time_blocks = None
+    time_total = False
+    time_lines = re.findall(r"^ *time:([^\n]*)", chunk, re.MULTILINE)
+    if time_lines:
+        time_blocks = [line.split() for line in time_lines]
+        time_total = time_blocks[-1][-1] == "total"
+
+    energies = None
+    if re.search(r"^ *energy *$", chunk, re.MULTILINE):
+        first_block = re.split(r"^ *total ", chunk, maxsplit=1, flags=re.MULTILINE)[0]
+        first_block = BIN_LABEL_LINES.sub("", "\n" + first_block)
+        energies = [float(line.split()[0]) for line in first_block.splitlines()
+                    if line.strip()]
+    return energies, time_blocks, time_total
+
+
+def read_bin_blocks(chunks):
+    """ converts the results of several bins sharing the same energy and
+        time binning, e.g. the angle bins of a surface tally or the
+        detectors of a point detector tally, with a single float_rows call
 
-    ntlogger.debug("energy bins")
-    angles_bins = [-1.0]
-
-    ebin = []
-    rel_err = []
-    res = []
-    angle_dfs = []
-    in_res = False
-
-    for line in lines[first_surface_line_id:]:
-        if line[:11] == " angle  bin":
-            ang_float = process_ang_string(line)
-            angles_bins.append(ang_float)
-
-        if line[:13] == "      total  ":
-            in_res = False
-            ebin_arr = np.array(ebin, dtype=float)
-            tally_data.eng = ebin_arr.tolist()
-            df = pd.DataFrame({
-                "energy": ebin_arr,
-                "result": np.array(res, dtype=float),
-                "rel_err": np.array(rel_err, dtype=float),
-            })
-            angle_dfs.append(df)
-            ebin = []
-            rel_err = []
-            res = []
-        if in_res:
-            line = line.strip()
-            line = line.split(" ")
-            ebin.append(float(line[0]))
-            res.append(float(line[3]))
-            rel_err.append(float(line[4]))
-        if line == "      energy   ":
-            in_res = True
+    Parameters:
+    - chunks (list of str): the result lines of each bin, below its header
 
-    return angle_dfs, angles_bins
+    Returns:
+    - tuple: (values, rel_err, total, total_err, axes), arrays with one row
+      per chunk then the energy and time dimensions, the total over the
+      last dimension (None if not printed) and the energy and time axes
+    """
+    energies, time_blocks, time_total = bin_layout(chunks[0])
+    rows = len(energies) + 1 if energies is not None else 1
+    if time_blocks is None:
+        per_chunk = rows * (3 if energies is not None else 2)
+    else:
+        per_chunk = sum(rows * ((1 if energies is not None else 0) + 2 * len(block))
+                        for block in time_blocks)
+
+    numbers = BIN_LABEL_LINES.sub("", "\n" + "".join(chunks))
+    numbers = BIN_TOTAL_ROW.sub("\n inf ", numbers)
+    ut.count("result_rows", numbers.count("\n"))
+    try:
+        data = float_rows(numbers.replace("\n", " "), len(chunks) * per_chunk)
+    except ValueError as err:
+        raise ValueError("bins of the tally do not share the same energy "
+                         "and time bins") from err
+    data = data.reshape(len(chunks), per_chunk)
+
+    total = total_err = None
+    axes = {}
+    if time_blocks is None and energies is None:
+        values, rel_err = data[:, 0], data[:, 1]
+    elif time_blocks is None:
+        data = data.reshape(len(chunks), rows, 3)
+        values, rel_err = data[:, :-1, 1], data[:, :-1, 2]
+        total, total_err = data[:, -1, 1], data[:, -1, 2]
+        axes["energy"] = energies
+    else:
+        label = 1 if energies is not None else 0
+        values = []
+        rel_err = []
+        offset = 0
+        for block in time_blocks:
+            width = label + 2 * len(block)
+            sub = data[:, offset:offset + rows * width].reshape(len(chunks), rows, width)
+            # the last row of an energy block is its total over energy
+            sub = sub[:, :-1] if energies is not None else sub
+            values.append(sub[:, :, label::2])
+            rel_err.append(sub[:, :, label + 1::2])
+            offset += rows * width
+        values = np.concatenate(values, axis=-1)
+        rel_err = np.concatenate(rel_err, axis=-1)
+        times = [float(t) for block in time_blocks for t in block if t != "total"]
+        if time_total:
+            total, total_err = values[..., -1], rel_err[..., -1]
+            values, rel_err = values[..., :-1], rel_err[..., :-1]
+        if energies is not None:
+            axes["energy"] = energies
+        else:
+            values, rel_err = values[:, 0], rel_err[:, 0]
+            if total is not None:
+                total, total_err = total[:, 0], total_err[:, 0]
+        axes["time"] = times
+
+    return (np.ascontiguousarray(values), np.ascontiguousarray(rel_err),
+            total, total_err, axes)
+
+
+@ut.timed()
+def read_angle_array(lines):
+    """ reads the results of a surface tally with angle bins into a
+        TallyArray with object, angle, energy (if binned) and time (if
+        binned) axes, every angle bin of every surface is converted with a
+        single float_rows call
+
+    Parameters:
+    - lines (list of str): tally block lines
+
+    Returns:
+    - tuple: (TallyArray, ang_bins), ang_bins being the lower edge of the
+      first angle bin followed by the upper edge of every bin
+    """
+    text = "\n" + "\n".join(lines) + "\n"
+    stop = text.find("\n ===")
+    if stop != -1:
+        text = text[:stop + 1]
+    headers = list(ANGLE_HEADER.finditer(text))
+
+    surfaces = []
+    ang_bins = []
+    chunks = []
+    for i, header in enumerate(headers):
+        if header.group(1) is not None:
+            surfaces.append(int(header.group(1)))
+            continue
+        if len(surfaces) == 1:
+            if not ang_bins:
+                ang_bins.append(float(header.group(2)))
+            ang_bins.append(float(header.group(3)))
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        chunks.append(text[header.end():end])
+    if not chunks:
+        raise ValueError("no angle bins found in surface tally")
+    nang = len(ang_bins) - 1
+    if len(chunks) != len(surfaces) * nang:
+        raise ValueError("surfaces of the tally do not share the same angle bins")
+
+    values, rel_err, total, total_err, bin_axes = read_bin_blocks(chunks)
+    axes = {"object": surfaces, "angle": ang_bins[1:]}
+    axes.update(bin_axes)
+    shape = [len(surfaces), nang] + [len(labels) for labels in bin_axes.values()]
+    array = TallyArray(values.reshape(shape), rel_err.reshape(shape), axes,
+                       None if total is None else total.reshape(shape[:-1]),
+                       None if total_err is None else total_err.reshape(shape[:-1]))
+    return array, ang_bins
 
 
 def process_energy_binned_surface_tally(lines):
@@ -843,50 +1854,7 @@ def process_energy_binned_surface_tally(lines):
         ``energy``, ``result``, ``rel_err``.  A final row with
         ``energy == "total"`` is appended for each surface.
     """
-    data_dict = defaultdict(list)
-    total_data = {}
-
-    current_surface = None
-    for line in lines:
-        line = line.strip()
-
-        # Detect new surface block
-        surface_match = re.match(r"surface\s+(\d+)", line)
-        if surface_match:
-            current_surface = int(surface_match.group(1))
-            continue
-
-        if not current_surface:
-            continue  # Skip until a surface block is found
-
-        # Handle the "total" line
-        if line.lower().startswith("total"):
-            parts = line.lower().replace("total", "").split()
-            if len(parts) == 2:
-                total_data[current_surface] = (float(parts[0]), float(parts[1]))
-            continue
-
-        # Match data lines (starting with a number and having 3 parts)
-        parts = line.split()
-        if len(parts) == 3 and re.match(r"^\d", parts[0]):
-            energy = float(parts[0])
-            result = float(parts[1])
-            rel_err = float(parts[2])
-            data_dict[current_surface].append([energy, result, rel_err])
-
-    # Convert lists to DataFrames and fold in the total row
-    for surface in data_dict:
-        df = pd.DataFrame(data_dict[surface], columns=["energy", "result", "rel_err"])
-        if surface in total_data:
-            total_row = pd.DataFrame(
-                [{"energy": "total",
-                  "result": total_data[surface][0],
-                  "rel_err": total_data[surface][1]}]
-            )
-            df = pd.concat([df, total_row], ignore_index=True)
-        data_dict[surface] = df
-
-    return dict(data_dict)
+    return read_energy_blocks(lines, "surface")
 
 
 def read_type_surface(tally_data, lines):
@@ -909,7 +1877,7 @@ def read_type_surface(tally_data, lines):
 
     if tally_data.tally_type == "1":
         surface_list = get_type1_surface_numbers(lines)
-        tally_data.surfaces = list(set(surface_list))
+        tally_data.surfaces = list(dict.fromkeys(surface_list))
         ntlogger.debug("Tally surface numbers:")
         ntlogger.debug(tally_data.surfaces)
 
@@ -922,26 +1890,17 @@ def read_type_surface(tally_data, lines):
     if "energy" in lines[first_surface_line_id + 1]:
         ntlogger.debug("energy bins only")
 
-        tally_data.result = process_energy_binned_surface_tally(lines)
-        first_key = next(iter(tally_data.result))
-        tally_data.eng = (
-            tally_data.result[first_key]
-            .loc[tally_data.result[first_key]["energy"] != "total", "energy"]
-            .tolist()
-        )
+        tally_data = set_energy_results(tally_data, lines, "surface")
 
     elif "angle" in lines[first_surface_line_id + 1]:
         ntlogger.debug("angle bins")
-
-        if lines[first_surface_line_id + 2] == "      energy   ":
-            angle_dfs, tally_data.ang_bins = process_energy_angle_tally(
-                tally_data, lines, first_surface_line_id
-            )
-            tally_data.result = angle_dfs
-            if angle_dfs:
-                tally_data.eng = angle_dfs[0]["energy"].tolist()
-        else:
-            ntlogger.debug("angle bins only")
+        tally_data.array, tally_data.ang_bins = read_angle_array(lines)
+        tally_data.result = None
+        tally_data.surfaces = [str(sur) for sur in tally_data.array.axes["object"].tolist()]
+        if "energy" in tally_data.array.axes:
+            tally_data.eng = tally_data.array.axes["energy"].tolist()
+        if "time" in tally_data.array.axes:
+            tally_data.times = tally_data.array.axes["time"].tolist()
 
     elif "time" in lines[first_surface_line_id + 1]:
         end_line_id = ut.find_line(" ===", lines, 4)
@@ -1007,7 +1966,7 @@ def read_type_surface(tally_data, lines):
             tally_data.result = {surface_id: df}
 
     elif len(tally_data.surfaces) > 1:
-        result_dict = {}
+        single_values = []
         for s in tally_data.surfaces:
             # find start and end points
             ntlogger.debug("Reading Surface: %s", s)
@@ -1017,10 +1976,10 @@ def read_type_surface(tally_data, lines):
             line = lines[surface_line_id + 1]
             line = line.strip()
             line = line.split(" ")
-            result_dict[int(s)] = pd.DataFrame(
-                {"result": [float(line[0])], "rel_err": [float(line[1])]}
-            )
-        tally_data.result = result_dict
+            single_values.append((float(line[0]), float(line[1])))
+        tally_data.array = single_value_array([int(s) for s in tally_data.surfaces],
+                                              single_values)
+        tally_data.result = None
 
     else:
         ntlogger.debug("single value only")
@@ -1028,15 +1987,28 @@ def read_type_surface(tally_data, lines):
         line = line.strip()
         line = line.split(" ")
         surface_id = int(tally_data.surfaces[0])
-        tally_data.result = {
-            surface_id: pd.DataFrame(
-                {"result": [float(line[0])], "rel_err": [float(line[1])]}
-            )
-        }
+        tally_data.array = single_value_array([surface_id],
+                                              [(float(line[0]), float(line[1]))])
+        tally_data.result = None
 
     return tally_data
 
 
+# a cell bin label, whole bracket or parenthesis groups such as
+# 1<2[0 0 0]<3 or (1 2 3) are one label
+CELL_LABEL = re.compile(r"\([^)]*\)|(?:[^\s\[(]|\[[^\]]*\])+")
+LATTICE_INDEX = re.compile(r"\[ *(-?\d+) +(-?\d+) +(-?\d+) *\]")
+LABELLED_CELL_HEADER = re.compile(r"^ cell +([^\n]*?) *$", re.MULTILINE)
+
+
+def cell_label(text):
+    """ bin label with single spaces and no enclosing parentheses """
+    text = " ".join(text.split())
+    if text.startswith("(") and text.endswith(")") and text.count("(") == 1:
+        text = text[1:-1].strip()
+    return text
+
+
 def get_cell_data(lines, line_id):
     """ for cell tally retrieves the cell numbers and volumes """
     cells = []
@@ -1049,11 +2021,9 @@ def get_cell_data(lines, line_id):
         if (line == " "):
             break
         elif "cell:" in line:
-            cell_line = " ".join(line.split())
-            cell_line = cell_line.split(":")[1]
-            cell_line = cell_line.split(" ")[1:]
-            for cell in cell_line:
-                cells.append(cell)
+            cell_line = line.split(":", 1)[1]
+            for cell in CELL_LABEL.findall(cell_line):
+                cells.append(cell_label(cell))
         else:
             vol_line = " ".join(line.split())
             vol_line = vol_line.split(" ")
@@ -1073,45 +2043,41 @@ def read_energy_bin_only_cell_tally(lines):
         ``energy``, ``result``, ``rel_err``.  A final row with
         ``energy == "total"`` is appended for each cell.
     """
-    data_dict = defaultdict(list)
-    total_data = {}
-    current_cell = None
+    return read_energy_blocks(lines, "cell")
 
-    for line in lines:
-        line = line.strip()
-        cell_match = re.match(r"cell\s+(\d+)", line)
-        if cell_match:
-            current_cell = int(cell_match.group(1))
-        if not current_cell:
-            continue
-        # Handle the "total" line
-        if line.lower().startswith("total"):
-            parts = line.lower().replace("total", "").split()
-            if len(parts) == 2:
-                total_data[current_cell] = (float(parts[0]), float(parts[1]))
-            continue
 
-        # Match data lines (starting with a number and having 3 columns -energy, result and rel err)
-        parts = line.split()
-        if len(parts) == 3 and re.match(r"^\d", parts[0]):
-            energy = float(parts[0])
-            result = float(parts[1])
-            rel_err = float(parts[2])
-            data_dict[current_cell].append([energy, result, rel_err])
-
-    # Convert lists to DataFrames and fold in the total row
-    for cell in data_dict:
-        df = pd.DataFrame(data_dict[cell], columns=["energy", "result", "rel_err"])
-        if cell in total_data:
-            total_row = pd.DataFrame(
-                [{"energy": "total",
-                  "result": total_data[cell][0],
-                  "rel_err": total_data[cell][1]}]
-            )
-            df = pd.concat([df, total_row], ignore_index=True)
-        data_dict[cell] = df
-
-    return dict(data_dict)
+def read_labelled_cells(tally_data, lines):
+    """ reads a cell tally whose bins are not plain cell numbers, e.g.
+        repeated structure or lattice bins, every bin in one pass
+
+        the results are a TallyArray with the bin labels as the object
+        axis, when every bin is a lattice element tally_data.lattice maps
+        the bins onto the lattice
+    """
+    text = "\n" + "\n".join(lines) + "\n"
+    stop = text.find("\n ===")
+    if stop != -1:
+        text = text[:stop + 1]
+    headers = list(LABELLED_CELL_HEADER.finditer(text))
+    if not headers:
+        ntlogger.info("No cell results found for tally %s", tally_data.number)
+        return tally_data
+    labels = [cell_label(header.group(1)) for header in headers]
+    chunks = [text[header.end():headers[i + 1].start() if i + 1 < len(headers) else len(text)]
+              for i, header in enumerate(headers)]
+    ntlogger.debug("labelled cell bins: %s", len(labels))
+
+    values, rel_err, total, total_err, axes = read_bin_blocks(chunks)
+    tally_data.array = TallyArray(values, rel_err, {"object": labels, **axes}, total, total_err)
+    tally_data.result = None
+    tally_data.cells = labels
+    if "energy" in axes:
+        tally_data.eng = axes["energy"]
+    if "time" in axes:
+        tally_data.times = axes["time"]
+    if all(LATTICE_INDEX.search(label) for label in labels):
+        tally_data.lattice = LatticeBins(labels)
+    return tally_data
 
 
 def read_type_cell(tally_data, lines):
@@ -1129,25 +2095,23 @@ def read_type_cell(tally_data, lines):
     tally_data.cells, tally_data.vols, line_id = get_cell_data(lines, line_id)
 
     lines = lines[line_id:]
+    if not all(cell.isdigit() for cell in tally_data.cells):
+        return read_labelled_cells(tally_data, lines)
     cell_res_start = ut.find_ind(lines, " " + tally_data.cells[0] + " ")
     tally_read = False
 
     # only energy binned data
     if "energy" in lines[cell_res_start + 1]:
         ntlogger.debug("noticed energy")
-        tally_data.result = read_energy_bin_only_cell_tally(lines)
-        first_key = next(iter(tally_data.result))
-        tally_data.eng = (
-            tally_data.result[first_key]
-            .loc[tally_data.result[first_key]["energy"] != "total", "energy"]
-            .tolist()
-        )
+        tally_data = set_energy_results(tally_data, lines, "cell")
         tally_read = True
 
     # loop for each cell — handles time-binned and single-value cases
     if not tally_read:
         result_dict = {}
         err_dict = {}
+        single_ids = []
+        single_values = []
         for i, cell in enumerate(tally_data.cells):
             cell_id = int(cell)
             cell_res_start = ut.find_ind(lines, " " + cell + " ")
@@ -1192,10 +2156,14 @@ def read_type_cell(tally_data, lines):
                     ntlogger.debug("skipping total line")
                 else:
                     ntlogger.debug(data_line[0])
-                    result_dict[cell_id] = pd.DataFrame(
-                        {"result": [float(data_line[0])],
-                         "rel_err": [float(data_line[1])]}
-                    )
+                    single_ids.append(cell_id)
+                    single_values.append((float(data_line[0]), float(data_line[1])))
+
+        if single_ids and not result_dict:
+            tally_data.array = single_value_array(single_ids, single_values)
+            tally_data.result = None
+        elif single_ids:
+            result_dict.update(single_value_array(single_ids, single_values).to_dict())
 
         if result_dict:
             tally_data.result = result_dict
@@ -1212,142 +2180,310 @@ def read_type_cell(tally_data, lines):
     return tally_data
 
 
-def read_type_5(tally_data, lines):
-    """ processes a type 5 (point detector tally output) """
-    # read detector position
-    loc_line_id = ut.find_line(" detector located", lines, 17)
-    loc_line = lines[loc_line_id]
-    loc_line = loc_line.split("=")[1]
-
-    tally_data.x = loc_line[0:12]
-    tally_data.x = float(tally_data.x.strip())
-    tally_data.y = loc_line[12:24]
-    tally_data.y = float(tally_data.y.strip())
-    tally_data.z = loc_line[24:36]
-    tally_data.z = float(tally_data.z.strip())
-    ntlogger.debug("x: %s", tally_data.x)
-    ntlogger.debug("y: %s", tally_data.y)
-    ntlogger.debug("z: %s", tally_data.z)
-    res_line = lines[loc_line_id + 1]
+DETECTOR_HEADER = re.compile(
+    r"^ (?:detector located at x,y,z =([^\n]*)"
+    r"|ring detector[^\n]*?radius *= *(\S+)[^\n]*? ([xyz]) *= *(\S+))[^\n]*\n"
+    r"( uncollided [^\n]*\n)?", re.MULTILINE)
 
-    # check if energy dependant
-    if res_line == "      energy   ":
-        ntlogger.debug("energy dependant")
-        total_line_id2 = ut.find_line(
-            "      total", lines[loc_line_id + 1:], 11)
-        erg_lines = lines[loc_line_id + 2:loc_line_id + total_line_id2 + 1]
-        df = process_energy_lines(erg_lines)
-        tally_data.eng = df["energy"].tolist()
-        tally_data.result = {0: df}
-
-    elif "time" in res_line:
-        ntlogger.debug("found time")
-        end_line_id = ut.find_line(" det", lines[loc_line_id+1:], 4)
-        res_df, err_df = process_e_t_userbin(
-            lines[loc_line_id+1:loc_line_id+1+end_line_id])
-        tally_data.times = res_df.columns.tolist()
-        tally_data.eng = res_df.index.tolist()
-        tally_data.result = {0: res_df}
-        tally_data.err = {0: err_df}
+# order of the score misses printed for every detector
+MISS_NAMES = ["russian roulette on pd", "psc=0", "russian roulette in transmission",
+              "underflow in transmission", "hit a zero-importance cell", "energy cutoff"]
 
-        # TODO: sort out f5 time dep tally
 
-    elif "user bin" in res_line:
-        # user bins used
-        # assumes if user bins then also energy and time bins
-        # curently extracts total flux not uncollided
-        ntlogger.debug("Special user bin tally")
-        user_bins = []
-        user_bin_locs = []
-        user_bin = res_line.split(" ")[-1]
-        ntlogger.debug("User bin: %s", user_bin)
-        user_bins.append(user_bin)
-        user_bin_locs.append(0)
-        for i, line in enumerate(lines[loc_line_id + 1:]):
-            if "user bin" in line:
-                user_bin = line.split(" ")[-1]
-                user_bins.append(user_bin)
-                user_bin_locs.append(i)
-                if user_bin == "total":
-                    break
-        tally_data.user_bins = user_bins
+def detector_position(header):
+    """ x, y, z and radius of a DETECTOR_HEADER match, the position of a
+        ring detector is the centre of the ring and a point detector has a
+        radius of 0
+    """
+    if header.group(1) is not None:
+        loc = header.group(1)
+        return [float(loc[0:12]), float(loc[12:24]), float(loc[24:36])], 0.0
+    position = [0.0] * 3
+    position["xyz".index(header.group(3))] = float(header.group(4))
+    return position, float(header.group(2))
 
-        bin_data = lines[loc_line_id + 1:]
-        result_dict = {}
-        err_dict = {}
-        i = 0
-        while i < len(user_bin_locs) - 1:
-            ubin_data = bin_data[user_bin_locs[i]:user_bin_locs[i + 1]]
-            res_df, err_df = process_e_t_userbin(ubin_data)
-            result_dict[i] = res_df
-            err_dict[i] = err_df
-            tally_data.times = res_df.columns.tolist()
-            tally_data.eng = res_df.index.tolist()
-            i = i + 1
-        tally_data.result = result_dict
-        tally_data.err = err_dict
 
-    else:
-        # single value and error result
-        res_line = res_line.split(" ")[-2:]
-        tally_data.result = {
-            0: pd.DataFrame({"result": [float(res_line[0])],
-                             "rel_err": [float(res_line[1])]})
-        }
+def detector_frames(array):
+    """ energy x time matrix for each detector, energy as the index, a
+        detector with time bins only has a single row with energy 0.0
 
-    # read general f5 tally data
-    ave_line_id = ut.find_ind(lines, " average tally per history")
-    ave_line = lines[ave_line_id]
-    ave_line = ut.string_clean_and_split(ave_line, "=")
-    tally_data.average_per_history = float(ave_line[1][1:13])
-    tally_data.largest_score = float(ave_line[-1])
+    Parameters:
+    - array (TallyArray): object x energy x time or object x time detector
+      results
 
-    n_line = lines[ave_line_id+1]
-    n_line = ut.string_clean_and_split(n_line, "=")
-    tally_data.largest_score_nps = float(n_line[-1])
+    Returns:
+    - tuple of dict: results and rel errors, detector -> DataFrame
+    """
+    times = array.axes["time"]
+    ids = array.axes["object"].tolist()
+    values, rel_err = array.values, array.rel_err
+    if "energy" in array.axes:
+        energies = array.axes["energy"]
+    else:
+        energies = [0.0]
+        values, rel_err = values[:, np.newaxis, :], rel_err[:, np.newaxis, :]
+    result = {i: pd.DataFrame(values[n], index=energies, columns=times)
+              for n, i in enumerate(ids)}
+    err = {i: pd.DataFrame(rel_err[n], index=energies, columns=times)
+           for n, i in enumerate(ids)}
+    return result, err
 
-    # read score misses data
-    tally_data.misses = {}
 
-    score_miss_line_id = ut.find_ind(lines, "score misses")
-    n_line = lines[score_miss_line_id+1]
-    n_line = ut.string_clean_and_split(n_line)
-    tally_data.misses["russian roulette on pd"] = float(n_line[-1])
+def read_user_bin_detector(tally_data, lines, loc_line_id):
+    """ reads the results of a single detector with user bins """
+    res_line = lines[loc_line_id + 1]
+    # user bins used
+    # assumes if user bins then also energy and time bins
+    # curently extracts total flux not uncollided
+    user_bins = []
+    user_bin_locs = []
+    user_bin = res_line.split(" ")[-1]
+    ntlogger.debug("User bin: %s", user_bin)
+    user_bins.append(user_bin)
+    user_bin_locs.append(0)
+    for i, line in enumerate(lines[loc_line_id + 1:]):
+        if "user bin" in line:
+            user_bin = line.split(" ")[-1]
+            user_bins.append(user_bin)
+            user_bin_locs.append(i)
+            if user_bin == "total":
+                break
+    tally_data.user_bins = user_bins
+
+    bin_data = lines[loc_line_id + 1:]
+    result_dict = {}
+    err_dict = {}
+    i = 0
+    while i < len(user_bin_locs) - 1:
+        ubin_data = bin_data[user_bin_locs[i]:user_bin_locs[i + 1]]
+        res_df, err_df = process_e_t_userbin(ubin_data)
+        result_dict[i] = res_df
+        err_dict[i] = err_df
+        tally_data.times = res_df.columns.tolist()
+        tally_data.eng = res_df.index.tolist()
+        i = i + 1
+    tally_data.result = result_dict
+    tally_data.err = err_dict
+
+    return tally_data
 
-    n_line = lines[score_miss_line_id+2]
-    n_line = ut.string_clean_and_split(n_line)
-    tally_data.misses["psc=0"] = float(n_line[-1])
 
-    n_line = lines[score_miss_line_id+3]
-    n_line = ut.string_clean_and_split(n_line)
-    tally_data.misses["russian roulette in transmission"] = float(n_line[-1])
+@ut.timed()
+def read_type_5(tally_data, lines):
+    """ processes a type 5 (point or ring detector tally output), every
+        detector of the tally is read in one pass
 
-    n_line = lines[score_miss_line_id+4]
-    n_line = ut.string_clean_and_split(n_line)
-    tally_data.misses["underflow in transmission"] = float(n_line[-1])
+        the results are a TallyArray with the detector index as the object
+        axis, the uncollided results, score statistics and score misses
+        are arrays with one row per detector, x, y, z, misses and the
+        scalar scores are those of the first detector
+    """
+    text = "\n" + "\n".join(lines) + "\n"
+    stop = text.find("\n ===")
+    if stop != -1:
+        text = text[:stop + 1]
+    diag = text.find("\n detector score diagnostics")
+    if diag == -1:
+        diag = len(text)
+
+    headers = list(DETECTOR_HEADER.finditer(text, 0, diag))
+    if not headers:
+        ntlogger.info("No detector results found for tally %s", tally_data.number)
+        return tally_data
+
+    positions = []
+    radii = []
+    chunks = []
+    uncollided = []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else diag
+        if header.group(5) is not None:
+            uncollided.append(text[header.end():end])
+            continue
+        position, radius = detector_position(header)
+        positions.append(position)
+        radii.append(radius)
+        chunks.append(text[header.end():end])
 
-    n_line = lines[score_miss_line_id+5]
-    n_line = ut.string_clean_and_split(n_line)
-    tally_data.misses["hit a zero-importance cell"] = float(n_line[-1])
+    tally_data.positions = np.array(positions)
+    tally_data.radii = np.array(radii)
+    tally_data.x, tally_data.y, tally_data.z = positions[0]
+    ntlogger.debug("detectors: %s", len(positions))
 
-    n_line = lines[score_miss_line_id+6]
-    n_line = ut.string_clean_and_split(n_line)
-    tally_data.misses["energy cutoff"] = float(n_line[-1])
+    if "user bin" in chunks[0]:
+        ntlogger.debug("Special user bin tally")
+        loc_line_id = ut.find_line(" detector located", lines, 17)
+        tally_data = read_user_bin_detector(tally_data, lines, loc_line_id)
+    else:
+        values, rel_err, total, total_err, axes = read_bin_blocks(chunks)
+        axes = {"object": list(range(len(chunks))), **axes}
+        tally_data.array = TallyArray(values, rel_err, axes, total, total_err)
+        tally_data.result = None
+        if "energy" in axes:
+            tally_data.eng = axes["energy"]
+        if "time" in axes:
+            tally_data.times = axes["time"]
+        if list(axes) == ["object", "time"]:
+            tally_data.eng = [0.0]
+        if "time" in axes:
+            tally_data.result, tally_data.err = detector_frames(tally_data.array)
+        if len(uncollided) == len(chunks):
+            tally_data.uncoll_flux, tally_data.uncoll_err = read_bin_blocks(uncollided)[:2]
+
+    # score statistics and misses, printed for every detector
+    diag_text = text[diag:]
+    scores = re.findall(r"average tally per history = *(\S+) +largest score = *(\S+)",
+                        diag_text)
+    if scores:
+        scores = np.array(scores, dtype=float)
+        tally_data.averages_per_history = scores[:, 0]
+        tally_data.largest_scores = scores[:, 1]
+        tally_data.average_per_history = tally_data.averages_per_history[0]
+        tally_data.largest_score = tally_data.largest_scores[0]
+    nps = re.findall(r"nps of largest score = *(\S+)", diag_text)
+    if nps:
+        tally_data.largest_scores_nps = np.array(nps, dtype=float)
+        tally_data.largest_score_nps = tally_data.largest_scores_nps[0]
+
+    misses = re.findall(r"score misses *\n((?:[^\n]*\n){6})", diag_text)
+    if misses:
+        counts = re.findall(r"(\S+) *\n", "".join(misses))
+        tally_data.miss_counts = np.array(counts, dtype=float).reshape(-1, len(MISS_NAMES))
+        tally_data.misses = dict(zip(MISS_NAMES, tally_data.miss_counts[0].tolist()))
 
     return tally_data
 
 
+STAT_CHECK_NAMES = ["mean behavior", "rel err value", "rel err decrease",
+                    "rel err decrease rate", "vov value", "vov decrease",
+                    "vov decrease rate", "fom value", "fom behavior", "pdf slope"]
+
+
 def read_stat_tests(lines):
-    """ initial stat test reader"""
+    """ reads the passed row of the 10 statistical checks of the tally
+        fluctuation chart bin, these follow the tally results so the lines
+        are searched from the end
+
+    Parameters:
+    - lines (list of str): lines of a tally block
+
+    Returns:
+    - list of str: "yes" or "no" for each check, ["no"] if not found
+    """
+    for line in reversed(lines):
+        if line[:7] == " passed":
+            return ut.string_clean_and_split(line)[1:]
+        if line.startswith("1tally"):
+            break
+    return ["no"]
+
+
+def stat_value(word):
+    """ number for an entry of the observed row of the statistical checks,
+        yes and no are 1 and 0 and descriptions such as random are nan
+    """
+    if word in ("yes", "no"):
+        return float(word == "yes")
     try:
-        stat_res_line_id = ut.find_line(" passed", lines, 7)
+        return float(word)
     except ValueError:
-        return ["no"]
+        return np.nan
 
-    stat_line = lines[stat_res_line_id]
-    stat_line = ut.string_clean_and_split(stat_line)[1:]
 
-    return stat_line
+def read_stat_checks(lines):
+    """ reads the observed and passed rows of the 10 statistical checks of
+        the tally fluctuation chart bin, searching from the end of the lines
+
+    Parameters:
+    - lines (list of str): lines of a tally block, or just the observed
+      and passed rows
+
+    Returns:
+    - tuple of np.ndarray: (passed, observed), a bool for each check in
+      the order of STAT_CHECK_NAMES and the observed values, see
+      stat_value, or None if the checks are not found
+    """
+    for i in range(len(lines) - 1, -1, -1):
+        line = lines[i]
+        if line[:7] == " passed":
+            passed = line.split()[1:]
+            if len(passed) != len(STAT_CHECK_NAMES):
+                return None
+            observed = lines[i - 1].split()[1:] if i > 0 and lines[i - 1][:9] == " observed" else []
+            if len(observed) != len(STAT_CHECK_NAMES):
+                observed = [None] * len(STAT_CHECK_NAMES)
+            return (np.array([p == "yes" for p in passed]),
+                    np.array([np.nan if o is None else stat_value(o) for o in observed]))
+        if line.startswith("1tally"):
+            break
+    return None
+
+
+@ut.timed()
+def read_tfc(lines, start=0):
+    """ reads the tally fluctuation charts section
+
+    Parameters:
+    - lines (list of str): lines of the output file
+    - start (int): line the section starts at, "1tally fluctuation charts"
+
+    Returns:
+    - dict[int, MCNP_tfc_data]: tally number -> nps, mean, error, vov,
+      slope and fom arrays
+    """
+    tfc_data = {}
+    tnums = None
+    rows = []
+
+    def add_group():
+        if tnums and rows:
+            data = float_rows("\n".join(rows))
+            for i, tnum in enumerate(tnums):
+                tfc = MCNP_tfc_data()
+                tfc.number = tnum
+                tfc.nps = data[:, 0]
+                tfc.mean, tfc.error, tfc.vov, tfc.slope, tfc.fom = \
+                    data[:, 1 + 5 * i:6 + 5 * i].T.copy()
+                tfc_data[tnum] = tfc
+
+    for line in lines[start + 1:]:
+        if line.startswith("1") or line.startswith(" ***"):
+            break
+        words = line.split()
+        if not words:
+            add_group()
+            tnums = None
+            rows = []
+        elif words[0] == "tally":
+            tnums = [int(w) for w in words[1::2]]
+        elif tnums is not None and words[0] != "nps":
+            rows.append(line)
+    add_group()
+
+    ntlogger.debug("TFC tallies: %s", list(tfc_data))
+    return tfc_data
+
+
+@ut.timed()
+def read_print_table(lines, number, table_dict=None):
+    """ reads print table number from the lines of an output file, see
+        mcnp_print_tables for the supported tables
+
+    Parameters:
+    - lines (list of str): lines of the output file
+    - number (int or str): print table number
+    - table_dict (dict): table start lines from get_table_dict, found if
+      not given
+
+    Returns:
+    - pd.DataFrame: the table with typed columns
+    """
+    if table_dict is None:
+        table_dict = get_table_dict(lines)
+    number = str(number)
+    if number not in table_dict:
+        raise ValueError(f"Print table {number} not found")
+    return mpt.read_print_table(lines[table_dict[number]:], number)
 
 
 def get_table_dict(lines):
@@ -1374,44 +2510,546 @@ def check_fatal(ofile_data):
     return False
 
 
-def read_output_file(path):
+@ut.timed()
+def read_tallies(lines, index, tnums, workers=None):
+    """ reads the final result set of each tally in tnums
+
+    Parameters:
+    - lines (list of str): lines of the output file
+    - index (OutputIndex): index of lines
+    - tnums (list of int): tally numbers to read
+    - workers (int): number of processes to parse the tally blocks with,
+      None or 1 parses them in this process
+
+    Returns:
+    - list of MCNP_tally_data: tally objects in the same order as tnums
+    """
+    blocks = []
+    with ut.span("slice_tally_blocks"):
+        for tnum in tnums:
+            start, end = index.tally_block(tnum)
+            blocks.append(lines[start:end])
+    ut.count("tallies_parsed", len(blocks))
+    return read_tally_blocks(blocks, tnums, workers)
+
+
+def read_tally_blocks(blocks, tnums, workers=None):
+    """ parses tally blocks, in a process pool if workers > 1 """
+    if workers is None or workers < 2 or len(blocks) < 2:
+        return [read_tally_block(block, tnum) for block, tnum in zip(blocks, tnums)]
+
+    ntlogger.debug("Reading %s tallies with %s processes", len(blocks), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_tally_block, blocks, tnums))
+
+
+def select_tallies(tally_numbers, tallies=None):
+    """ the tally numbers to read, all of tally_numbers if tallies is None
+        otherwise those requested in tallies
+
+    Raises:
+    - ValueError: if a requested tally is not in the file
+    """
+    if tallies is None:
+        return list(tally_numbers)
+    wanted = set(int(t) for t in tallies)
+    missing = sorted(wanted - set(tally_numbers))
+    if missing:
+        raise ValueError(f"Tallies {missing} not found, file has {list(tally_numbers)}")
+    return [t for t in tally_numbers if t in wanted]
+
+
+def select_tables(tables=None):
+    """ the print tables to read, 60 and 101 unless tables is given, each
+        with a layout in mcnp_print_tables is parsed into print_tables
+    """
+    if tables is None:
+        return {'60', '101'}
+    return {str(t) for t in tables}
+
+
+@ut.timed()
+def read_output_file(path, lazy=False, workers=None, cache=None, tallies=None,
+                     tables=None, metadata_only=False):
     """ reads an mcnp output file
         input is a path the to an ouput file
         output is an mcnp output object
+
+        with lazy=True the file is memory mapped and only indexed, tallies
+        and print tables are parsed on first access through
+        MCNPOutput.tally and MCNPOutput.table
+
+        workers > 1 parses the tally blocks in a process pool
+
+        cache is an mcnp_output_cache.OutputCache, a previously parsed copy
+        of an unchanged file is loaded from it instead of re-parsing
+
+        tallies is a list of tally numbers to read, by default all of them,
+        and tables a list of print table numbers, by default 60 and 101.
+        Tables with a layout in mcnp_print_tables are returned by
+        MCNPOutput.table. metadata_only=True reads neither. When any of these are given only
+        the selected sections of the file are decoded and parsed, otherwise
+        every table with a layout in mcnp_print_tables is read. Either way
+        tables holds the line number of each print table, only a lazy
+        read keeps byte offsets and the byte index.
     """
+    if lazy:
+        return read_output_file_lazy(path, tables, metadata_only)
+
+    if cache is not None:
+        options = {}
+        if tallies is not None or tables is not None or metadata_only:
+            options = {"tallies": tallies, "tables": tables, "metadata_only": metadata_only}
+        mc_data = cache.get(path, **options)
+        if mc_data is None:
+            mc_data = read_output_file(path, workers=workers, tallies=tallies,
+                                       tables=tables, metadata_only=metadata_only)
+            cache.put(path, mc_data, **options)
+        return mc_data
+
+    if tallies is not None or tables is not None or metadata_only:
+        return read_output_file_selected(path, tallies, tables, metadata_only, workers)
+
     ntlogger.info('Reading MCNP output file: %s', path)
-    ofile_data = ut.get_lines(path)
+    with ut.span("split_lines"):
+        ofile_data = ut.get_lines(path)
     mc_data = MCNPOutput()
 
+    # single pass over the file to find all the sections
+    index = build_output_index(ofile_data)
+
     # general
     mc_data.file_name = path
     mc_data.version = read_version(ofile_data)
     mc_data.date, mc_data.start_time = read_run_date(ofile_data)
-    mc_data.comments, mc_data.warnings = read_comments_warnings(ofile_data)
-    mc_data.num_rendevous = count_rendevous(ofile_data)
-    mc_data.fatal = check_fatal(ofile_data)
-    mc_data.tables = get_table_dict(ofile_data)
+    mc_data.comments = [ofile_data[i] for i in index.comments]
+    mc_data.warnings = [ofile_data[i] for i in index.warnings]
+    mc_data.num_rendevous = len(index.rendevous)
+    mc_data.fatal = len(index.fatal) > 0
+    mc_data.tables = index.tables
 
     # read specific tables
-    if '60' in mc_data.tables:
-        mc_data.t60 = read_table60(ofile_data, mc_data.tables['60'])
     if '101' in mc_data.tables:
         mc_data.t101 = read_table101(ofile_data, mc_data.tables['101'])
+    # the lines are not kept, so every table MCNPOutput.table can give is read now
+    for number in sorted(set(mpt.PRINT_TABLES) & set(mc_data.tables)):
+        mc_data.print_tables[number] = read_print_table(ofile_data, number, mc_data.tables)
+    if '60' in mc_data.print_tables:
+        mc_data.t60 = table60_frame(mc_data.print_tables['60'])
+    if index.summaries:
+        mc_data.summary_data = read_summary(ofile_data, index.summaries[-1])
 
     # tallies
-    tls = get_tally_nums(ofile_data)
-    for tnum in tls:
-        mc_data.tally_data.append(read_tally(ofile_data, tnum))
+    tls = index.tally_numbers()
+    mc_data.tally_data = read_tallies(ofile_data, index, tls, workers)
+    if index.tfc:
+        mc_data.tfc_data = list(read_tfc(ofile_data, index.tfc_start()).values())
 
     mc_data.num_tallies = len(tls)
+    mc_data.tally_numbers = tls
 
     return mc_data
 
 
+def read_output_file_selected(path, tallies=None, tables=None, metadata_only=False,
+                              workers=None):
+    """ reads only the selected tallies and print tables of an mcnp output
+        file, the file is memory mapped and indexed and only the selected
+        blocks are decoded, the rest of the file is never split into lines
+
+        num_tallies and tally_numbers still describe every tally in the
+        file, tally_data holds only the selected ones. As for an eager read
+        tables gives the line number of each print table and index is None,
+        the byte index is dropped with the memory map it refers to.
+    """
+    mc_data = read_output_file_lazy(path, tables, metadata_only)
+    try:
+        if not metadata_only:
+            tnums = select_tallies(mc_data.tally_numbers, tallies)
+            blocks = [decode_lines(mc_data.source, *mc_data.index.tally_block(t)) for t in tnums]
+            mc_data.tally_data = read_tally_blocks(blocks, tnums, workers)
+        mc_data.tables = line_numbers(mc_data.source, mc_data.tables)
+    finally:
+        mc_data.close()
+        mc_data.index = None
+    return mc_data
+
+
+def line_numbers(buf, offsets):
+    """ converts byte offsets of line starts to line numbers, counting the
+        newlines between consecutive offsets in a single pass
+
+    Parameters:
+    - buf (bytes or mmap): file contents
+    - offsets (dict): key -> byte offset
+
+    Returns:
+    - dict: key -> line number, in the order of offsets
+    """
+    lines = {}
+    pos = 0
+    count = 0
+    for key, offset in sorted(offsets.items(), key=lambda item: item[1]):
+        count += buf[pos:offset].count(b"\n")
+        pos = offset
+        lines[key] = count
+    return {key: lines[key] for key in offsets}
+
+
+@ut.timed()
+def read_output_file_lazy(path, tables=None, metadata_only=False):
+    """ memory maps an mcnp output file and indexes it by byte offset,
+        only the general data and tables are decoded, tallies are left to
+        be parsed on demand by MCNPOutput.tally
+    """
+    ntlogger.info('Indexing MCNP output file: %s', path)
+    buf = ut.map_file(path)
+    mc_data = MCNPOutput()
+    mc_data.source = buf
+    index = build_byte_index(buf)
+    mc_data.index = index
+
+    # general, the header is within the first 100 lines
+    head_end = 0
+    for _ in range(101):
+        head_end = buf.find(b"\n", head_end) + 1
+        if head_end == 0:
+            head_end = len(buf)
+            break
+    head = decode_lines(buf, 0, head_end)
+    mc_data.file_name = path
+    mc_data.version = read_version(head)
+    mc_data.date, mc_data.start_time = read_run_date(head)
+    mc_data.comments = [decode_line(buf, i) for i in index.comments]
+    mc_data.warnings = [decode_line(buf, i) for i in index.warnings]
+    mc_data.num_rendevous = len(index.rendevous)
+    mc_data.fatal = len(index.fatal) > 0
+    mc_data.tables = index.tables
+
+    # read specific tables, decoding only the lines they cover
+    wanted = set() if metadata_only else select_tables(tables)
+    if '101' in mc_data.tables and '101' in wanted:
+        start = mc_data.tables['101']
+        end = buf.find(b"\n *******", start)
+        end = buf.find(b"\n", end + 1) if end != -1 else len(buf)
+        mc_data.t101 = read_table101(decode_lines(buf, start, end), 0)
+    for number in sorted(wanted & set(mpt.PRINT_TABLES) & set(mc_data.tables)):
+        mc_data.table(number)
+    if '60' in mc_data.print_tables:
+        mc_data.t60 = table60_frame(mc_data.print_tables['60'])
+    if index.summaries:
+        start = index.summaries[-1]
+        mc_data.summary_data = read_summary(decode_lines(buf, start, page_end(buf, start)))
+
+    mc_data.tally_numbers = index.tally_numbers()
+    mc_data.num_tallies = len(mc_data.tally_numbers)
+
+    if index.tfc and not metadata_only:
+        start = index.tfc_start()
+        end = buf.find(b"\n ***", start)
+        mc_data.tfc_data = list(read_tfc(decode_lines(buf, start, end if end != -1 else len(buf))).values())
+
+    return mc_data
+
+
+def _bin_coords(values):
+    """ converts bin labels to floats, the total bin becomes inf """
+    values = pd.Series(values, dtype=object).replace("total", np.inf)
+    return pd.to_numeric(values).to_numpy(dtype=float)
+
+
+# columns of the long format table of tally results
+TALLY_COLUMNS = ["tally", "particle", "object", "energy", "time", "angle",
+                 "user_bin", "result", "rel_err"]
+
+
+@ut.timed()
+def tally_to_dataframe(tally):
+    """ flattens the results of a tally object into a long format table
+
+    Parameters:
+    - tally (MCNP_tally_data): tally read by read_output_file
+
+    Returns:
+    - pd.DataFrame: one row per result bin with columns tally, particle,
+      object (cell, surface or detector id), energy, time, angle, user_bin,
+      result and rel_err. Bins the tally does not have are NaN and total
+      bins have a coordinate of inf.
+    """
+    frames = []
+
+    if tally.array is not None:
+        frames.append(tally.array.to_dataframe())
+    else:
+        for key, df in tally.result.items():
+            if isinstance(tally.err, dict) and key in tally.err:
+                # energy x time matrix, energy as the index, times as columns
+                err_df = tally.err[key]
+                energy = df.index.to_numpy(dtype=float)
+                times = df.columns.to_numpy(dtype=float)
+                frame = pd.DataFrame({
+                    "energy": np.repeat(energy, len(times)),
+                    "time": np.tile(times, len(energy)),
+                    "result": df.to_numpy(dtype=float).ravel(),
+                    "rel_err": err_df.to_numpy(dtype=float).ravel(),
+                })
+            else:
+                frame = pd.DataFrame({"result": df["result"].to_numpy(dtype=float),
+                                      "rel_err": df["rel_err"].to_numpy(dtype=float)})
+                for col in ("energy", "time"):
+                    if col in df.columns:
+                        frame[col] = _bin_coords(df[col])
+            if isinstance(key, tuple):
+                # (cell, user bin) of an irregular pulse height tally
+                frame["object"] = key[0]
+                frame["user_bin"] = _bin_coords([key[1]])[0]
+            elif tally.user_bins is not None:
+                frame["user_bin"] = _bin_coords([tally.user_bins[key]])[0]
+            else:
+                frame["object"] = key
+            frames.append(frame)
+
+    columns = TALLY_COLUMNS
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    data = pd.concat(frames, ignore_index=True)
+    data["tally"] = tally.number
+    data["particle"] = tally.particle
+    ut.count("dataframe_rows", len(data))
+    return data.reindex(columns=columns)
+
+
+@ut.timed()
+def read_tally_history(source, tnum):
+    """ reads every printout of a tally in a single pass over the tally
+        blocks, for following the convergence of each bin
+
+    Parameters:
+    - source (str or list of str): path to an output file, which is memory
+      mapped, or the lines of an output file
+    - tnum (int or str): tally number
+
+    Returns:
+    - MCNP_tally_history: nps and rendevous position of each printout,
+      the bin coordinates and (printouts x bins) result and rel_err arrays
+    """
+    buf = None
+    if isinstance(source, (str, PathLike)):
+        buf = ut.map_file(source)
+        index = build_byte_index(buf)
+    else:
+        index = build_output_index(source)
+
+    history = MCNP_tally_history()
+    history.number = int(tnum)
+    rendevous = []
+    nps = []
+    results = []
+    errors = []
+    try:
+        for rpos, header in index.tally_printouts(tnum):
+            start, end = index.tally_block(tnum, header)
+            if buf is not None:
+                block = decode_lines(buf, start, end)
+            else:
+                block = source[start:end]
+            # skip the tally card echo in print table 30
+            if "nps =" not in block[0]:
+                continue
+            tally = read_tally_block(block, tnum)
+            data = tally_to_dataframe(tally)
+            if history.bins is None:
+                history.bins = data.drop(columns=["tally", "particle", "result", "rel_err"])
+            elif len(data) != len(history.bins):
+                raise ValueError(f"Tally {tnum} binning changes between printouts")
+            rendevous.append(rpos)
+            nps.append(float(tally.nps))
+            results.append(data["result"].to_numpy())
+            errors.append(data["rel_err"].to_numpy())
+    finally:
+        if buf is not None:
+            buf.close()
+
+    if not nps:
+        raise ValueError(f"No printouts of tally {tnum} found")
+    ntlogger.debug("Tally %s printouts: %s", tnum, len(nps))
+
+    history.rendevous = np.array(rendevous)
+    history.nps = np.array(nps)
+    history.result = np.vstack(results)
+    history.rel_err = np.vstack(errors)
+    return history
+
+
+def _read_output_summary(path, tallies=None):
+    """ reads one output file for read_output_files, returning the file
+        metadata and the long format results of the selected tallies
+    """
+    meta = {"file": str(path), "version": None, "date": None, "nps": None,
+            "fatal": None, "warnings": None, "num_tallies": None, "error": None}
+    try:
+        mc_data = read_output_file(path, lazy=True)
+        try:
+            meta["version"] = mc_data.version
+            meta["date"] = mc_data.date
+            meta["fatal"] = mc_data.fatal
+            meta["warnings"] = len(mc_data.warnings)
+            meta["num_tallies"] = mc_data.num_tallies
+            tnums = mc_data.tally_numbers
+            if tallies is not None:
+                wanted = set(int(t) for t in tallies)
+                tnums = [t for t in tnums if t in wanted]
+            frames = [tally_to_dataframe(mc_data.tally(t)) for t in tnums]
+        finally:
+            mc_data.close()
+        nps = [t.nps for t in mc_data.tally_data if isinstance(t.nps, int)]
+        meta["nps"] = max(nps) if nps else None
+        data = pd.concat(frames, ignore_index=True) if frames else None
+    except Exception as e:
+        ntlogger.warning("Failed to read %s: %s", path, e)
+        meta["error"] = f"{type(e).__name__}: {e}"
+        data = None
+    return meta, data
+
+
+def read_output_files(paths, tallies=None, workers=None):
+    """ reads many mcnp output files into a single long format table
+
+    Parameters:
+    - paths (str or list): glob pattern or list of paths to output files
+    - tallies (list of int): tally numbers to extract, default all
+    - workers (int): number of processes to read the files with, None or 1
+      reads them in this process
+
+    Returns:
+    - tuple: (results, metadata) dataframes. results has a file column
+      followed by the tally_to_dataframe columns; metadata has one row per
+      file with version, date, nps, fatal, warnings, num_tallies and error,
+      where error holds the reason any file could not be read
+    """
+    if isinstance(paths, (str, PathLike)):
+        paths = sorted(glob.glob(str(paths)))
+    paths = list(paths)
+    ntlogger.info('Reading %s MCNP output files', len(paths))
+
+    if workers is None or workers < 2 or len(paths) < 2:
+        summaries = [_read_output_summary(p, tallies) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_read_output_summary, p, tallies) for p in paths]
+            summaries = []
+            for p, future in zip(paths, futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    ntlogger.warning("Failed to read %s: %s", p, e)
+                    summaries.append(({"file": str(p), "error": f"{type(e).__name__}: {e}"}, None))
+
+    metadata = pd.DataFrame([meta for meta, _ in summaries],
+                            columns=["file", "version", "date", "nps", "fatal",
+                                     "warnings", "num_tallies", "error"])
+    metadata = metadata.astype({"nps": "Int64", "warnings": "Int64", "num_tallies": "Int64"})
+    frames = []
+    for meta, data in summaries:
+        if data is not None:
+            data.insert(0, "file", meta["file"])
+            frames.append(data)
+    if frames:
+        results = pd.concat(frames, ignore_index=True)
+    else:
+        results = pd.DataFrame(columns=["file"] + list(tally_to_dataframe(MCNP_tally_data()).columns))
+
+    failed = metadata["error"].notna().sum()
+    if failed:
+        ntlogger.warning("%s of %s files could not be read", failed, len(paths))
+    return results, metadata
+
+
+TRIAGE_COLUMNS = ["file", "tally", "failed", "failed_checks", "nps", "mean",
+                  "rel_err", "vov", "slope", "fom", "fom_trend", "error"]
+
+
+def _triage_output(path):
+    """ statistical checks and final tfc entry of every tally in one
+        output file for triage_outputs, the tallies themselves are not parsed
+    """
+    rows = []
+    try:
+        mc_data = read_output_file(path, lazy=True, tables=[])
+        try:
+            tfc_data = {tfc.number: tfc for tfc in mc_data.tfc_data}
+            for tnum in mc_data.tally_numbers:
+                row = {"file": str(path), "tally": tnum}
+                # only the observed and passed rows of the checks are decoded
+                start, end = mc_data.index.tally_block(tnum)
+                pos = mc_data.source.rfind(b"\n passed", start, end)
+                checks = None
+                if pos != -1:
+                    observed = mc_data.source.rfind(b"\n", start, pos)
+                    checks = read_stat_checks([decode_line(mc_data.source, observed + 1),
+                                               decode_line(mc_data.source, pos + 1)])
+                if checks is not None:
+                    failed = [name for name, p in zip(STAT_CHECK_NAMES, checks[0]) if not p]
+                    row["failed"] = len(failed)
+                    row["failed_checks"] = ", ".join(failed)
+                if tnum in tfc_data:
+                    tfc = tfc_data[tnum]
+                    row.update({"nps": tfc.nps[-1], "mean": tfc.mean[-1],
+                                "rel_err": tfc.error[-1], "vov": tfc.vov[-1],
+                                "slope": tfc.slope[-1], "fom": tfc.fom[-1],
+                                "fom_trend": tfc.fom_trend()})
+                rows.append(row)
+        finally:
+            mc_data.close()
+    except Exception as e:
+        ntlogger.warning("Failed to read %s: %s", path, e)
+        rows = [{"file": str(path), "error": f"{type(e).__name__}: {e}"}]
+    return rows
+
+
+def triage_outputs(paths, workers=None):
+    """ ranks the tallies of many output files by their statistical checks,
+        worst first, for finding the tallies that have not converged
+
+        only the checks, the tally fluctuation charts and the index of each
+        file are read, not the tally results
+
+    Parameters:
+    - paths (str or list): glob pattern or list of paths to output files
+    - workers (int): number of processes to read the files with, None or 1
+      reads them in this process
+
+    Returns:
+    - pd.DataFrame: one row per tally with the number and names of the
+      failed checks, the final tfc nps, mean, rel_err, vov, slope and fom
+      and fom_trend (see MCNP_tfc_data.fom_trend), sorted by most failed
+      checks then most negative fom trend. Files that could not be read
+      have a single row with the reason in error.
+    """
+    if isinstance(paths, (str, PathLike)):
+        paths = sorted(glob.glob(str(paths)))
+    paths = list(paths)
+    ntlogger.info('Triaging %s MCNP output files', len(paths))
+
+    if workers is None or workers < 2 or len(paths) < 2:
+        results = [_triage_output(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_triage_output, paths))
+
+    triage = pd.DataFrame([row for rows in results for row in rows], columns=TRIAGE_COLUMNS)
+    triage = triage.astype({"tally": "Int64", "failed": "Int64"})
+    triage = triage.sort_values(["failed", "fom_trend"], ascending=[False, True],
+                                na_position="last", kind="stable")
+    return triage.reset_index(drop=True)
+
+
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Read MCNP output file")
     parser.add_argument("input", help="path to the output file")
+    parser.add_argument("--tallies", nargs="+", type=int, default=None,
+                        help="only read these tally numbers")
     args = parser.parse_args()
 
-    read_output_file(args.input)
+    read_output_file(args.input, tallies=args.tallies)
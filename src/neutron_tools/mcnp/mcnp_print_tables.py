@@ -0,0 +1,344 @@
+"""
+Fixed width print tables of an MCNP output file
+
+each supported table has a PrintTableSpec describing how to find its data
+rows and how to name its columns, read_print_table turns the lines of a
+table into a DataFrame with one typed column per field. Most tables are one
+row per line and are read by read_row_table, the column names are built from
+the header lines above the data by matching each header word to the data
+column it sits over. Tables laid out differently (100, 128, 130) have their
+own parser.
+"""
+import logging as ntlogger
+import re
+import warnings
+import numpy as np
+import pandas as pd
+
+
+T101_COLUMNS = ["particle_id", "particle_symbol", "particle_name",
+                "cutoff_energy", "max_energy",
+                "smallest_table_max", "largest_table_max", "always_table_below",
+                "always_model_above"]
+
+WORD = re.compile(r"\S+")
+XS_TABLE_ROW = re.compile(r"\s+(\S+\.\d+[a-z]{1,2})\s+(\d+)(?:\s+(.*?))?\s*$")
+XS_ENERGY_RANGE = re.compile(r"\s+Energy range:\s+(\S+)\s+to\s+(\S+)")
+
+
+class PrintTableSpec():
+    """ layout of a print table
+
+        - number: print table number
+        - row: regex matching the start of a data row
+        - columns: column names, None to build them from the header lines
+        - leading: names for leading columns the header does not label
+        - carry: number of leading columns a short row takes from the row
+          above, e.g. the cell of the second nuclide in a cell in table 140
+        - stop: regex matching the line the table ends at, by default it
+          ends at the next page
+        - parser: function(lines, spec) for tables that are not one row per
+          line, replaces read_row_table
+    """
+
+    def __init__(self, number, row=r"\s*\d", columns=None, leading=(), carry=0,
+                 stop=None, parser=None):
+        self.number = str(number)
+        self.row = re.compile(row)
+        self.columns = columns
+        self.leading = leading
+        self.carry = carry
+        self.stop = re.compile(stop) if stop else None
+        self.parser = parser
+
+    def __str__(self):
+        return f"Print table {self.number}"
+
+
+def table_title(line):
+    """ title of a print table from its first line, e.g. 'photon activity
+        in each cell'
+    """
+    title = line[1:].split("print table")[0]
+    return " ".join(title.split())
+
+
+def table_pages(lines):
+    """ the lines of a table, pages repeating the title are joined and the
+        table ends at the first page with a different title
+
+    Parameters:
+    - lines (list of str): lines starting at the title line of the table
+
+    Returns:
+    - list of str: lines of the table after the title line
+    """
+    title = lines[0]
+    body = []
+    for line in lines[1:]:
+        if line.startswith("1"):
+            if line == title:
+                continue
+            break
+        body.append(line)
+    return body
+
+
+def typed_column(values):
+    """ converts a column of strings to int or float with a single bulk
+        conversion, columns where any value is not a number are left as
+        strings
+    """
+    values = list(values)
+    text = " ".join(values)
+    try:
+        with warnings.catch_warnings():
+            # older numpy versions stop at a bad value with only a warning
+            warnings.simplefilter("ignore", DeprecationWarning)
+            numbers = np.fromstring(text, sep=" ")
+    except ValueError:
+        numbers = None
+    if numbers is None or numbers.size != len(values):
+        return np.array(values, dtype=object)
+    if "." in text or "e" in text or "E" in text:
+        return numbers
+    return numbers.astype(np.int64)
+
+
+def header_names(header, row, leading=()):
+    """ column names from the header lines above a table
+
+        each header word is assigned to the column of row it overlaps
+        most, or the nearest column if it overlaps none, and the words of
+        a column are joined top to bottom
+
+    Parameters:
+    - header (list of str): header lines
+    - row (str): first data row, its fields set the column positions
+    - leading (tuple of str): names of leading columns with no header words
+
+    Returns:
+    - list of str: one name per field of row
+    """
+    spans = np.array([m.span() for m in WORD.finditer(row)])
+    words = [[] for _ in spans]
+    for line in header:
+        for m in WORD.finditer(line):
+            start, end = m.span()
+            overlap = np.minimum(spans[:, 1], end) - np.maximum(spans[:, 0], start)
+            if overlap.max() > 0:
+                col = int(np.argmax(overlap))
+            else:
+                centres = spans.mean(axis=1)
+                col = int(np.argmin(np.abs(centres - (start + end) / 2)))
+            words[col].append(m.group())
+
+    names = []
+    for i, col_words in enumerate(words):
+        if col_words:
+            names.append(" ".join(col_words))
+        elif i < len(leading):
+            names.append(leading[i])
+        else:
+            names.append(f"column {i}")
+    return names
+
+
+def read_row_table(lines, spec):
+    """ reads a table with one row per line
+
+    Parameters:
+    - lines (list of str): lines of the table after the title line
+    - spec (PrintTableSpec): layout of the table
+
+    Returns:
+    - pd.DataFrame: one column per field, converted to int or float where
+      every value in the column allows it
+    """
+    rows = []
+    header = []
+    for line in lines:
+        if spec.stop is not None and spec.stop.match(line):
+            break
+        if spec.row.match(line):
+            rows.append(line)
+        elif not rows and line.strip():
+            header.append(line)
+
+    if spec.columns is not None:
+        columns = list(spec.columns)
+    elif rows:
+        columns = header_names(header, rows[0], spec.leading)
+    else:
+        return pd.DataFrame()
+    ncols = len(columns)
+
+    tokens = " ".join(rows).split()
+    if len(tokens) == len(rows) * ncols:
+        # every row complete, split all at once
+        fields = np.array(tokens, dtype=object).reshape(-1, ncols)
+    else:
+        fields = []
+        previous = None
+        for row in rows:
+            values = row.split()
+            if len(values) == ncols - spec.carry and previous is not None:
+                values = previous[:spec.carry] + values
+            if len(values) != ncols:
+                ntlogger.debug("skipping print table %s row: %s", spec.number, row)
+                continue
+            fields.append(values)
+            previous = values
+        fields = np.array(fields, dtype=object).reshape(-1, ncols)
+
+    return pd.DataFrame({name: typed_column(fields[:, i]) for i, name in enumerate(columns)})
+
+
+def read_cross_section_tables(lines, spec):
+    """ reads print table 100, one row per cross section table with its
+        length, description, energy range and the file it is from
+    """
+    data = {"table": [], "length": [], "description": [], "emin": [], "emax": [], "file": []}
+    source = ""
+    for line in lines:
+        if "tables from file" in line:
+            source = line.split("tables from file")[1].strip()
+            continue
+        match = XS_TABLE_ROW.match(line)
+        if match:
+            data["table"].append(match.group(1))
+            data["length"].append(int(match.group(2)))
+            data["description"].append(match.group(3) or "")
+            data["emin"].append(np.nan)
+            data["emax"].append(np.nan)
+            data["file"].append(source)
+            continue
+        match = XS_ENERGY_RANGE.match(line)
+        if match and data["table"]:
+            data["emin"][-1] = float(match.group(1))
+            data["emax"][-1] = float(match.group(2))
+    return pd.DataFrame(data)
+
+
+def read_universe_map(lines, spec):
+    """ reads print table 128, the universe map, into one row per cell
+
+        header words before 'cells' name the leading fields of each
+        universe, lines whose first field does not end in the same column
+        as the first universe continue the cell list of the line above
+    """
+    leading = None
+    key_end = None
+    records = []
+    for line in lines:
+        words = line.split()
+        if leading is None:
+            if "cells" in words:
+                leading = words[:words.index("cells")]
+            continue
+        if not words or not words[0].lstrip("-").isdigit():
+            continue
+        first_end = WORD.search(line).end()
+        if key_end is None:
+            key_end = first_end
+        if first_end == key_end:
+            records.append((words[:len(leading)], words[len(leading):]))
+        elif records:
+            records[-1][1].extend(words)
+
+    if leading is None:
+        return pd.DataFrame()
+    data = {name: [] for name in leading}
+    data["cell"] = []
+    for keys, cells in records:
+        for name, key in zip(leading, keys):
+            data[name].extend([key] * len(cells))
+        data["cell"].extend(cells)
+    return pd.DataFrame({name: typed_column(values) for name, values in data.items()})
+
+
+def read_weight_balance(lines, spec):
+    """ reads print table 130, the weight balance in each cell
+
+        the table is printed with cells as columns, a block of cells at a
+        time, it is returned with one row per cell and one column per event.
+        Section totals are named after the section e.g. 'external events
+        total', the cell total column is stored in attrs['total']
+    """
+    columns = {}
+    cells = []
+    total = {}
+    block = []
+    section = ""
+    for line in lines:
+        words = line.split()
+        if not words or words[0].startswith("---"):
+            continue
+        if words[:2] == ["cell", "index"]:
+            continue
+        if words[:2] == ["cell", "number"]:
+            block = words[2:]
+            cells.extend(c for c in block if c != "total")
+            continue
+        if line.rstrip().endswith(":"):
+            section = " ".join(words)[:-1]
+            continue
+        if not block:
+            continue
+        label = " ".join(words[:-len(block)])
+        if label == "total":
+            label = f"{section} total" if section else "total"
+            section = ""
+        for cell, value in zip(block, words[-len(block):]):
+            if cell == "total":
+                total[label] = float(value)
+            else:
+                columns.setdefault(label, []).append(value)
+
+    df = pd.DataFrame({"cell": typed_column(cells)})
+    for label, values in columns.items():
+        df[label] = typed_column(values)
+    df.attrs["total"] = total
+    return df
+
+
+PRINT_TABLES = {spec.number: spec for spec in (
+    PrintTableSpec(60, leading=("index",)),
+    PrintTableSpec(100, parser=read_cross_section_tables),
+    PrintTableSpec(101, row=r"\s+\d+\s+\S+\s+\S+\s+\d", columns=T101_COLUMNS),
+    PrintTableSpec(126, leading=("index",)),
+    PrintTableSpec(128, parser=read_universe_map),
+    PrintTableSpec(130, parser=read_weight_balance),
+    PrintTableSpec(140, carry=2, stop=r"\s+total over all cells"),
+)}
+
+
+def read_print_table(lines, number=None):
+    """ reads a print table
+
+    Parameters:
+    - lines (list of str): lines of the output file starting at the title
+      line of the table, lines after the table are ignored
+    - number (int or str): print table number, read from the title line
+      if not given
+
+    Returns:
+    - pd.DataFrame: the table, attrs['title'] holds the table title which
+      names the particle for per particle tables e.g. 126
+
+    Raises:
+    - ValueError: if there is no layout for the table
+    """
+    if number is None:
+        number = lines[0].split()[-1]
+    spec = PRINT_TABLES.get(str(number))
+    if spec is None:
+        raise ValueError(f"No layout for print table {number}, "
+                         f"supported tables are {list(PRINT_TABLES)}")
+
+    body = table_pages(lines)
+    parser = spec.parser or read_row_table
+    df = parser(body, spec)
+    df.attrs["title"] = table_title(lines[0])
+    ntlogger.debug("Read print table %s: %s rows", spec.number, len(df))
+    return df
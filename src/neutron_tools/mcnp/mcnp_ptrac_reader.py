@@ -139,6 +139,7 @@ def process_event(event_data):
     return cur_event
 
 
+@ut.timed()
 def process_tracks(tracks):
     """ processes the tracks section with the events
         input is a list
@@ -178,10 +179,12 @@ def process_tracks(tracks):
 
     # need to catch the last history
     histories.append(cur_history)
+    ut.count("histories_read", len(histories))
 
     return histories
 
 
+@ut.timed()
 def read_ptrac(path):
     """ reads and processes MCNP ptrac file
         input is a path to a file
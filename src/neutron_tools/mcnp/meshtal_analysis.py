@@ -10,6 +10,8 @@ import argparse
 import logging as ntlogger
 import pandas as pd
 
+from neutron_tools.utilities import neut_utilities as ut
+
 
 class meshtally:
     """Mesh tally object data"""
@@ -200,6 +202,7 @@ def filter_energy_time(data, erg=None, time=None):
 
 # TODO: need to generalize to any axis
 # plot slice calls extract slice
+@ut.timed()
 def extract_slice(mesh, value, plane, erg=None, time=None):
     """ From a given plane will find the slice of a mesh.
 
@@ -302,6 +305,7 @@ def output_as_vtk():
     ntlogger.debug("not ready yet")
 
 
+@ut.timed()
 def convert_to_df(mesh):
     """ converts mesh.data in raw format to a pandas dataframe """
     # Define column mappings for different mesh types
@@ -327,12 +331,14 @@ def convert_to_df(mesh):
     data["rel_err"] = pd.to_numeric(data["rel_err"], downcast="float")
 
     if mesh.ctype == "6col_e":
+        data.drop(data[data.Energy == "Total"].index, inplace=True)
         data["Energy"] = pd.to_numeric(data["Energy"], downcast="float")
     if mesh.ctype == "6col_t":
         data.drop(data[data.Time == "Total"].index, inplace=True)
         data.drop(data[data.Time == "0.000E+00"].index, inplace=True)
         data["Time"] = pd.to_numeric(data["Time"], downcast="float")
 
+    ut.count("mesh_rows", len(data))
     return data
 
 
@@ -365,6 +371,7 @@ def extract_line(mesh, p1, p2, erg=None, time=None):
     return result
 
 
+@ut.timed()
 def pick_point(x, y, z, mesh, erg=None, time=None):
     """ find the mesh value for the voxel that  point x, y, z is in and also
     matches time/energy parameter"""
@@ -393,6 +400,7 @@ def add_mesh(mesh1, mesh2):
 
 
 # TODO: need to deal with energy bins
+@ut.timed()
 def convert_to_3d_array(mesh):
     """ converts the mesh into 3d numpy array
         one array for the values and another for the rel errs
@@ -476,6 +484,7 @@ def find_next_mesh(tnum, tdict):
                 return tdict[keylist[i + 1]]
 
 
+@ut.timed()
 def read_meshtally_file(path, mesh_num=None):
     """reads in a mesh file line by line into a meshtally object
     Args:
@@ -489,7 +498,7 @@ def read_meshtally_file(path, mesh_num=None):
     mesh = meshtally()
     mesh.ctype = "6col_e"
     meshes = []
-    with open(path) as f:
+    with ut.open_file(path) as f:
         for i, line in enumerate(f):
             if in_data and " Mesh Tally Number" in line:
                 if select_mesh:
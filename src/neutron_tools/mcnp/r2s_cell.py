@@ -219,7 +219,8 @@ def read_data_from_mcnp_output(inputs):
     if not Path(inputs.mc_output).exists():
         raise FileNotFoundError(f"MCNP output file {inputs.mc_output} not found")
 
-    mc_output = mor.read_output_file(inputs.mc_output)
+    # only the tallies requested in the config are needed, no print tables
+    mc_output = mor.read_output_file(inputs.mc_output, tallies=inputs.tallies, tables=[])
     if mc_output.fatal is True:
         raise ValueError('MCNP output contains a fatal error')
 
@@ -56,6 +56,7 @@ class XSDir:
         return entries
 
     @classmethod
+    @ut.timed("XSDir.from_file")
     def from_file(cls, fpath):
         """Read and parse an xsdir file into an XSDir object."""
         lines = ut.get_lines(fpath)
@@ -68,6 +69,7 @@ class XSDir:
         # Parse sections
         xs.awr = cls._process_awr(lines)
         xs.directory = cls._process_directory(lines)
+        ut.count("xsdir_entries_read", len(xs.directory))
   
         return xs
 
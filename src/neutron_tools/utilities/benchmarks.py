@@ -0,0 +1,426 @@
+"""
+Benchmarks of the file readers and meshtal analysis hot paths
+
+each case times a reader, or an analysis function on data read before the
+timer starts, against synthetic inputs from synthetic_files at small,
+medium and large sizes. Results give the median wall time of several
+repeats, throughput in MB/s of input and items/s, e.g. tally bins or
+histories, and the peak memory traced by tracemalloc in a separate run.
+Cases quicker than MIN_SECONDS are looped within each repeat so short
+runs are not swamped by timer and scheduler noise.
+
+Wall times depend on the machine, so every repeat also times a fixed
+calibration loop of text splitting and float conversion, the work the
+readers spend most of their time on, just before the case. The items/s of
+the case divided by the calibration lines/s of the same repeat is its
+relative speed, and the median over the repeats carries over between
+machines, and through changes in load during a run, far better than the
+raw throughput.
+
+Results are stored as JSON baselines keyed by "case/size". compare reports
+a regression when the relative speed drops or the peak memory grows by
+more than the tolerance. Regenerate the baselines with --update after a
+deliberate change in performance.
+
+    python -m neutron_tools.utilities.benchmarks --sizes small medium
+    python -m neutron_tools.utilities.benchmarks --update
+"""
+import argparse
+import json
+import logging as ntlogger
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from neutron_tools.utilities import synthetic_files
+from neutron_tools.utilities import neut_utilities as ut
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.mcnp import mcnp_mctal_reader
+from neutron_tools.mcnp import mcnp_kcode_reader
+from neutron_tools.mcnp import meshtal_analysis
+from neutron_tools.mcnp import mcnp_ptrac_reader
+from neutron_tools.mcnp import mcnp_input_reader
+from neutron_tools.fispact import fispact_output_reader
+from neutron_tools.fispact import fispact_printlib_reader
+from neutron_tools.nuclear_data_readers import xsdir_reader
+
+
+SIZES = ("small", "medium", "large")
+BASELINE_PATH = os.path.join("tests", "benchmark_baselines.json")
+TOLERANCE = 0.3
+MEMORY_TOLERANCE = 0.1
+MEMORY_SLACK = 0.5
+PICK_POINTS = 50
+CALIBRATION_LINES = 20000
+REPEATS = 7
+MIN_SECONDS = 0.05
+
+
+class benchmark_case():
+    """ a function timed on synthetic inputs of each size """
+
+    def __init__(self, name, write, run, sizes, items, prepare=None):
+        """
+        Parameters:
+        - name (str): case name used in the baselines
+        - write (callable): synthetic_files writer, write(path, **params)
+        - run (callable): the timed function, called with the path or the
+          prepared data
+        - sizes (dict): writer parameters for each size
+        - items (callable): number of items processed for the parameters
+        - prepare (callable): reads the path before timing, None to time run
+          on the path itself
+        """
+        self.name = name
+        self.write = write
+        self.run = run
+        self.sizes = sizes
+        self.items = items
+        self.prepare = prepare
+
+
+def tally_bins(params):
+    """ number of tally results in a synthetic MCNP output """
+    return (params.get("tallies", 1) * params.get("cells", 10)
+            * max(params.get("energies", 0), 1) * max(params.get("times", 0), 1))
+
+
+def voxel_bins(params):
+    """ number of results in a synthetic meshtal """
+    x, y, z = params["shape"]
+    return x * y * z * params.get("energies", 1) * params.get("times", 1)
+
+
+def voxels(params):
+    """ number of voxels of a synthetic meshtal """
+    x, y, z = params["shape"]
+    return x * y * z
+
+
+def read_mesh(path):
+    """ first mesh of a meshtal file """
+    return meshtal_analysis.read_meshtally_file(path)[0]
+
+
+def mid_slice(mesh):
+    """ XY slice through the middle of the mesh """
+    return meshtal_analysis.extract_slice(mesh, 0.0, "XY")
+
+
+def pick_points(mesh):
+    """ picks PICK_POINTS voxels along the diagonal of the mesh """
+    x0, x1 = float(mesh.x_bounds[0]), float(mesh.x_bounds[-1])
+    step = (x1 - x0) / PICK_POINTS
+    for i in range(PICK_POINTS):
+        x = x0 + (i + 0.5) * step
+        meshtal_analysis.pick_point(x, x, x, mesh)
+
+
+CASES = [
+    benchmark_case("read_output_file", synthetic_files.write_mcnp_output,
+                   mcnp_output_reader.read_output_file,
+                   {"small": {"tallies": 2, "cells": 100, "energies": 10},
+                    "medium": {"tallies": 5, "cells": 500, "energies": 20},
+                    "large": {"tallies": 10, "cells": 1000, "energies": 50}},
+                   tally_bins),
+    benchmark_case("read_mctal", synthetic_files.write_mctal, mcnp_mctal_reader.read_mctal,
+                   {"small": {"tallies": 2, "cells": 100, "energies": 10},
+                    "medium": {"tallies": 5, "cells": 500, "energies": 20},
+                    "large": {"tallies": 10, "cells": 1000, "energies": 50}},
+                   tally_bins),
+    benchmark_case("read_kcode", synthetic_files.write_kcode_output,
+                   mcnp_kcode_reader.read_kcode,
+                   {"small": {"cycles": 1000},
+                    "medium": {"cycles": 10000},
+                    "large": {"cycles": 100000}},
+                   lambda params: params["cycles"]),
+    benchmark_case("read_meshtally_file", synthetic_files.write_meshtal,
+                   meshtal_analysis.read_meshtally_file,
+                   {"small": {"shape": (10, 10, 10), "energies": 2},
+                    "medium": {"shape": (40, 40, 40), "energies": 2},
+                    "large": {"shape": (60, 60, 60), "energies": 2}},
+                   voxel_bins),
+    benchmark_case("read_ptrac", synthetic_files.write_ptrac, mcnp_ptrac_reader.read_ptrac,
+                   {"small": {"histories": 1000},
+                    "medium": {"histories": 10000},
+                    "large": {"histories": 40000}},
+                   lambda params: params["histories"]),
+    benchmark_case("read_fis_out", synthetic_files.write_fispact_output,
+                   fispact_output_reader.read_fis_out,
+                   {"small": {"steps": 3, "nuclides": 100},
+                    "medium": {"steps": 10, "nuclides": 500},
+                    "large": {"steps": 30, "nuclides": 2000}},
+                   lambda params: (params["steps"] + 1) * params["nuclides"]),
+    benchmark_case("read_fispact_printlib", synthetic_files.write_printlib,
+                   fispact_printlib_reader.read_fispact_printlib,
+                   {"small": {"nuclides": 100},
+                    "medium": {"nuclides": 1000},
+                    "large": {"nuclides": 2000, "lines": 100}},
+                   lambda params: params["nuclides"] * params.get("lines", 10)),
+    benchmark_case("read_mcnp_input", synthetic_files.write_mcnp_input,
+                   mcnp_input_reader.read_mcnp_input,
+                   {"small": {"cells": 100, "materials": 10},
+                    "medium": {"cells": 1000, "materials": 100},
+                    "large": {"cells": 5000, "materials": 500}},
+                   lambda params: params["cells"]),
+    benchmark_case("XSDir.from_file", synthetic_files.write_xsdir, xsdir_reader.XSDir.from_file,
+                   {"small": {"entries": 1000},
+                    "medium": {"entries": 10000},
+                    "large": {"entries": 50000}},
+                   lambda params: params["entries"]),
+    benchmark_case("extract_slice", synthetic_files.write_meshtal, mid_slice,
+                   {"small": {"shape": (10, 10, 10)},
+                    "medium": {"shape": (40, 40, 40)},
+                    "large": {"shape": (60, 60, 60)}},
+                   voxels, prepare=read_mesh),
+    benchmark_case("pick_point", synthetic_files.write_meshtal, pick_points,
+                   {"small": {"shape": (10, 10, 10)},
+                    "medium": {"shape": (40, 40, 40)},
+                    "large": {"shape": (60, 60, 60)}},
+                   lambda params: PICK_POINTS, prepare=read_mesh),
+    benchmark_case("convert_to_3d_array", synthetic_files.write_meshtal,
+                   meshtal_analysis.convert_to_3d_array,
+                   {"small": {"shape": (10, 10, 10)},
+                    "medium": {"shape": (20, 20, 20)},
+                    "large": {"shape": (40, 40, 40)}},
+                   voxels, prepare=read_mesh),
+]
+
+
+def find_case(name):
+    """ the benchmark case called name """
+    for case in CASES:
+        if case.name == name:
+            return case
+    raise ValueError(f"Unknown benchmark case: {name}")
+
+
+def calibration_text():
+    """ lines of results for the calibration loop """
+    rows = np.random.default_rng(0).random((CALIBRATION_LINES, 2))
+    return "".join(f"  {value:.5E} {err:.4f}\n" for value, err in rows)
+
+
+def calibration_loop(text):
+    """ splits the lines of results and converts them to floats, as the
+        readers do
+    """
+    values = [float(word) for line in text.splitlines() for word in line.split()]
+    np.array(values).reshape(-1, 2).sum(axis=0)
+
+
+def loops_for(func, arg):
+    """ runs func once and finds the number of calls that take at least
+        MIN_SECONDS
+    """
+    start = time.perf_counter()
+    func(arg)
+    seconds = time.perf_counter() - start
+    return max(1, int(np.ceil(MIN_SECONDS / max(seconds, 1e-9))))
+
+
+def time_loops(func, arg, loops):
+    """ seconds per call of func over loops calls """
+    start = time.perf_counter()
+    for _ in range(loops):
+        func(arg)
+    return (time.perf_counter() - start) / loops
+
+
+def calibrate(repeats=REPEATS):
+    """ speed of the machine on the calibration loop
+
+    Parameters:
+    - repeats (int): number of timed runs, the median is kept
+
+    Returns:
+    - float: lines per second
+    """
+    text = calibration_text()
+    loops = loops_for(calibration_loop, text)
+    seconds = np.median([time_loops(calibration_loop, text, loops) for _ in range(repeats)])
+    ntlogger.info("calibration: %.0f lines/s", CALIBRATION_LINES / seconds)
+    return CALIBRATION_LINES / seconds
+
+
+def measure(case, size, directory, repeats=REPEATS):
+    """ times a case on the synthetic input of one size, each repeat
+        preceded by a run of the calibration loop
+
+    Parameters:
+    - case (benchmark_case): case to run
+    - size (str): one of SIZES
+    - directory (str): directory the synthetic input is written to
+    - repeats (int): number of timed runs, the medians are kept
+
+    Returns:
+    - dict: case, size, input megabytes and items, median seconds,
+      mb_per_s, items_per_s, calibration (median lines/s),
+      relative_speed (median over the repeats of the items per
+      calibration line) and peak_mb
+    """
+    params = case.sizes[size]
+    path = os.path.join(directory, f"{case.name}_{size}")
+    if not os.path.exists(path):
+        case.write(path, **params)
+    megabytes = os.path.getsize(path) / 1e6
+    items = case.items(params)
+    data = case.prepare(path) if case.prepare else path
+
+    text = calibration_text()
+    calibration_loops = loops_for(calibration_loop, text)
+    loops = loops_for(case.run, data)
+    times = []
+    calibration_times = []
+    for _ in range(repeats):
+        calibration_times.append(time_loops(calibration_loop, text, calibration_loops))
+        times.append(time_loops(case.run, data, loops))
+    times = np.array(times)
+    calibration_times = np.array(calibration_times)
+    seconds = float(np.median(times))
+    calibration = CALIBRATION_LINES / float(np.median(calibration_times))
+    relative_speed = float(np.median(items * calibration_times / times / CALIBRATION_LINES))
+
+    # tracing slows the run down so memory is measured separately
+    tracemalloc.start()
+    try:
+        case.run(data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {"case": case.name, "size": size, "megabytes": round(megabytes, 3),
+              "items": items, "seconds": seconds,
+              "mb_per_s": megabytes / seconds, "items_per_s": items / seconds,
+              "calibration": calibration, "relative_speed": relative_speed,
+              "peak_mb": peak / 1e6}
+    ntlogger.info("%s/%s: %.3f s, %.1f MB/s, %.0f items/s, %.1f MB peak", case.name, size,
+                  seconds, result["mb_per_s"], result["items_per_s"], result["peak_mb"])
+    return result
+
+
+def run_benchmarks(names=None, sizes=("small",), repeats=REPEATS, directory=None):
+    """ runs the benchmark cases at each size
+
+    Parameters:
+    - names (list of str): cases to run, by default all of CASES
+    - sizes (list of str): sizes to run
+    - repeats (int): number of timed runs of each case
+    - directory (str): directory for the synthetic inputs, kept so later
+      runs reuse them, by default a temporary directory
+
+    Returns:
+    - list of dict: results from measure
+    """
+    cases = CASES if names is None else [find_case(name) for name in names]
+    for size in sizes:
+        if size not in SIZES:
+            raise ValueError(f"Unknown benchmark size: {size}, options are {SIZES}")
+
+    if directory is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_benchmarks(names, sizes, repeats, tmp)
+    ut.ensure_dir_exists(directory)
+    return [measure(case, size, directory, repeats) for case in cases for size in sizes]
+
+
+def load_baselines(path):
+    """ reads the baselines JSON, an empty dict if it does not exist """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results, path):
+    """ adds the results to the baselines JSON, replacing those of the same
+        case and size
+    """
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[f"{result['case']}/{result['size']}"] = {
+            key: result[key] for key in ("megabytes", "items", "seconds", "mb_per_s",
+                                         "items_per_s", "calibration", "relative_speed",
+                                         "peak_mb")}
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baselines, tolerance=TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """ finds results that regressed from their baseline
+
+    Parameters:
+    - results (list of dict): results from measure
+    - baselines (dict): baselines from load_baselines, results without
+      one are not checked, nor the speed of a baseline without a
+      relative speed
+    - tolerance (float): allowed fractional drop in relative speed
+    - memory_tolerance (float): allowed fractional growth of the peak
+      memory, on top of MEMORY_SLACK MB
+
+    Returns:
+    - list of str: description of each regression, empty if none
+    """
+    regressions = []
+    for result in results:
+        key = f"{result['case']}/{result['size']}"
+        if key not in baselines:
+            ntlogger.info("No baseline for %s", key)
+            continue
+        base = baselines[key]
+        if "relative_speed" not in base:
+            ntlogger.info("No relative speed for %s, only the memory is checked", key)
+        elif result["relative_speed"] < base["relative_speed"] * (1 - tolerance):
+            regressions.append(f"{key}: relative speed {result['relative_speed']:.3g} is "
+                               f"{1 - result['relative_speed'] / base['relative_speed']:.0%} "
+                               f"below the baseline {base['relative_speed']:.3g} "
+                               f"({result['items_per_s']:.0f} items/s)")
+        # slack so the small cases do not fail on a few extra allocations
+        if result["peak_mb"] > base["peak_mb"] * (1 + memory_tolerance) + MEMORY_SLACK:
+            regressions.append(f"{key}: {result['peak_mb']:.1f} MB peak memory is "
+                               f"{result['peak_mb'] / base['peak_mb'] - 1:.0%} "
+                               f"above the baseline {base['peak_mb']:.1f} MB")
+    return regressions
+
+
+def result_table(results):
+    """ lines of a text table of results """
+    lines = [f"{'case':<22}{'size':<8}{'MB':>9}{'seconds':>10}{'MB/s':>9}"
+             f"{'items/s':>12}{'relative':>10}{'peak MB':>9}"]
+    for r in results:
+        lines.append(f"{r['case']:<22}{r['size']:<8}{r['megabytes']:9.2f}{r['seconds']:10.4f}"
+                     f"{r['mb_per_s']:9.1f}{r['items_per_s']:12.0f}{r['relative_speed']:10.3g}"
+                     f"{r['peak_mb']:9.1f}")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmarks the readers against stored baselines")
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="cases to run, default all: " + ", ".join(c.name for c in CASES))
+    parser.add_argument("--sizes", nargs="+", default=["small", "medium"], choices=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed runs of each case")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed fractional drop in relative speed")
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE,
+                        help="allowed fractional growth in peak memory")
+    parser.add_argument("--update", action="store_true",
+                        help="store the results as the new baselines")
+    parser.add_argument("--inputs", default=None,
+                        help="directory to keep the synthetic inputs in between runs")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.cases, args.sizes, args.repeats, args.inputs)
+    print("\n".join(result_table(results)))
+    if args.update:
+        save_baselines(results, args.baseline)
+        print(f"baselines written to {args.baseline}")
+    else:
+        regressions = compare(results, load_baselines(args.baseline), args.tolerance,
+                              args.memory_tolerance)
+        print("\n".join(regressions) if regressions else "no regressions")
+        if regressions:
+            raise SystemExit(1)
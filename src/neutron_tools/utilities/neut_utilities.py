@@ -1,14 +1,26 @@
 """utility functions for use by neutron tools"""
 from os import PathLike
-from typing import Any, Iterable, List, Optional, Sequence, Union
+from typing import (IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    TypeVar, Union, cast)
 from pathlib import Path
+from contextlib import contextmanager
+import bz2
+import functools
+import gzip
+import json
 import logging
 import logging.handlers
+import lzma
+import mmap
+import shutil
 import sys
+import tempfile
+import time
 import numpy as np
 from datetime import datetime
 
 FilePath = Union[str, PathLike[str], Path]
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 class NeutronToolsLogger:
@@ -69,6 +81,172 @@ class NeutronToolsLogger:
             self.setup_logging()
         return self.logger
 
+    def enable_instrumentation(self) -> "Instrumentation":
+        """Start recording timing spans and counters from the readers,
+        each finished span is also logged at debug level"""
+        return enable_instrumentation(self.logger)
+
+    def disable_instrumentation(self) -> Optional["Instrumentation"]:
+        """Stop recording, returns the recorder with what was recorded"""
+        return disable_instrumentation()
+
+    def instrumentation_summary(self) -> List[str]:
+        """Summary table of the spans and counters recorded so far"""
+        if _instrumentation is None:
+            return []
+        return _instrumentation.summary_table()
+
+    def export_instrumentation(self, path: FilePath) -> None:
+        """Write the spans and counters recorded so far as JSON lines"""
+        if _instrumentation is not None:
+            _instrumentation.export_jsonl(path)
+
+
+class Instrumentation:
+    """Records timing spans and counters from the readers.
+
+    Spans nest, each is recorded under the path of the spans enclosing it
+    e.g. 'read_output_file/tallies/read_tally_block', so the time of each
+    phase of a parse can be separated. Counters are running totals such as
+    lines scanned, bytes read or objects created.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+        self.logger = logger
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self._stack: List[str] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Times the block inside the with statement as a span called name"""
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            self.spans.append({"span": path, "start": start, "seconds": seconds})
+            if self.logger is not None:
+                self.logger.debug("span %s took %.6f s", path, seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Adds n to the counter called name"""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Number of calls, total, mean and max seconds of each span path"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for record in self.spans:
+            entry = totals.setdefault(record["span"], {"calls": 0, "total": 0.0, "max": 0.0})
+            entry["calls"] += 1
+            entry["total"] += record["seconds"]
+            entry["max"] = max(entry["max"], record["seconds"])
+        for entry in totals.values():
+            entry["mean"] = entry["total"] / entry["calls"]
+        return totals
+
+    def summary_table(self) -> List[str]:
+        """Lines of a text table of the span summary, slowest first, then
+        the counters"""
+        summary = self.summary()
+        width = max([len(name) for name in summary] + [4])
+        lines = [f"{'span':<{width}} {'calls':>7} {'total s':>10} {'mean s':>10} {'max s':>10}"]
+        for name, entry in sorted(summary.items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{name:<{width}} {entry['calls']:7d} {entry['total']:10.4f} "
+                         f"{entry['mean']:10.4f} {entry['max']:10.4f}")
+        if self.counters:
+            width = max(len(name) for name in self.counters)
+            lines.append("")
+            lines.append(f"{'counter':<{width}} {'value':>14}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<{width}} {value:14d}")
+        return lines
+
+    def export_jsonl(self, path: FilePath) -> None:
+        """Writes one JSON object per span, then one per counter"""
+        with open(path, "w") as f:
+            for record in self.spans:
+                f.write(json.dumps(record) + "\n")
+            for name, value in self.counters.items():
+                f.write(json.dumps({"counter": name, "value": value}) + "\n")
+
+
+class _NullSpan:
+    """Span used while instrumentation is disabled, does nothing"""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_instrumentation: Optional[Instrumentation] = None
+
+
+def enable_instrumentation(logger: Optional[logging.Logger] = None) -> Instrumentation:
+    """Starts recording spans and counters, replacing any earlier recorder
+
+    Parameters:
+    - logger: logger each finished span is written to at debug level
+
+    Returns:
+    - the Instrumentation recording them
+    """
+    global _instrumentation
+    _instrumentation = Instrumentation(logger)
+    return _instrumentation
+
+
+def disable_instrumentation() -> Optional[Instrumentation]:
+    """Stops recording, returns the recorder that was in use"""
+    global _instrumentation
+    recorder, _instrumentation = _instrumentation, None
+    return recorder
+
+
+def get_instrumentation() -> Optional[Instrumentation]:
+    """The active recorder, None while instrumentation is disabled"""
+    return _instrumentation
+
+
+def span(name: str) -> Any:
+    """Context manager timing a phase of a reader, a shared no-op object
+    while instrumentation is disabled
+
+    with ut.span("read_tallies"):
+        ...
+    """
+    if _instrumentation is None:
+        return _NULL_SPAN
+    return _instrumentation.span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator recording every call of a function as a span, named after
+    the function unless name is given"""
+    def decorator(func: F) -> F:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _instrumentation is None:
+                return func(*args, **kwargs)
+            with _instrumentation.span(label):
+                return func(*args, **kwargs)
+        return cast(F, wrapper)
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    """Adds n to a counter, e.g. lines_scanned, if instrumentation is enabled"""
+    if _instrumentation is not None:
+        _instrumentation.count(name, n)
+
 
 def setup_ntlogger(
     log_file: Optional[FilePath] = None,
@@ -93,10 +271,87 @@ def write_lines(path: FilePath, lines: Iterable[Any]) -> None:
             f.write(f"{line}\n")
 
 
+# magic bytes at the start of compressed files
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+
+def detect_compression(path: FilePath) -> Optional[str]:
+    """ compression of the file at path from its magic bytes, one of gzip,
+        bz2, xz or zstd, None for an uncompressed file
+    """
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for name, magic in COMPRESSION_MAGIC.items():
+        if head[:len(magic)] == magic:
+            return name
+    return None
+
+
+def _open_zstd(path: FilePath, mode: str) -> IO[Any]:
+    """ opens a zstd file with whichever zstd library is installed """
+    try:
+        from compression import zstd  # python 3.14+
+        return zstd.open(path, mode)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(f"{path} is zstd compressed, install the zstandard package to read it")
+    return zstandard.open(path, mode)
+
+
+def open_file(path: FilePath, mode: str = "r") -> IO[Any]:
+    """ opens a file for reading, gzip, bz2, xz and zstd compressed files
+        are detected from their contents and decompressed as they are read
+
+    Parameters:
+    - path: file to open
+    - mode: "r" for text or "rb" for bytes
+    """
+    compression = detect_compression(path)
+    if compression is None:
+        return open(path, mode)
+    text_mode = "rb" if "b" in mode else "rt"
+    if compression == "gzip":
+        return gzip.open(path, text_mode)
+    if compression == "bz2":
+        return bz2.open(path, text_mode)
+    if compression == "xz":
+        return lzma.open(path, text_mode)
+    return _open_zstd(path, text_mode)
+
+
+def map_file(path: FilePath) -> mmap.mmap:
+    """ read only memory map of the file at path, a compressed file is
+        decompressed in chunks to an anonymous temporary file first
+    """
+    if detect_compression(path) is None:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        with open_file(path, "rb") as src, tempfile.TemporaryFile() as tmp:
+            shutil.copyfileobj(src, tmp, 1024 ** 2)
+            tmp.flush()
+            buf = mmap.mmap(tmp.fileno(), 0, access=mmap.ACCESS_READ)
+    count("bytes_mapped", len(buf))
+    return buf
+
+
 def get_lines(path: FilePath) -> List[str]:
-    """ reads file at path and returns a list with 1 entry per line """
-    with open(path) as f:
-        lines = f.read().splitlines()
+    """ reads file at path and returns a list with 1 entry per line,
+        compressed files are decompressed
+    """
+    with open_file(path) as f:
+        text = f.read()
+    lines = text.splitlines()
+    count("characters_read", len(text))
+    count("lines_read", len(lines))
     return lines
 
 
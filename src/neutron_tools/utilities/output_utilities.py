@@ -1,11 +1,15 @@
 """
 useful utilities for common output options
 """
+import importlib.util
+import os
 from os import PathLike
-from typing import Any, List, Mapping, Optional, Protocol, Sequence, Union
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from neutron_tools.mcnp import mcnp_output_reader
 from neutron_tools.utilities import neut_utilities as ut
 import logging as ntlogger
 
@@ -151,7 +155,7 @@ def html_output(mc_object: MCObjectProtocol, fname: FilePath) -> None:
         if tdat.times:
             hlines.append(f"Number Time Bins: {len(tdat.times)}")
 
-        if tdat.stat_tests:
+        if tdat.stat_tests is not None:
             hlines.append("Statistical test results")
             stat_rows = [
                 ("Mean behaviour", tdat.stat_tests[0]),
@@ -167,6 +171,8 @@ def html_output(mc_object: MCObjectProtocol, fname: FilePath) -> None:
             ]
             stat_lines = ["<table><tr><th>Test</th><th>Result</th></tr>"]
             for name, val in stat_rows:
+                if isinstance(val, (bool, np.bool_)):
+                    val = "yes" if val else "no"
                 stat_lines.append(f"<tr><td>{name}</td><td>{val}</td></tr>")
             stat_lines.append("</table>")
             hlines.append("\n".join(stat_lines))
@@ -240,3 +246,200 @@ def csv_out(data: Union[TallyProtocol, Sequence[TallyProtocol]], fname: FilePath
 
     ut.write_lines(fname, lines)
     ntlogger.info("produced csv file: %s", fname)
+
+
+# optional library needed by each export format, in order of preference
+EXPORT_LIBRARIES = {"parquet": "pyarrow", "feather": "pyarrow", "hdf5": "tables"}
+EXPORT_EXTENSIONS = {"parquet": "parquet", "feather": "feather"}
+
+
+def available_export_formats() -> List[str]:
+    """ export formats whose optional library is installed, best first """
+    return [fmt for fmt, lib in EXPORT_LIBRARIES.items()
+            if importlib.util.find_spec(lib) is not None]
+
+
+def select_export_format(format: Optional[str] = None) -> str:
+    """ checks the requested export format can be written, by default the
+        first of parquet, feather and hdf5 with its library installed
+
+    Raises:
+    - ValueError: if the format is not one of EXPORT_LIBRARIES
+    - ImportError: if the library the format needs is not installed
+    """
+    if format is None:
+        available = available_export_formats()
+        if not available:
+            raise ImportError("Exporting tallies needs pyarrow (parquet, feather) "
+                              "or tables (hdf5), install one of them")
+        return available[0]
+    format = format.lower()
+    if format not in EXPORT_LIBRARIES:
+        raise ValueError(f"Unknown export format {format}, options are {list(EXPORT_LIBRARIES)}")
+    if importlib.util.find_spec(EXPORT_LIBRARIES[format]) is None:
+        raise ImportError(f"{format} export needs {EXPORT_LIBRARIES[format]}, install it to use it")
+    return format
+
+
+def tallies_frame(mc_output: Any, tallies: Optional[Sequence[int]] = None
+                  ) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """ every tally of an output as one long format table and its metadata
+
+    Parameters:
+    - mc_output (MCNPOutput): output read by read_output_file, eagerly or
+      lazily
+    - tallies (list of int): tally numbers to include, default all
+
+    Returns:
+    - tuple: (data, metadata), data has the tally_to_dataframe columns
+      with object as a string label, metadata holds the file name, version, run date, nps and tally
+      numbers as strings
+    """
+    tnums = mc_output.tally_numbers if tallies is None else [int(t) for t in tallies]
+    tally_data = [mc_output.tally(t) for t in tnums]
+    frames = [mcnp_output_reader.tally_to_dataframe(t) for t in tally_data]
+    for frame in frames:
+        # labelled bins such as (1 2 3) or 1<2[0 0 0]<3 share the column
+        # with cell numbers, so every id is kept as its label
+        ids = frame["object"]
+        frame["object"] = ids.astype(object).where(ids.isna(), ids.astype(str))
+    if frames:
+        data = pd.concat(frames, ignore_index=True)
+    else:
+        data = mcnp_output_reader.tally_to_dataframe(mcnp_output_reader.MCNP_tally_data())
+    data["tally"] = data["tally"].astype("int64")
+    data["particle"] = data["particle"].astype("category")
+    for col in ("energy", "time", "angle", "user_bin", "result", "rel_err"):
+        data[col] = data[col].astype("float64")
+
+    nps = [t.nps for t in tally_data if isinstance(t.nps, int)]
+    metadata = {"file_name": str(mc_output.file_name), "version": str(mc_output.version),
+                "date": str(mc_output.date), "nps": str(max(nps)) if nps else "",
+                "tallies": ",".join(str(t) for t in tnums)}
+    return data, metadata
+
+
+def export_tallies(mc_output: Any, path: FilePath, format: Optional[str] = None,
+                   tallies: Optional[Sequence[int]] = None) -> str:
+    """ writes every tally of an output to a columnar dataset partitioned
+        by tally, with the tallies_frame metadata stored alongside
+
+        parquet and feather are written as a directory with a tally=N
+        sub-directory per tally and the metadata in the schema, feather
+        files are uncompressed Arrow IPC so they are memory mapped on
+        reading. hdf5 is a single file with a tally_N key per tally and the
+        metadata as attributes.
+
+    Parameters:
+    - mc_output (MCNPOutput): output read by read_output_file
+    - path (str): directory for parquet and feather, file for hdf5, any
+      existing data for the same tallies is replaced
+    - format (str): parquet, feather or hdf5, by default the best one
+      installed
+    - tallies (list of int): tally numbers to export, default all
+
+    Returns:
+    - str: the format written
+    """
+    format = select_export_format(format)
+    data, metadata = tallies_frame(mc_output, tallies)
+
+    if format == "hdf5":
+        with pd.HDFStore(path, mode="w") as store:
+            for tnum, frame in data.groupby("tally", sort=False):
+                key = f"tally_{tnum}"
+                store.put(key, frame.reset_index(drop=True), format="table")
+                store.get_storer(key).attrs.metadata = metadata
+    else:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata.update({k.encode(): v.encode() for k, v in metadata.items()})
+        table = table.replace_schema_metadata(schema_metadata)
+        file_format = "parquet" if format == "parquet" else "ipc"
+        options = None
+        if format == "feather":
+            # uncompressed so the files can be memory mapped without copying
+            options = ds.IpcFileFormat().make_write_options(compression=None)
+        ds.write_dataset(table, path, format=file_format, file_options=options,
+                         partitioning=["tally"], partitioning_flavor="hive",
+                         basename_template="part-{i}." + EXPORT_EXTENSIONS[format],
+                         existing_data_behavior="delete_matching")
+
+    ntlogger.info("exported %s tallies to %s file: %s", data["tally"].nunique(), format, path)
+    return format
+
+
+def detect_export_format(path: FilePath) -> str:
+    """ format of a dataset written by export_tallies, from its files """
+    if os.path.isfile(path):
+        return "hdf5"
+    for _, _, files in os.walk(path):
+        for fname in files:
+            for fmt, ext in EXPORT_EXTENSIONS.items():
+                if fname.endswith("." + ext):
+                    return fmt
+    raise ValueError(f"No exported tallies found in {path}")
+
+
+def read_tally_export(path: FilePath, tallies: Optional[Sequence[int]] = None,
+                      columns: Optional[Sequence[str]] = None, as_arrow: bool = False
+                      ) -> Tuple[Any, Dict[str, str]]:
+    """ reads tallies written by export_tallies
+
+        feather datasets are memory mapped so numeric columns are not
+        copied, with as_arrow=True the pyarrow Table is returned without
+        conversion to pandas. Only the partitions of the selected tallies
+        are read.
+
+    Parameters:
+    - path (str): directory or hdf5 file written by export_tallies
+    - tallies (list of int): tally numbers to read, default all
+    - columns (list of str): columns to read, default all
+    - as_arrow (bool): return a pyarrow Table, parquet and feather only
+
+    Returns:
+    - tuple: (data, metadata), the DataFrame or Table and the export
+      metadata
+    """
+    format = detect_export_format(path)
+    select_export_format(format)
+
+    if format == "hdf5":
+        if as_arrow:
+            raise ValueError("as_arrow needs a parquet or feather export")
+        with pd.HDFStore(path, mode="r") as store:
+            # categorical columns add their own meta keys under each tally
+            keys = [k.lstrip("/") for k in store.keys() if k.count("/") == 1]
+            if tallies is not None:
+                keys = [f"tally_{int(t)}" for t in tallies if f"tally_{int(t)}" in keys]
+            frames = [store.get(key) for key in keys]
+            metadata = dict(store.get_storer(keys[0]).attrs.metadata) if keys else {}
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if columns is not None:
+            data = data[list(columns)]
+        return data, metadata
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+
+    partitioning = ds.partitioning(pa.schema([("tally", pa.int64())]), flavor="hive")
+    dataset = ds.dataset(path, format="parquet" if format == "parquet" else "ipc",
+                         partitioning=partitioning, filesystem=pafs.LocalFileSystem(use_mmap=True))
+    schema_metadata = dataset.schema.metadata or {}
+    metadata = {k.decode(): v.decode() for k, v in schema_metadata.items() if k != b"pandas"}
+    row_filter = None
+    if tallies is not None:
+        row_filter = ds.field("tally").isin([int(t) for t in tallies])
+    if columns is None:
+        # the partition column is appended last, restore the written order
+        names = dataset.schema.names
+        columns = [c for c in mcnp_output_reader.TALLY_COLUMNS if c in names]
+        columns += [c for c in names if c not in columns]
+    table = dataset.to_table(columns=list(columns), filter=row_filter)
+    if as_arrow:
+        return table, metadata
+    return table.to_pandas(split_blocks=True, self_destruct=True), metadata
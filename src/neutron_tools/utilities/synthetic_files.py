@@ -0,0 +1,1084 @@
+"""
+Synthetic MCNP and FISPACT files for testing the readers at scale
+
+each writer produces a file in the layout the matching reader expects,
+with its size set by the arguments, e.g. the number of tallies, cells and
+energy and time bins of an MCNP output or the number of histories of a
+PTRAC file. Values come from a numpy random generator seeded by seed so
+the same arguments always give the same file. Files are written as they
+are generated so GB scale files need little memory.
+
+    write_mcnp_output   - MCNP output file, read by mcnp_output_reader
+    write_kcode_output  - MCNP criticality output, read by mcnp_kcode_reader
+    write_mctal         - MCNP mctal file, read by mcnp_mctal_reader
+    write_meshtal       - meshtal file, read by meshtal_analysis
+    write_ptrac         - ASCII PTRAC file, read by mcnp_ptrac_reader
+    write_fispact_output - FISPACT-II output, read by fispact_output_reader
+    write_printlib      - FISPACT printlib, read by fispact_printlib_reader
+    write_mcnp_input    - MCNP input deck, read by mcnp_input_reader
+    write_xsdir         - MCNP xsdir, read by xsdir_reader
+"""
+import logging as ntlogger
+import numpy as np
+from neutron_tools.utilities import neut_constants as nc
+
+
+RUN_DATE = "07/24/25 09:38:50"
+WIDTH = 132
+RULE = " " + "=" * 131
+
+MCNP_TITLE = "c synthetic output for reader performance tests"
+
+TABLE60_HEADER = [
+    "",
+    "                               atom        gram                                            photon",
+    "              cell      mat   density     density     volume       mass            pieces importance",
+    ""]
+
+TABLE126_HEADER = [
+    "",
+    "                       tracks     population   collisions   collisions     number        flux        average"
+    "      average",
+    "              cell    entering                               * weight     weighted     weighted   track weight"
+    "   track mfp",
+    "                                                          (per history)    energy       energy     (relative)      (cm)",
+    ""]
+
+SUMMARY_EVENTS = [
+    ("source", "escape"), ("nucl. interaction", "energy cutoff"),
+    ("particle decay", "time cutoff"), ("weight window", "weight window"),
+    ("cell importance", "cell importance"), ("weight cutoff", "weight cutoff"),
+    ("bremsstrahlung", "capture"), ("p-annihilation", "pair production")]
+
+STAT_CHECKS = [
+    " tfc bin     --mean--      ---------relative error---------      ----variance of the variance----"
+    "      --figure of merit--     -pdf-",
+    " behavior    behavior      value   decrease   decrease rate      value   decrease   decrease rate       value"
+    "     behavior     slope",
+    "",
+    " desired      random       <0.10      yes      1/sqrt(nps)       <0.10      yes        1/nps           constant"
+    "    random      >3.00",
+    " observed     random        0.00      yes          yes            0.00      yes         yes            constant"
+    "    random      10.00",
+    " passed?        yes          yes      yes          yes             yes      yes         yes               yes"
+    "        yes         yes"]
+
+PTRAC_HEADER = [
+    "   -1",
+    "mcnp    6.mpi                    04/01/16 04/27/21 11:20:10 ",
+    "c synthetic ptrac for reader performance tests                                  ",
+    "   1.4000E+01  1.0000E+00  1.0000E+02  0.0000E+00  0.0000E+00  1.0000E+00  1.0000E+00  0.0000E+00  1.0000E+00"
+    "  1.0000E+04",
+    "   0.0000E+00  0.0000E+00  0.0000E+00  0.0000E+00  0.0000E+00  0.0000E+00  1.0000E+00  2.0000E+00  0.0000E+00"
+    "  0.0000E+00",
+    "     2    6    9    7    9    7    9    7    9    7    9    2    4    0    0    0    0    0    0    0",
+    "    1   2   7   8   9  17  18  19  20  21  22  23  24  25  26  27  28   7   8  10  11  17  18  19  20  21  22  23  24"
+    "  25",
+    "   26  27  28   7   8  12  13  17  18  19  20  21  22  23  24  25  26  27  28   7   8  10  11  17  18  19  20  21  22"
+    "  23",
+    "   24  25  26  27  28   7   8  14  15  17  18  19  20  21  22  23  24  25  26  27  28"]
+
+FISPACT_BANNER = [
+    "",
+    "     ==============================================================================",
+    "     |                                                                            |",
+    "     |                            F I S P A C T - I I                             |",
+    "     |                            -------------------                             |",
+    "     |                                                                            |",
+    "     |                  Transmutation-Activation Inventory Code                   |",
+    "     |                                                                            |",
+    "     ==============================================================================",
+    ""]
+
+GAMMA_GROUPS = [
+    "( 0.00- 0.01 MeV)", "( 0.01- 0.02 MeV)", "( 0.02- 0.05 MeV)", "( 0.05- 0.10 MeV)",
+    "( 0.10- 0.20 MeV)", "( 0.20- 0.30 MeV)", "( 0.30- 0.40 MeV)", "( 0.40- 0.60 MeV)",
+    "( 0.60- 0.80 MeV)", "( 0.80- 1.00 MeV)", "( 1.00- 1.22 MeV)", "( 1.22- 1.44 MeV)",
+    "( 1.44- 1.66 MeV)", "( 1.66- 2.00 MeV)", "( 2.00- 2.50 MeV)", "( 2.50- 3.00 MeV)",
+    "( 3.00- 4.00 MeV)", "( 4.00- 5.00 MeV)", "( 5.00- 6.50 MeV)", "( 6.50- 8.00 MeV)",
+    "( 8.00-10.00 MeV)", "(10.00-12.00 MeV)", "(12.00-14.00 MeV)", "(14.00-20.00 MeV)"]
+
+DOMINANT_HEADER = [
+    "                                               DOMINANT NUCLIDES",
+    "                                               -----------------",
+    "",
+    "      NUCLIDE   ACTIVITY    PERCENT  NUCLIDE     HEAT      PERCENT  NUCLIDE  DOSE RATE    PERCENT ",
+    "                  (Bq)      ACTIVITY             (kW)       HEAT              (Sv/hr)    DOSE RATE"]
+
+DOMINANT_HEAT_HEADER = [
+    "      NUCLIDE  GAMMA HEAT   PERCENT  NUCLIDE   BETA HEAT   PERCENT ",
+    "                  (kW)       GAMMA               (kW)       BETA"]
+
+COMPOSITION_HEADER = [
+    "                                               COMPOSITION  OF  MATERIAL  BY  ELEMENT",
+    "                                               --------------------------------------",
+    "0                                                             BETA                     GAMMA                     ALPHA",
+    "                      ATOMS      GRAM-ATOMS     GRAMS      CURIES-MeV      kW        CURIES-MeV      kW"
+    "        CURIES-MeV      kW",
+    ""]
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def write_lines(f, lines):
+    """ writes a list of lines to the open file f """
+    f.write("\n".join(lines))
+    f.write("\n")
+
+
+def format_rows(fmt, *columns):
+    """ formats the rows of equal length columns with a single % format
+        string per row
+    """
+    return [fmt % row for row in zip(*columns)]
+
+
+def combined_error(values, errors, axis=-1):
+    """ relative error of the sum of values with relative errors, used for
+        the total bins
+    """
+    total = values.sum(axis=axis)
+    spread = np.sqrt(((values * errors) ** 2).sum(axis=axis))
+    return total, np.divide(spread, total, out=np.zeros_like(total), where=total > 0)
+
+
+def random_results(rng, shape):
+    """ positive results spanning a few decades and relative errors below
+        0.2, a few bins are left as zero with zero error as in real output
+    """
+    values = 10.0 ** rng.uniform(-8, -2, shape)
+    errors = np.round(rng.uniform(0.0005, 0.2, shape), 4)
+    zeros = rng.random(shape) < 0.05
+    values[zeros] = 0.0
+    errors[zeros] = 0.0
+    return values, errors
+
+
+def pad(line):
+    """ pads a line with trailing spaces to the MCNP page width """
+    return line.ljust(WIDTH)
+
+
+def mcnp_header(title=MCNP_TITLE):
+    """ first lines of an MCNP output, up to the end of the input echo """
+    return [
+        "          Code Name & Version = MCNP, 6.1.1b",
+        "  ",
+        "  synthetic output, see neutron_tools.utilities.synthetic_files",
+        "  ",
+        f"1mcnp     version 6.mpi ld=01/13/25                     {RUN_DATE} ",
+        f" *************************************************************************                 probid =  {RUN_DATE} ",
+        " n=synthetic.i",
+        "",
+        f"    1-       {title}",
+        ""]
+
+
+def table60_lines(cells, volumes, densities):
+    """ print table 60 for cells 1..n with material 1 in the cells with a
+        density
+    """
+    n = len(cells)
+    mats = np.where(densities > 0, 1, 0)
+    atom = densities * 0.0223
+    mass = densities * volumes
+    lines = [pad("1cells") + "print table 60"] + TABLE60_HEADER
+    lines += format_rows("%9d%9d%9d  %.5E %.5E %.5E %.5E%12d  %.4E",
+                         np.arange(1, n + 1), cells, mats, atom, densities,
+                         volumes, mass, np.ones(n, dtype=int), np.ones(n))
+    lines += ["", f" total{'':46}{volumes.sum():.5E} {mass.sum():.5E}", "",
+              "    minimum source weight = 1.0000E+00    maximum source weight = 1.0000E+00", ""]
+    return lines
+
+
+def table126_lines(cells, rng):
+    """ print table 126, photon activity in each cell """
+    n = len(cells)
+    entering = rng.integers(1000, 10000000, n)
+    population = (entering * rng.uniform(0.5, 1.0, n)).astype(int)
+    collisions = (entering * rng.uniform(0.0, 2.0, n)).astype(int)
+    lines = [pad("1photon   activity in each cell") + "print table 126"] + TABLE126_HEADER
+    lines += format_rows("%9d%9d%12d%13d%13d    %.4E   %.4E   %.4E   %.4E   %.4E",
+                         np.arange(1, n + 1), cells, entering, population, collisions,
+                         collisions / 1e6, rng.uniform(0, 2, n), rng.uniform(0, 2, n),
+                         np.ones(n), rng.uniform(0, 10, n))
+    lines += ["", f"           total{entering.sum():14d}{population.sum():13d}"
+              f"{collisions.sum():13d}    {collisions.sum() / 1e6:.4E}", ""]
+    return lines
+
+
+def summary_lines(nps, rng):
+    """ problem summary with a photon creation and loss table """
+    lines = ["1problem summary", "",
+             f"      run terminated when {nps:11d}  particle histories were done.",
+             f"+{'':100}{RUN_DATE}",
+             f"      {MCNP_TITLE:<80}probid =  {RUN_DATE}", "",
+             " photon creation     tracks      weight        energy            "
+             "photon loss         tracks      weight        energy",
+             "                                 (per source particle)           "
+             "                                (per source particle)", ""]
+    tracks = rng.integers(0, nps, (len(SUMMARY_EVENTS), 2))
+    tracks[0, 0] = nps
+    weights = tracks / nps
+    energies = weights * rng.uniform(0.1, 2.0, tracks.shape)
+    half = "%-18s%8d    %.4E    %.4E          "
+    for (create, loss), t, w, e in zip(SUMMARY_EVENTS, tracks, weights, energies):
+        lines.append(" " + half % (create, t[0], w[0], e[0]) + half.rstrip() % (loss, t[1], w[1], e[1]))
+    total = tracks.sum(axis=0)
+    lines.append(" " + half % ("    total", total[0], total[0] / nps, energies[:, 0].sum())
+                 + half.rstrip() % ("    total", total[1], total[1] / nps, energies[:, 1].sum()))
+    lines.append("")
+    return lines
+
+
+def volume_lines(cells, volumes):
+    """ the cell: and volume lines of a cell tally, five cells per line """
+    lines = []
+    for i in range(0, len(cells), 5):
+        lines.append(pad("                   cell:" + "".join(
+            "%8s     " % c for c in cells[i:i + 5])))
+        lines.append("                         " + "  ".join(
+            "%.5E" % v for v in volumes[i:i + 5]))
+    return lines
+
+
+def time_header(labels):
+    """ time: line of a time binned tally """
+    columns = (f"{label:>21}" if i else f"{label:>17}" for i, label in enumerate(labels))
+    return "         time:" + "".join(columns)
+
+
+def pair_text(values, errors):
+    """ result and rel error pairs of one row of a time binned tally """
+    return "   ".join("%.5E %.4f" % pair for pair in zip(values, errors))
+
+
+def cell_result_lines(cell, energies, times, values, errors):
+    """ results of one cell of a cell tally
+
+    Parameters:
+    - cell (int): cell number
+    - energies (np.ndarray): energy bin upper edges, empty for no energy bins
+    - times (np.ndarray): time bin upper edges, empty for no time bins
+    - values, errors (np.ndarray): (energy bins x time bins) results, the
+      size one axis for a tally without that binning
+
+    Returns:
+    - list of str: the lines from the cell header to the blank line after
+      the results
+    """
+    lines = [pad(f" cell  {cell}")]
+    if not len(energies) and not len(times):
+        return lines + ["                 %.5E %.4f" % (values[0, 0], errors[0, 0]), " "]
+
+    if not len(times):
+        total, total_err = combined_error(values[:, 0], errors[:, 0], axis=0)
+        lines.append("      energy   ")
+        lines += format_rows("    %.4E   %.5E %.4f", energies, values[:, 0], errors[:, 0])
+        lines += ["      total      %.5E %.4f" % (total, total_err), " "]
+        return lines
+
+    # time bins are printed five at a time, the last group ends with the total
+    labels = ["%.4E" % t for t in times] + ["total"]
+    total, total_err = combined_error(values, errors, axis=1)
+    values = np.column_stack([values, total])
+    errors = np.column_stack([errors, total_err])
+    for start in range(0, len(labels), 5):
+        group = slice(start, start + 5)
+        lines.append(time_header(labels[group]))
+        if not len(energies):
+            lines.append("                 " + pair_text(values[0, group], errors[0, group]))
+        else:
+            lines.append("      energy   ")
+            for energy, row, err in zip(energies, values[:, group], errors[:, group]):
+                lines.append("    %.4E   " % energy + pair_text(row, err))
+            etotal, etotal_err = combined_error(values[:, group], errors[:, group], axis=0)
+            lines.append("      total      " + pair_text(etotal, etotal_err))
+        lines.append(" ")
+    return lines
+
+
+def tally_lines(tnum, nps, cells, volumes, energies, times, rng):
+    """ one printout of an F4 photon flux tally over cells """
+    lines = [f"1tally{tnum:9d}        nps ={nps:12d}",
+             "           tally type 4    track length estimate of particle flux.      units   1/cm**2        ",
+             "           particle(s): photons  ",
+             "",
+             "           volumes "]
+    lines += volume_lines(cells, volumes)
+    lines.append(" ")
+    shape = (max(len(energies), 1), max(len(times), 1))
+    for cell in cells:
+        values, errors = random_results(rng, shape)
+        lines += cell_result_lines(cell, energies, times, values, errors)
+    lines += ["", RULE, "",
+              "           results of 10 statistical checks for the estimated answer for the tally fluctuation chart (tfc)"
+              f" bin of tally {tnum:8d}",
+              ""]
+    lines += STAT_CHECKS
+    lines += ["", RULE, "", "",
+              f"1analysis of the results in the tally fluctuation chart bin (tfc) for tally {tnum:8d} with nps ={nps:12d}"
+              "  print table 160",
+              "", "",
+              " normed average tally per history  = %.5E          unnormed average tally per history  = %.5E"
+              % (values.sum(), values.sum() * 1e3),
+              ""]
+    return lines
+
+
+def tfc_lines(tnums, rendezvous, rng):
+    """ tally fluctuation charts, three tallies side by side """
+    rows = rendezvous[np.unique(np.linspace(0, len(rendezvous) - 1, min(len(rendezvous), 20)).astype(int))]
+    lines = [pad("1tally fluctuation charts"), ""]
+    for start in range(0, len(tnums), 3):
+        group = tnums[start:start + 3]
+        lines.append(f"{'':28}" + f"{'':26}".join(f"tally{t:9d}" for t in group))
+        lines.append("          nps" + "      mean     error   vov  slope    fom" * len(group))
+        n = len(rows)
+        columns = [rows]
+        fmt = "%13d"
+        for _ in group:
+            error = np.round(0.05 / np.sqrt(np.arange(1, n + 1)), 4)
+            columns += [10.0 ** rng.uniform(-6, -2, n), error, error / 10,
+                        rng.uniform(2, 10, n), rng.integers(100000, 9999999, n)]
+            fmt += "   %.4E %.4f %.4f %4.1f %7d"
+        lines += format_rows(fmt, *columns)
+        lines.append(" ")
+    return lines
+
+
+def lattice_labels(shape, cell=1, lattice=2, outer=3):
+    """ bin labels of a tally over every element of a lattice, i fastest """
+    return [f"{cell}<{lattice}[{i} {j} {k}]<{outer}"
+            for k in range(shape[2]) for j in range(shape[1]) for i in range(shape[0])]
+
+
+def write_mcnp_output(path, tallies=1, cells=10, energies=0, times=0, rendezvous=10,
+                      printouts=1, nps=1000000, seed=0, lattice=None):
+    """ writes a synthetic MCNP output file with F4 tallies
+
+    Parameters:
+    - path (str): file to write
+    - tallies (int): number of F4 tallies, numbered 4, 14, 24 ...
+    - cells (int): number of cells, each tally is over every cell
+    - energies (int): number of energy bins, 0 for none
+    - times (int): number of time bins, 0 for none
+    - rendezvous (int): number of master set rendezvous lines
+    - printouts (int): number of printouts of each tally, the last is the
+      final result set after the problem summary and the others follow
+      evenly spaced rendezvous
+    - nps (int): number of histories of the run
+    - seed (int): seed of the random values
+    - lattice (tuple): (i, j, k) shape of a lattice, the tallies are over
+      each element of the lattice in place of the cells
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    cell_ids = np.arange(1, cells + 1)
+    volumes = np.round(10.0 ** rng.uniform(1, 5, cells), 1)
+    densities = np.where(rng.random(cells) < 0.5, 0.0, 2.7)
+    bins = cell_ids
+    bin_volumes = volumes
+    if lattice is not None:
+        bins = lattice_labels(lattice)
+        bin_volumes = np.full(len(bins), volumes[0])
+    energy_bins = 0.1 * np.arange(1, energies + 1)
+    time_bins = 10.0 * np.arange(1, times + 1)
+    tnums = [10 * i + 4 for i in range(tallies)]
+    rendezvous = max(rendezvous, 1)
+    rnps = (nps * np.arange(1, rendezvous + 1)) // rendezvous
+    printed = set(np.linspace(0, rendezvous - 1, printouts)[:-1].astype(int)) if printouts > 1 else set()
+
+    ntlogger.info("Writing synthetic MCNP output: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, mcnp_header())
+        write_lines(f, table60_lines(cell_ids, volumes, densities))
+        for i, r in enumerate(rnps):
+            f.write(f" master set rendezvous nps = {r:11d},  work chunks =    11    {RUN_DATE} \n")
+            if i in printed:
+                for tnum in tnums:
+                    write_lines(f, tally_lines(tnum, r, bins, bin_volumes, energy_bins, time_bins, rng))
+        write_lines(f, summary_lines(nps, rng))
+        write_lines(f, table126_lines(cell_ids, rng))
+        for tnum in tnums:
+            write_lines(f, tally_lines(tnum, nps, bins, bin_volumes, energy_bins, time_bins, rng))
+        write_lines(f, tfc_lines(tnums, rnps, rng))
+        write_lines(f, [" " + "*" * 119, "",
+                        f" dump no.    2 on file synthetic.ir     nps ={nps:12d}", "", "",
+                        f" run terminated when {nps:11d}  particle histories were done.", "",
+                        " computer time =    0.56 minutes", "",
+                        f" mcnp     version 6.mpi 01/13/25                     {RUN_DATE}"])
+    return path
+
+
+def mctal_bin_lines(key, labels, total=True):
+    """ bin count line of a mctal tally followed by the bin labels, a
+        trailing t on the key marks a total bin which has no label
+    """
+    if not len(labels):
+        return [f"{key}{0:8d}"]
+    header = f"{key}t{len(labels) + 1:7d}" if total else f"{key}{len(labels):8d}"
+    return [header] + ["".join("%13.5E" % v for v in labels[i:i + 6])
+                       for i in range(0, len(labels), 6)]
+
+
+def mctal_tally_lines(tnum, ids, values, errors, energies=(), times=(), particle=2,
+                      detector=0, tfc=None):
+    """ one tally of a mctal file
+
+    Parameters:
+    - tnum (int): tally number
+    - ids (list of int): cell or surface numbers, for a detector tally one
+      entry per detector
+    - values, errors (np.ndarray): results with shape (ids, d, energy bins,
+      time bins), the energy and time axes including their total bin when
+      binned, d is 2 for a detector tally (total and uncollided)
+    - energies, times: bin upper edges, empty for no binning
+    - particle (int): MCNP5 particle number, 1 neutrons, 2 photons
+    - detector (int): 0 for none, 1 point and 2 ring detectors
+    - tfc (np.ndarray): rows of nps, mean, error and fom
+
+    Returns:
+    - list of str: the lines from the tally line to the tfc rows
+    """
+    lines = [f"tally{tnum:5d}{particle:5d}{detector:5d}", f"f{len(ids):8d}"]
+    if not detector:
+        lines += ["".join(f"{i:7d}" for i in ids[k:k + 11]) for k in range(0, len(ids), 11)]
+    lines += [f"d{values.shape[1]:8d}", f"u{0:8d}", f"s{0:8d}", f"m{0:8d}", f"c{0:8d}{0:8d}"]
+    lines += mctal_bin_lines("e", energies)
+    lines += mctal_bin_lines("t", times)
+    lines.append("vals")
+    pairs = np.column_stack([values.ravel(), errors.ravel()]).ravel()
+    full = len(pairs) // 8 * 8
+    lines += format_rows("%13.5E%7.4f" * 4, *pairs[:full].reshape(-1, 8).T)
+    if full < len(pairs):
+        lines.append("%13.5E%7.4f" * ((len(pairs) - full) // 2) % tuple(pairs[full:]))
+    if tfc is None:
+        tfc = np.array([[len(pairs), values.ravel()[-1], errors.ravel()[-1], 1.0e5]])
+    lines.append(f"tfc{len(tfc):5d}" + f"{1:8d}" * 8)
+    lines += format_rows("%11d%13.5E%13.5E%13.5E", tfc[:, 0].astype(int), *tfc[:, 1:].T)
+    return lines
+
+
+def write_mctal(path, tallies=1, cells=10, energies=0, times=0, nps=1000000, seed=0):
+    """ writes a synthetic mctal file with F4 tallies, the mctal equivalent
+        of write_mcnp_output
+
+    Parameters:
+    - path (str): file to write
+    - tallies (int): number of F4 tallies, numbered 4, 14, 24 ...
+    - cells (int): number of cells, each tally is over every cell
+    - energies (int): number of energy bins, 0 for none
+    - times (int): number of time bins, 0 for none
+    - nps (int): number of histories of the run
+    - seed (int): seed of the random values
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    cell_ids = list(range(1, cells + 1))
+    energy_bins = 0.1 * np.arange(1, energies + 1)
+    time_bins = 10.0 * np.arange(1, times + 1)
+    tnums = [10 * i + 4 for i in range(tallies)]
+    shape = (cells, 1, energies + 1 if energies else 1, times + 1 if times else 1)
+    rnps = (nps * np.arange(1, 11)) // 10
+
+    ntlogger.info("Writing synthetic mctal: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, [f"mcnp6.mpi 6     {RUN_DATE}     2 {nps:13d}{5948000000:16d}",
+                        " " + MCNP_TITLE,
+                        f"ntal{tallies:6d}"])
+        write_lines(f, ["".join(f"{t:5d}" for t in tnums[k:k + 16])
+                        for k in range(0, len(tnums), 16)])
+        for tnum in tnums:
+            values, errors = random_results(rng, shape)
+            tfc = np.column_stack([rnps, 10.0 ** rng.uniform(-6, -2, 10),
+                                   0.05 / np.sqrt(np.arange(1, 11)),
+                                   rng.uniform(1e5, 1e7, 10)])
+            write_lines(f, mctal_tally_lines(tnum, cell_ids, values, errors, energy_bins,
+                                             time_bins, tfc=tfc))
+    return path
+
+
+KCODE_PAGE = 50
+
+
+def kcode_header(entropy):
+    """ header of a page of print table 175 """
+    columns = ("      cycle     k(col)     k(abs)  k(trk len)  removal life(col)"
+               "  removal life(abs)  source points")
+    if entropy:
+        columns += "  source entropy"
+    return ["", f"{'1estimated keff results by cycle':<104}print table 175", "",
+            columns + "   average keff   std dev", ""]
+
+
+def write_kcode_output(path, cycles=100, inactive=20, histories=1000, entropy=True, seed=0):
+    """ writes a synthetic MCNP output of a criticality calculation, the
+        kcode card echo, print table 175 and the final keff
+
+    Parameters:
+    - path (str): file to write
+    - cycles (int): total number of cycles
+    - inactive (int): number of inactive cycles
+    - histories (int): nominal source size of each cycle
+    - entropy (bool): include the Shannon entropy of the source
+    - seed (int): seed of the random values
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    cycle = np.arange(1, cycles + 1)
+    # keff and entropy converge from a poor initial source
+    settle = np.exp(-cycle / 8.0)
+    keff = 1.0 - 0.05 * settle + rng.normal(0, 0.003, (3, cycles))
+    lifetime = 10.0 ** rng.uniform(-5, -4.9, (2, cycles))
+    points = histories + rng.integers(-histories // 20, histories // 20 + 1, cycles)
+    source_entropy = 7.5 - 2.5 * settle + rng.normal(0, 0.01, cycles)
+
+    combined = keff.mean(axis=0)
+    n = np.maximum(cycle - inactive, 1)
+    active_sum = np.cumsum(np.where(cycle > inactive, combined, 0.0))
+    active_sq = np.cumsum(np.where(cycle > inactive, combined ** 2, 0.0))
+    average = active_sum / n
+    std = np.sqrt(np.maximum(active_sq / n - average ** 2, 0.0) / np.maximum(n - 1, 1))
+
+    ntlogger.info("Writing synthetic kcode output: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, mcnp_header()[:-1])
+        write_lines(f, [f"    2-       kcode {histories} 1.0 {inactive} {cycles}", ""])
+        for start in range(0, cycles, KCODE_PAGE):
+            write_lines(f, kcode_header(entropy))
+            rows = []
+            for c in range(start, min(start + KCODE_PAGE, cycles)):
+                row = "%8d   %.5f    %.5f    %.5f     %.4E         %.4E   %9d" % (
+                    cycle[c], keff[0, c], keff[1, c], keff[2, c], lifetime[0, c],
+                    lifetime[1, c], points[c])
+                if entropy:
+                    row += "       %.4f" % source_entropy[c]
+                if cycle[c] > inactive:
+                    row += "        %.5f   %.5f" % (average[c], std[c])
+                rows.append(row)
+            write_lines(f, rows)
+        write_lines(f, ["", "       " + "-" * 120,
+                        "       |" + " " * 118 + "|",
+                        "       | the final estimated combined collision/absorption/track-length keff = "
+                        "%.5f with an estimated standard deviation of %.5f   |" % (average[-1], std[-1]),
+                        "       |" + " " * 118 + "|",
+                        "       " + "-" * 120, "",
+                        f" run terminated when {cycles:11d}  kcode cycles were done.", "",
+                        f" mcnp     version 6.mpi 01/13/25                     {RUN_DATE}"])
+    return path
+
+
+def write_meshtal(path, shape=(10, 10, 10), energies=1, times=1, nps=10000000, seed=0):
+    """ writes a synthetic meshtal file with one rectangular mesh tally
+
+    Parameters:
+    - path (str): file to write
+    - shape (tuple of int): number of x, y and z voxels
+    - energies (int): number of energy bins
+    - times (int): number of time bins, the column format has a single
+      bin column so only one of energies and times can be above 1
+    - nps (int): number of histories the tally is normalised by
+    - seed (int): seed of the random values
+
+    Returns:
+    - str: path
+    """
+    if energies > 1 and times > 1:
+        raise ValueError("Meshtal column format has either energy or time bins, not both")
+    rng = np.random.default_rng(seed)
+    bounds = [np.linspace(-2.0 * n, 2.0 * n, n + 1) for n in shape]
+    mids = [(b[1:] + b[:-1]) / 2 for b in bounds]
+    energy_bounds = np.append(0.0, np.arange(1, energies + 1)) if energies > 1 else np.array([0.0, 1e36])
+    time_bounds = np.append(-1e36, 1e3 * np.arange(1, times + 1))
+    labels = energy_bounds[1:] if times <= 1 else time_bounds[1:]
+
+    x, y, z = (a.ravel() for a in np.meshgrid(*mids, indexing="ij"))
+    nvox = x.size
+
+    ntlogger.info("Writing synthetic meshtal file: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, [f"mcnp   version 6.mpi ld=04/01/16  probid =  {RUN_DATE} ",
+                        " c synthetic meshtal for reader performance tests",
+                        f" Number of histories used for normalizing tallies = {nps:17.2f}",
+                        "",
+                        " Mesh Tally Number       314",
+                        " photon   mesh tally.",
+                        "",
+                        " Tally bin boundaries:"])
+        for axis, bound in zip("XYZ", bounds):
+            f.write(f"    {axis} direction: " + "".join(f"{b:10.2f}" for b in bound) + "\n")
+        if times > 1:
+            f.write("    Time bin boundaries: " + " ".join(f"{t:.2E}" for t in time_bounds) + "\n")
+        f.write("    Energy bin boundaries: " + " ".join(f"{e:.2E}" for e in energy_bounds) + "\n")
+        f.write("\n")
+        label = "   Energy" if times <= 1 else "      Time"
+        f.write(f"{label}         X         Y         Z     Result     Rel Error\n")
+
+        total = np.zeros(nvox)
+        variance = np.zeros(nvox)
+        for bin_label in labels:
+            values, errors = random_results(rng, nvox)
+            total += values
+            variance += (values * errors) ** 2
+            write_lines(f, format_rows("%11.3E%10.3f%10.3f%10.3f %.5E %.5E",
+                                       np.full(nvox, bin_label), x, y, z, values, errors))
+        if len(labels) > 1:
+            error = np.divide(np.sqrt(variance), total, out=np.zeros_like(total), where=total > 0)
+            write_lines(f, format_rows("    Total  %10.3f%10.3f%10.3f %.5E %.5E",
+                                       x, y, z, total, error))
+    return path
+
+
+def fortran_e(values):
+    """ values in the Fortran 0.xxxxxE+nn form used by PTRAC as rows of
+        interleaved mantissa and exponent for PTRAC_FLOATS
+
+    Parameters:
+    - values (np.ndarray): (rows x 9) values
+
+    Returns:
+    - list of list: (rows x 18) mantissas and exponents
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    magnitude = np.abs(values)
+    exponent = np.zeros(values.shape, dtype=int)
+    nonzero = magnitude > 0
+    exponent[nonzero] = np.floor(np.log10(magnitude[nonzero])).astype(int) + 1
+    mantissa = np.round(values / 10.0 ** exponent, 5)
+    carry = np.abs(mantissa) >= 1
+    mantissa[carry] /= 10
+    exponent[carry] += 1
+    pairs = np.empty((len(values), 2 * values.shape[1]), dtype=object)
+    pairs[:, 0::2] = mantissa
+    pairs[:, 1::2] = exponent
+    return pairs.tolist()
+
+
+PTRAC_FLOATS = "%10.5fE%+03d" * 9
+PTRAC_CHUNK = 10000
+
+
+def ptrac_history_lines(rng, first, count, events):
+    """ lines of count PTRAC histories numbered from first
+
+        the events of all the histories are generated together, each
+        history starts at the origin and its source event is followed by
+        surface crossings (3000) and collisions (4000) and a termination
+        event (5000)
+    """
+    n = rng.integers(1, 2 * events, count)
+    sizes = n + 1
+    total = int(sizes.sum())
+    starts = np.cumsum(sizes) - sizes
+    ends = starts + n
+    within = np.arange(total) - np.repeat(starts, sizes)
+    nps = np.repeat(np.arange(first, first + count), sizes)
+
+    def from_start(increments):
+        # running sum restarting at the first event of each history
+        increments[starts] = 0.0
+        running = np.cumsum(increments, axis=0)
+        return running - np.repeat(running[starts], sizes, axis=0)
+
+    steps = rng.normal(size=(total, 3))
+    directions = steps / np.linalg.norm(steps, axis=1)[:, None]
+    positions = from_start(directions * rng.exponential(2.0, (total, 1)))
+    energy = 1.332 * np.exp(from_start(np.log(rng.uniform(0.5, 1.0, total))))
+    time = from_start(rng.uniform(0.001, 0.02, total))
+    cells = rng.integers(1, 4, total)
+
+    types = rng.choice([3000, 4000], total)
+    types[starts] = 1000
+    types[ends] = 5000
+    next_types = np.roll(types, -1)
+    next_types[ends] = 9000
+
+    floats = fortran_e(np.column_stack([positions, directions, energy, np.ones(total), time]))
+    lines = []
+    for i in range(total):
+        if within[i] == 0:
+            lines.append(f"{nps[i]:11d}{1000:10d}")
+            lines.append("%11d%10d%10d%10d%10d%10d" % (next_types[i], 1, 40, 1, 0, 0))
+        else:
+            lines.append("%11d%10d%10d%10d%10d%10d%10d" % (
+                next_types[i], 2, 2000, -1, cells[i], 1, within[i]))
+        lines.append(PTRAC_FLOATS % tuple(floats[i]))
+    return lines
+
+
+def write_ptrac(path, histories=100, events=10, seed=0):
+    """ writes a synthetic ASCII PTRAC file of photon histories
+
+        each history is a source event, a random walk of surface crossings
+        and collisions and a termination event, the event line of each
+        event gives the type of the next, 9000 after the last one
+
+    Parameters:
+    - path (str): file to write
+    - histories (int): number of histories
+    - events (int): mean number of events after the source event
+    - seed (int): seed of the random values
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    ntlogger.info("Writing synthetic PTRAC file: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, PTRAC_HEADER)
+        for first in range(1, histories + 1, PTRAC_CHUNK):
+            count = min(PTRAC_CHUNK, histories + 1 - first)
+            write_lines(f, ptrac_history_lines(rng, first, count, events))
+    return path
+
+
+def nuclide_names(count):
+    """ count distinct FISPACT nuclide names e.g. 'Fe 56 ', 'Sc 44m',
+        eight isotopes per element and isomers once the elements run out
+    """
+    symbols = list(nc.Z_dict())
+    names = []
+    for isomer in ("", "m", "n"):
+        for z, symbol in enumerate(symbols, start=1):
+            for a in range(2 * z, 2 * z + 8):
+                names.append(f"{symbol:<2}{a:>3}{isomer:<1}")
+                if len(names) == count:
+                    return names
+    raise ValueError(f"Only {len(names)} synthetic nuclide names available")
+
+
+def fispact_percent(values):
+    """ percentages in the FISPACT form with two digits before the point,
+        e.g. 95.51E+00
+    """
+    out = []
+    for value in values:
+        if value <= 0:
+            out.append("00.00E+00")
+            continue
+        exponent = int(np.floor(np.log10(value))) - 1
+        mantissa = round(value / 10.0 ** exponent, 2)
+        if mantissa >= 100:
+            mantissa /= 10
+            exponent += 1
+        out.append(f"{mantissa:5.2f}E{exponent:+03d}")
+    return out
+
+
+def dominant_lines(names, columns):
+    """ one block of the dominant nuclides table
+
+    Parameters:
+    - names (list of str): nuclide names
+    - columns (list of np.ndarray): quantities to rank the nuclides by,
+      one column of the table each
+
+    Returns:
+    - list of str: Total row, the top 25 and the Rest row
+    """
+    totals = [c.sum() for c in columns]
+    top = [np.argsort(-c, kind="stable")[:25] for c in columns]
+    lines = [f"       Total   {totals[0]:.4E}" + "".join(f"             Total   {t:.4E}" for t in totals[1:])]
+    parts = []
+    for column, order, total in zip(columns, top, totals):
+        percent = fispact_percent(100 * column[order] / total if total > 0 else column[order])
+        parts.append([f"{names[i]:<6}  {column[i]:.4E}  {p}" for i, p in zip(order, percent)])
+    for rank, row in enumerate(zip(*parts), start=1):
+        lines.append(f"{rank:5d}  " + "  ".join(row))
+    rest = []
+    for column, order, total in zip(columns, top, totals):
+        value = total - column[order].sum()
+        percent = fispact_percent([100 * value / total if total > 0 else 0.0])[0]
+        rest.append(f"Rest    {max(value, 0.0):.4E}  {percent}")
+    lines.append("       " + "  ".join(rest))
+    return lines
+
+
+def fispact_step_lines(n, length, cooling, elapsed, flux, names, masses, atoms, rng):
+    """ the inventory and totals printed for one FISPACT-II time interval """
+    k = len(names)
+    decay = np.where(rng.random(k) < 0.5, 0.0, 10.0 ** rng.uniform(-9, -1, k))
+    bq = atoms * decay
+    grams = atoms * masses / 6.02214e23
+    beta = bq * rng.uniform(0, 2e-16, k)
+    gamma = bq * rng.uniform(0, 2e-16, k)
+    dose = gamma * 10
+    flags = np.where(decay == 0, "    # ", "      ")
+    kind = "COOLING TIME IS" if cooling else "* * * * TIME IS"
+    lines = [f"1 * * * TIME INTERVAL{n:4d} * * * {kind}   {length:.4E} SECS * * * "
+             f"ELAPSED TIME IS {elapsed:10.3E} s * * * FLUX AMP IS  {flux:.4E} /cm^2/s  * * *",
+             "  NUCLIDE        ATOMS         GRAMS        Bq       b-Energy    a-Energy   g-Energy    DOSE RATE",
+             "                                                        kW          kW         kW         Sv/hr",
+             ""]
+    lines += format_rows("  %-6s%s%.5E   %.3E   %.3E   %.3E   %.2E   %.3E   %.3E",
+                         names, flags, atoms, grams, bq, beta, np.zeros(k), gamma, dose)
+
+    total_bq = bq.sum()
+    tritium = bq[names.index("H   3 ")] if "H   3 " in names else 0.0
+    heat = (beta.sum(), gamma.sum())
+    mass = grams.sum() / 1000
+    lines += [f"0  TOTAL NUMBER OF NUCLIDES PRINTED IN INVENTORY = {k:4d}",
+              "0  TOTAL CURIES   TOTAL ALPHA   TOTAL BETA    TOTAL GAMMA",
+              "                  CURIE-MeV     CURIE-MeV     CURIE-MeV",
+              f"   {total_bq / 3.7e10:.5E}   {0.0:.5E}   {heat[0] / 3.7e10:.5E}   {heat[1] / 3.7e10:.5E}",
+              f"0  ALPHA BECQUERELS = {0.0:.6E}  BETA BECQUERELS = {total_bq:.6E}  GAMMA BECQUERELS = {total_bq / 2:.6E}",
+              f"{'0  TOTAL ACTIVITY FOR ALL MATERIALS':<40}{total_bq:.5E} Bq",
+              f"{'':40}{total_bq / 3.7e10:.5E} Ci/cc{'':11}DENSITY   {5.8:.2E} gm/cc",
+              f"{'   TOTAL ACTIVITY EXCLUDING TRITIUM':<40}{total_bq - tritium:.5E} Bq",
+              f"{'':40}{(total_bq - tritium) / 3.7e10:.5E} Ci/cc",
+              f"{'0  TOTAL ALPHA HEAT PRODUCTION':<40}{0.0:.5E} kW",
+              f"{'   TOTAL BETA  HEAT PRODUCTION':<40}{heat[0]:.5E} kW",
+              f"{'   TOTAL GAMMA HEAT PRODUCTION':<40}{heat[1]:.5E} kW{'':14}TOTAL HEAT PRODUCTION {sum(heat):.5E} kW",
+              f"{'0  INITIAL TOTAL MASS OF MATERIAL':<40}{1.0:.5E} kg{'':14}TOTAL HEAT EX TRITIUM {sum(heat):.5E} kW",
+              f"{'0  TOTAL MASS OF MATERIAL':<40}{mass:.5E} kg",
+              f"{'   NEUTRON  FLUX DURING INTERVAL':<40}{flux:.5E} n/cm**2/s",
+              f"{'0  NUMBER OF FISSIONS':<40}{0.0:.5E}{'':17}BURN-UP OF ACTINIDES  {0.0:.5E} %"]
+    appm = 10.0 ** rng.uniform(-12, -9, 5)
+    for i, label in enumerate(("He  4", "He  3", "H   3", "H   2", "H   1")):
+        lines.append(f"{'0' if i == 0 else ' '}  APPM OF {label}    =  {appm[i]:.4E}")
+    lines += ["", "", ""]
+
+    # composition by element in the order the elements first appear
+    elements = [name[:2].strip() for name in names]
+    order = list(dict.fromkeys(elements))
+    zdict = nc.Z_dict()
+    lines += COMPOSITION_HEADER
+    element_atoms = {e: 0.0 for e in order}
+    for e, a in zip(elements, atoms):
+        element_atoms[e] += a
+    for e in order:
+        a = element_atoms[e]
+        lines.append(f"{zdict[e]:5d}       {e:<2}      {a:.4E}   {a / 6.02214e23:.4E}" + "   0.0000E+00" * 7)
+    lines += ["", "", ""]
+
+    spectrum = 10.0 ** rng.uniform(-4, 4, len(GAMMA_GROUPS))
+    lines += ["                                               GAMMA SPECTRUM AND ENERGIES/SECOND",
+              "                                               ----------------------------------",
+              "",
+              f"     NEUTRONS PER SECOND ARISING FROM SPONTANEOUS FISSION                    {0.0:.5E}"
+              "    Entered density (g/cc)       5.80",
+              f"     POWER FROM ALPHA PARTICLES (MeV per Second)                             {0.0:.5E}",
+              f"     POWER FROM BETA  PARTICLES (MeV per Second)                             {heat[0] * 6.2415e15:.5E}",
+              f"     TOTAL GAMMA POWER FROM ACTIVATION  (MeV per Second)                     {heat[1] * 6.2415e15:.5E}"
+              f"    Total gammas (per cc per second)      {spectrum.sum():.5E}"]
+    for i, (group, value) in enumerate(zip(GAMMA_GROUPS, spectrum)):
+        if i == 0:
+            label = f"{'     GAMMA RAY POWER FROM ACTIVATION DECAY  MeV/s':<57}"
+            middle = f"{'    Gammas per group (per cc per second)':<42}"
+        else:
+            label = " " * 57
+            middle = " " * 42
+        lines.append(f"{label}{group}   {value * 0.5:.5E}{middle}{value:.5E}")
+    lines += ["",
+              f"    DOSE RATE (1 g POINT SOURCE  0.3m) FROM GAMMAS WITH ENERGY 0-20MeV IS   {dose.sum():.5E} Sieverts/hour",
+              "", "", "", ""]
+
+    lines += DOMINANT_HEADER
+    lines += dominant_lines(names, [bq, beta + gamma, dose])
+    lines.append("")
+    lines += DOMINANT_HEAT_HEADER
+    lines += dominant_lines(names, [gamma, beta])
+    return lines, total_bq, dose.sum(), sum(heat), tritium
+
+
+def write_fispact_output(path, steps=3, nuclides=50, irradiation_steps=None, seed=0):
+    """ writes a synthetic FISPACT-II output file
+
+    Parameters:
+    - path (str): file to write
+    - steps (int): number of time intervals after the initial inventory
+    - nuclides (int): number of nuclides in every inventory
+    - irradiation_steps (int): number of the steps with a flux, the rest
+      are cooling steps, by default half of them
+    - seed (int): seed of the random values
+
+    Returns:
+    - str: path
+    """
+    if irradiation_steps is None:
+        irradiation_steps = max(steps // 2, 1)
+    rng = np.random.default_rng(seed)
+    names = nuclide_names(nuclides)
+    masses = np.array([int(name[2:5]) for name in names], dtype=float)
+    flux = 6.0e6
+    length = 600.0
+
+    ntlogger.info("Writing synthetic FISPACT output: %s", path)
+    summary = []
+    elapsed = 0.0
+    with open(path, "w") as f:
+        write_lines(f, FISPACT_BANNER)
+        for n in range(steps + 1):
+            cooling = n > irradiation_steps
+            step = 0.0 if n == 0 else length
+            step_flux = 0.0 if n == 0 or cooling else flux
+            elapsed += step
+            atoms = 10.0 ** rng.uniform(3, 25, nuclides)
+            lines, act, dose, heat, tritium = fispact_step_lines(
+                n + 1, step, cooling, elapsed, step_flux, names, masses, atoms, rng)
+            write_lines(f, lines)
+            if n:
+                summary.append((cooling, act, dose, heat, tritium))
+
+        lines = ["1                                                            Summary Output",
+                 "",
+                 "0           Time       Cumulative   Activity               Dose rate             Heat output"
+                 "           Ingestion dose        Inhalation dose        Tritium activity",
+                 "           (step)       (Years)      (Bq)                   (Sv/h)                (kW)"
+                 "                    (Sv)                   (Sv)                  (Bq)",
+                 " -----Irradiation Phase-----"]
+        years = 0.0
+        phase_cooling = False
+        for cooling, act, dose, heat, tritium in summary:
+            if cooling and not phase_cooling:
+                lines.append(" -----Cooling Phase-----")
+                phase_cooling = True
+                years = 0.0
+            years += length / SECONDS_PER_YEAR
+            kind = "Cooling" if cooling else "Irradn"
+            head = f" {kind:<7}{length / 60:9.3f} m     "
+            lines.append(f"{head}{years:.2E}   {act:.2E}" + "".join(
+                f"{'':15}{v:.2E}" for v in (dose, heat, 0.0, 0.0, tritium)))
+        fluence = flux * length * irradiation_steps
+        lines += ["0 Mass of material input =  1.0000E+00 kg.    Material density =  5.80 g/cc",
+                  "",
+                  f"  Total irradiation time =  {length * irradiation_steps:.6E} s",
+                  f"  Total fluence          =  {fluence:.6E} n/cm2",
+                  f"  Mean flux              =  {flux:.6E} n/cm2/s",
+                  f"  Number of on-times     = {irradiation_steps:4d}",
+                  "",
+                  "fispact run time=                   1.0000     secs"]
+        write_lines(f, lines)
+    return path
+
+
+def wrap_card(name, entries, width=80):
+    """ lines of an MCNP data card with its entries wrapped onto five
+        space continuation lines
+    """
+    lines = []
+    line = name
+    for entry in entries:
+        if len(line) + len(entry) + 1 > width:
+            lines.append(line)
+            line = "     "
+        line = f"{line} {entry}"
+    lines.append(line)
+    return lines
+
+
+def write_mcnp_input(path, cells=100, materials=10, seed=0):
+    """ writes a synthetic MCNP input of nested spherical shells, each
+        shell filled with one of the materials and all of them in an F4
+        tally
+
+    Parameters:
+    - path (str): file to write
+    - cells (int): number of shells, plus an outside void and graveyard
+    - materials (int): number of materials
+    - seed (int): seed of the random densities and compositions
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    densities = np.round(rng.uniform(0.5, 20.0, cells), 3)
+    mats = np.arange(cells) % materials + 1
+    symbols = list(nc.Z_dict())
+
+    ntlogger.info("Writing synthetic MCNP input: %s", path)
+    with open(path, "w") as f:
+        lines = ["c synthetic input for reader performance tests",
+                 f"1 {mats[0]} -{densities[0]} -1 imp:n=1"]
+        lines += [f"{c} {m} -{d} {c - 1} -{c} imp:n=1"
+                  for c, m, d in zip(range(2, cells + 1), mats[1:], densities[1:])]
+        lines += [f"{cells + 1} 0 {cells} -{cells + 1} imp:n=1",
+                  f"{cells + 2} 0 {cells + 1} imp:n=0",
+                  ""]
+        lines += [f"{s} so {s:.1f}" for s in range(1, cells + 2)]
+        lines += ["", "mode n"]
+        for m in range(1, materials + 1):
+            zaids = rng.choice(np.arange(1, len(symbols) + 1), 4, replace=False)
+            entries = [f"{z * 1000 + 2 * z}.70c {frac:.4f}"
+                       for z, frac in zip(zaids, rng.uniform(0.01, 1.0, 4))]
+            lines.append(f"c {symbols[zaids[0] - 1]} alloy")
+            lines += wrap_card(f"m{m}", entries)
+        lines += wrap_card("f4:n", [str(c) for c in range(1, cells + 1)])
+        lines += ["e4 0.1 1 14",
+                  "sdef pos=0 0 0 erg=14",
+                  "nps 1000000"]
+        write_lines(f, lines)
+    return path
+
+
+def write_xsdir(path, entries=1000, seed=0):
+    """ writes a synthetic MCNP xsdir with a named atomic weight ratio for
+        every nuclide and a directory entry per nuclide and library
+
+    Parameters:
+    - path (str): file to write
+    - entries (int): number of directory entries
+    - seed (int): seed of the random record lengths
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    libraries = (".70c", ".80c", ".00c", ".31c")
+    zaids = [z * 1000 + a for z in range(1, 119) for a in range(z, 3 * z + 1)]
+    if entries > len(zaids) * len(libraries):
+        raise ValueError(f"Only {len(zaids) * len(libraries)} synthetic xsdir entries available")
+    keys = [f"{zaids[i // len(libraries)]}{libraries[i % len(libraries)]}" for i in range(entries)]
+    nuclides = sorted(set(zaids[:(entries - 1) // len(libraries) + 1]))
+    lengths = rng.integers(1000, 2000000, entries)
+    symbols = list(nc.Z_dict())
+
+    ntlogger.info("Writing synthetic xsdir: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, ["datapath=/opt/mcnp/data", "atomic weight ratios"])
+        write_lines(f, [f"{z} {symbols[z // 1000 - 1]}-{z % 1000} {0.9991673 * (z % 1000):.6f}"
+                        for z in nuclides])
+        f.write("directory\n")
+        write_lines(f, [f" {key} {0.9991673 * (int(key.split('.')[0]) % 1000):.6f} xdata/{key.split('.')[0]}"
+                        f" 0 1 1 {n} 0 0 2.5301E-08" for key, n in zip(keys, lengths)])
+    return path
+
+
+def write_printlib(path, nuclides=100, lines=10, seed=0):
+    """ writes a synthetic FISPACT printlib with discrete gamma and beta
+        lines for every nuclide
+
+    Parameters:
+    - path (str): file to write
+    - nuclides (int): number of radionuclides
+    - lines (int): number of discrete lines per nuclide
+    - seed (int): seed of the random energies and intensities
+
+    Returns:
+    - str: path
+    """
+    rng = np.random.default_rng(seed)
+    names = nuclide_names(nuclides)
+    count = nuclides * lines
+    energies = 10.0 ** rng.uniform(3, 7, count)
+    intensities = 10.0 ** rng.uniform(-6, 0, count)
+    particles = np.where(rng.random(count) < 0.7, "gamma", "beta")
+    labels = [name if i == 0 else "      " for name in names for i in range(lines)]
+
+    ntlogger.info("Writing synthetic printlib: %s", path)
+    with open(path, "w") as f:
+        write_lines(f, ["      A V E R A G E S",
+                        "  nuclide      half-life     beta (ev)     gamma (ev)     alpha (ev)",
+                        " FD  Discrete lines",
+                        "  Nuclide  Number   Type     Energy (eV)       dE (eV)      Intensity"])
+        write_lines(f, format_rows(f"  %-6s{'':17}%-9s{'':9}%11.4E{'':17}%11.4E",
+                                   labels, particles, energies, intensities))
+        f.write(" fispact run time =     0.5 secs\n")
+    return path
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+import pytest
+from neutron_tools.utilities import benchmarks
+
+
+def result(items_per_s=1000.0, peak_mb=10.0, case="read_ptrac", size="small",
+           calibration=10000.0):
+    return {"case": case, "size": size, "megabytes": 1.0, "items": 100, "seconds": 0.1,
+            "mb_per_s": 10.0, "items_per_s": items_per_s, "calibration": calibration,
+            "relative_speed": items_per_s / calibration, "peak_mb": peak_mb}
+
+
+class compare_test_case(unittest.TestCase):
+    """ tests results are compared against their baselines """
+
+    def setUp(self):
+        self.baselines = {"read_ptrac/small": result()}
+
+    def test_within_tolerance(self):
+        results = [result(items_per_s=800.0, peak_mb=11.0)]
+        self.assertEqual(benchmarks.compare(results, self.baselines, tolerance=0.3), [])
+
+    def test_throughput_regression(self):
+        regressions = benchmarks.compare([result(items_per_s=500.0)], self.baselines)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("read_ptrac/small", regressions[0])
+        self.assertIn("50%", regressions[0])
+
+    def test_slower_machine(self):
+        # half the items/s on a machine that runs the calibration at half speed
+        results = [result(items_per_s=500.0, calibration=5000.0)]
+        self.assertEqual(benchmarks.compare(results, self.baselines), [])
+        results = [result(items_per_s=500.0, calibration=20000.0)]
+        self.assertIn("75%", benchmarks.compare(results, self.baselines)[0])
+
+    def test_absolute_baseline(self):
+        # baselines without a relative speed only check the memory
+        baselines = {"read_ptrac/small": {"items_per_s": 1000.0, "peak_mb": 10.0}}
+        self.assertEqual(benchmarks.compare([result(items_per_s=1.0)], baselines), [])
+        self.assertEqual(len(benchmarks.compare([result(peak_mb=20.0)], baselines)), 1)
+
+    def test_memory_regression(self):
+        regressions = benchmarks.compare([result(peak_mb=20.0)], self.baselines)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("peak memory", regressions[0])
+
+    def test_no_baseline(self):
+        results = [result(items_per_s=1.0, size="large")]
+        self.assertEqual(benchmarks.compare(results, self.baselines), [])
+
+
+class measure_test_case(unittest.TestCase):
+    """ tests a case is measured and stored as a baseline """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_measure(self):
+        results = benchmarks.run_benchmarks(["XSDir.from_file"], ["small"], repeats=1,
+                                            directory=self.tmp.name)
+        self.assertEqual(len(results), 1)
+        res = results[0]
+        self.assertEqual(res["items"], 1000)
+        self.assertGreater(res["megabytes"], 0)
+        self.assertGreater(res["mb_per_s"], 0)
+        self.assertGreater(res["peak_mb"], 0)
+        self.assertAlmostEqual(res["relative_speed"], res["items_per_s"] / res["calibration"])
+        self.assertGreater(benchmarks.calibrate(repeats=1), 0)
+
+    def test_save_and_load(self):
+        path = os.path.join(self.tmp.name, "baselines.json")
+        self.assertEqual(benchmarks.load_baselines(path), {})
+        benchmarks.save_baselines([result(), result(size="medium")], path)
+        benchmarks.save_baselines([result(items_per_s=5.0)], path)
+        baselines = benchmarks.load_baselines(path)
+        self.assertEqual(list(baselines), ["read_ptrac/medium", "read_ptrac/small"])
+        self.assertEqual(baselines["read_ptrac/small"]["items_per_s"], 5.0)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            benchmarks.run_benchmarks(["read_nothing"])
+        with self.assertRaises(ValueError):
+            benchmarks.run_benchmarks(sizes=["huge"])
+
+
+@pytest.mark.benchmark
+class baseline_test_case(unittest.TestCase):
+    """ runs every case against the stored baselines, deselected by default,
+        run with pytest -m benchmark, sizes from NT_BENCHMARK_SIZES
+    """
+
+    def test_baselines(self):
+        sizes = os.environ.get("NT_BENCHMARK_SIZES", "small medium").split()
+        tolerance = float(os.environ.get("NT_BENCHMARK_TOLERANCE", benchmarks.TOLERANCE))
+        baselines = benchmarks.load_baselines("benchmark_baselines.json")
+        for case in benchmarks.CASES:
+            with self.subTest(case=case.name):
+                results = benchmarks.run_benchmarks([case.name], sizes)
+                self.assertEqual(benchmarks.compare(results, baselines, tolerance), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -103,6 +103,26 @@ class plotting_test_cases(unittest.TestCase):
         # Assert that savefig was called with the specified filename
         mock_savefig.assert_called_once_with(fname)
 
+    @patch("matplotlib.pyplot.savefig")
+    @patch("matplotlib.pyplot.show")
+    def test_t8_spec_ratio_plot(self, mock_show, mock_savefig):
+        for tn in self.single.tally_data:
+            if tn.number == 8:
+                data = tn
+        fname = "test"
+        ma.plot_spectra_ratio(data, data, fname, "")
+        mock_savefig.assert_called_once_with(fname)
+
+    @patch("matplotlib.pyplot.savefig")
+    @patch("matplotlib.pyplot.show")
+    def test_t5_spec_ratio_plot(self, mock_show, mock_savefig):
+        for tn in self.single.tally_data:
+            if tn.number == 5:
+                data = tn
+        fname = "test"
+        ma.plot_spectra_ratio(data, data, fname, "")
+        mock_savefig.assert_called_once_with(fname)
+
     @patch("matplotlib.pyplot.savefig")
     @patch("matplotlib.pyplot.show")
     def test_run_comp_plot(self, mock_show, mock_savefig):
@@ -225,6 +245,29 @@ class plot_spectra_additional_test_cases(unittest.TestCase):
         ma.plot_spectra(tally, "out.png", "test", legend=["surf 1"])
         mock_savefig.assert_called_once_with("out.png")
 
+    @patch("matplotlib.pyplot.savefig")
+    @patch("matplotlib.pyplot.show")
+    def test_spectra_type1_angle_bins(self, mock_show, mock_savefig):
+        # surface x angle x energy results as read_type_surface stores them
+        eng = [0.1, 0.5, 1.0, 2.0]
+        for surfaces in (["1"], ["1", "2"]):
+            tally = mor.MCNP_surface_tally()
+            tally.tally_type = "1"
+            tally.eng = eng
+            tally.surfaces = surfaces
+            tally.ang_bins = [-1.0, 0.0, 1.0]
+            values = np.arange(1, 8 * len(surfaces) + 1, dtype=float).reshape(-1, 2, 4)
+            tally.array = mor.TallyArray(values, np.full(values.shape, 0.01),
+                                         {"object": surfaces, "angle": [0.0, 1.0],
+                                          "energy": eng})
+            tally.result = None
+            mock_savefig.reset_mock()
+            ma.plot_spectra(tally, "out.png", "test")
+            mock_savefig.assert_called_once_with("out.png")
+            labels = [line.get_label() for line in ma.plt.gca().get_lines()]
+            self.assertEqual(len(labels), 2 * len(surfaces))
+            self.assertIn("mu -1 to 0", labels[0])
+
 
 class plot_ET_heatmap_test(unittest.TestCase):
     """ tests for plot_ET_heatmap """
@@ -332,6 +375,25 @@ class html_output_test(unittest.TestCase):
         output_utilities.html_output(mc_obj, "output.html")
         mock_write_html.assert_called_once()
 
+    @patch("neutron_tools.utilities.output_utilities.ut.write_html", create=True)
+    @patch("matplotlib.pyplot.savefig")
+    def test_html_output_with_stat_arrays(self, mock_savefig, mock_write_html):
+        mc_obj = MagicMock()
+        mc_obj.warnings = []
+        tdat = MagicMock()
+        tdat.tally_type = "4"
+        tdat.eng = None
+        tdat.times = None
+        tdat.stat_tests = np.array([True] * 9 + [False])
+        tdat.cells = ['2']
+        tdat.vols = ['100.0']
+        mc_obj.tally_data = [tdat]
+
+        output_utilities.html_output(mc_obj, "output.html")
+        html = "\n".join(mock_write_html.call_args[0][1])
+        self.assertIn("<td>Mean behaviour</td><td>yes</td>", html)
+        self.assertIn("<td>PDF slope</td><td>no</td>", html)
+
 
 class html_f4_tab_out_test(unittest.TestCase):
     """ tests for html_f4_tab_out """
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from neutron_tools.mcnp import mcnp_kcode_reader
+from neutron_tools.utilities import synthetic_files
+
+
+# input echo and start of print table 175 laid out as MCNP6 prints them,
+# skipped kcode entries take the defaults
+TABLE_175_EXCERPT = """\
+          Code Name & Version = MCNP6, 1.0
+
+    1-       godiva bare sphere
+    2-       1    1  -18.74  -1   imp:n=1
+    3-       2    0           1   imp:n=0
+    4-
+    5-       1    so  8.7407
+    6-
+    7-       m1   92235.80c  -93.71  92238.80c  -5.27  92234.80c  -1.02
+    8-       kcode    5000 j 15 j     $ source size and inactive cycles only
+    9-       ksrc     0 0 0
+   10-       hsrc     5 -8.75 8.75  5 -8.75 8.75  5 -8.75 8.75
+
+1estimated keff results by cycle                                                                        print table 175
+
+      cycle     k(col)     k(abs)  k(trk len)  removal life(col)  removal life(abs)  source points  source entropy
+
+         1   0.98135    0.98426    0.98247     5.8814E-09         5.9103E-09           5000       4.2106
+         2   0.99743    0.99521    0.99802     5.8691E-09         5.8950E-09           4907       4.5980
+         3   1.00321    1.00067    1.00148     5.9027E-09         5.9198E-09           4991       4.6233
+        16   0.99861    0.99703    0.99912     5.8930E-09         5.9058E-09           5012       4.6351
+        17   1.00243    1.00410    1.00299     5.9104E-09         5.9221E-09           5037       4.6298
+        18   0.99577    0.99682    0.99634     5.8876E-09         5.9003E-09           4969       4.6412
+
+""" + "\n".join([
+    "       " + "-" * 120,
+    "       |" + " " * 118 + "|",
+    "       | the final estimated combined collision/absorption/track-length keff = 0.99631"
+    " with an estimated standard deviation of 0.00061   |",
+    "       |" + " " * 118 + "|",
+    "       " + "-" * 120, ""])
+
+
+class kcode_test_case(unittest.TestCase):
+    """ tests the cycle table of a kcode output is read into arrays """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = synthetic_files.write_kcode_output(os.path.join(self.tmp.name, "kcode.io"),
+                                                  cycles=120, inactive=20)
+        self.kcode = mcnp_kcode_reader.read_kcode(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cycles(self):
+        kcode = self.kcode
+        self.assertEqual(kcode.cycle.tolist(), list(range(1, 121)))
+        self.assertEqual(kcode.keff.shape, (120, 3))
+        self.assertEqual(kcode.lifetime.shape, (120, 2))
+        self.assertEqual(kcode.entropy.shape, (120,))
+        self.assertTrue((abs(kcode.source_points - 1000) <= 50).all())
+        self.assertEqual(kcode.inactive, 20)
+        self.assertEqual(kcode.source_size, 1000)
+        self.assertEqual(kcode.active.sum(), 100)
+
+    def test_final_keff(self):
+        # the final keff is the combined average over the active cycles
+        mean, std = self.kcode.average_keff()
+        self.assertEqual(mean.shape, (100, 3))
+        self.assertAlmostEqual(mean[-1].mean(), self.kcode.final_keff, places=4)
+        self.assertAlmostEqual(self.kcode.final_std, 0.00018)
+        self.assertTrue(np.isnan(std[0]).all())
+
+    def test_entropy_convergence(self):
+        # the synthetic entropy settles as exp(-cycle / 8)
+        converged = self.kcode.entropy_converged_cycle()
+        self.assertTrue(25 < converged < 60)
+        z = self.kcode.stationarity()
+        self.assertEqual(len(z), 120 - 2 * 10 + 1)
+        self.assertLess(z[0], -3)
+        inactive = self.kcode.suggest_inactive()
+        self.assertTrue(15 < inactive < 60)
+        self.assertIsNone(self.kcode.suggest_inactive(np.arange(120.0)))
+
+    def test_no_entropy(self):
+        path = synthetic_files.write_kcode_output(os.path.join(self.tmp.name, "k.io"),
+                                                  cycles=130, inactive=30, entropy=False)
+        kcode = mcnp_kcode_reader.read_kcode(path)
+        self.assertIsNone(kcode.entropy)
+        self.assertIsNone(kcode.entropy_converged_cycle())
+        # three pages of the table
+        self.assertEqual(len(kcode.cycle), 130)
+        self.assertEqual(kcode.source_points.dtype.kind, "i")
+        self.assertEqual(len(kcode.stationarity()), 111)
+
+    def test_not_kcode(self):
+        path = synthetic_files.write_mcnp_output(os.path.join(self.tmp.name, "f4.io"), cells=3)
+        with self.assertRaises(ValueError):
+            mcnp_kcode_reader.read_kcode(path)
+
+
+class kcode_card_test_case(unittest.TestCase):
+    """ tests the kcode card entries and their defaults """
+
+    def test_entries(self):
+        self.assertEqual(mcnp_kcode_reader.kcode_entries(" 1000 1.0 30 130"),
+                         (1000, 1.0, 30, 130))
+        self.assertEqual(mcnp_kcode_reader.kcode_entries(" 5000 j 50"), (5000, 1.0, 50, 150))
+        self.assertEqual(mcnp_kcode_reader.kcode_entries(" 2e4 2J 250"), (20000, 1.0, 30, 250))
+        self.assertEqual(mcnp_kcode_reader.kcode_entries(""), (1000, 1.0, 30, 130))
+        self.assertEqual(mcnp_kcode_reader.kcode_entries(" 500 0.9 $ 10 20"), (500, 0.9, 30, 130))
+
+    def test_table_175_excerpt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "godiva.io")
+            with open(path, "w") as f:
+                f.write(TABLE_175_EXCERPT)
+            kcode = mcnp_kcode_reader.read_kcode(path)
+        self.assertEqual(kcode.source_size, 5000)
+        self.assertEqual(kcode.initial_keff, 1.0)
+        self.assertEqual(kcode.inactive, 15)
+        self.assertEqual(kcode.total_cycles, 115)
+        self.assertEqual(kcode.cycle.tolist(), [1, 2, 3, 16, 17, 18])
+        self.assertEqual(kcode.active.tolist(), [False] * 3 + [True] * 3)
+        self.assertEqual(kcode.keff[0].tolist(), [0.98135, 0.98426, 0.98247])
+        self.assertEqual(kcode.source_points[1], 4907)
+        self.assertAlmostEqual(kcode.entropy[-1], 4.6412)
+        self.assertEqual((kcode.final_keff, kcode.final_std), (0.99631, 0.00061))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from neutron_tools.mcnp import mcnp_mctal_reader
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.utilities import synthetic_files
+
+
+class mctal_test_case(unittest.TestCase):
+    """ tests a mctal reconstructed from the singles_erg output gives the
+        tallies of that output. The run did not write a mctal, so the
+        file was laid out by hand in the MCNP5 style from the printed
+        tallies and fluctuation charts, its errors have the four digits
+        of the output. It checks the reader maps the same numbers to the
+        same tallies, not the layout of a mctal written by MCNP6.
+    """
+
+    def setUp(self):
+        self.mctal = mcnp_mctal_reader.read_mctal("test_output/singles_erg_reconstructed.m")
+        self.output = mcnp_output_reader.read_output_file("test_output/singles_erg.io")
+
+    def test_header(self):
+        self.assertEqual(self.mctal.version, "mcnp6.mpi, 6")
+        self.assertEqual(self.mctal.date, "07/24/25")
+        self.assertEqual(self.mctal.comments, ["c test input to generate output for MCNP output reader"])
+        self.assertEqual(self.mctal.tally_numbers, [1, 2, 4, 5, 6, 8])
+        self.assertEqual(self.mctal.num_tallies, 6)
+
+    def test_same_tallies(self):
+        for tal, out in zip(self.mctal.tally_data, self.output.tally_data):
+            with self.subTest(tally=tal.number):
+                self.assertEqual(type(tal), type(out))
+                self.assertEqual(tal.tally_type, out.tally_type)
+                self.assertEqual(tal.particle, out.particle)
+                self.assertEqual(tal.eng, out.eng)
+                np.testing.assert_allclose(tal.array.values, out.array.values)
+                np.testing.assert_allclose(tal.array.rel_err, out.array.rel_err)
+                np.testing.assert_allclose(tal.array.total, out.array.total)
+
+    def test_cells(self):
+        self.assertEqual(self.mctal.tally_data[2].cells, ["2"])
+        self.assertEqual(self.mctal.tally_data[0].surfaces, ["1"])
+
+    def test_uncollided(self):
+        tal = self.mctal.tally_data[3]
+        self.assertEqual(tal.uncoll_flux.shape, (1, 14))
+        self.assertEqual(tal.array.shape, (1, 14))
+
+    def test_tfc(self):
+        self.assertEqual([tfc.number for tfc in self.mctal.tfc_data], [1, 2, 4, 5, 6, 8])
+        tfc = self.mctal.tfc_data[2]
+        self.assertEqual(len(tfc.nps), 16)
+        self.assertEqual(tfc.nps[-1], 1000000)
+
+
+class mctal_bins_test_case(unittest.TestCase):
+    """ tests synthetic mctal files and the vals block conversion """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_energy_time(self):
+        path = synthetic_files.write_mctal(os.path.join(self.tmp.name, "mctal"), tallies=3,
+                                           cells=7, energies=4, times=5)
+        mc_data = mcnp_mctal_reader.read_mctal(path)
+        self.assertEqual(mc_data.tally_numbers, [4, 14, 24])
+        tal = mc_data.tally_data[0]
+        self.assertEqual(tal.cells, [str(i) for i in range(1, 8)])
+        # the energy total bin is dropped, the time total is the array total
+        self.assertEqual(tal.array.shape, (7, 4, 5))
+        self.assertEqual(tal.array.total.shape, (7, 4))
+        self.assertEqual(list(tal.array.axes), ["object", "energy", "time"])
+        self.assertEqual(tal.times, [10.0, 20.0, 30.0, 40.0, 50.0])
+        self.assertEqual(len(mc_data.tfc_data), 3)
+
+    def test_mcnp6_particle_flags(self):
+        # MCNP6 gives a negative particle number and a line of flags
+        path = os.path.join(self.tmp.name, "mctal")
+        with open(path, "w") as mctal:
+            mctal.write("mcnp6     6     01/01/25 10:00:00     1         10000           52311\n"
+                        " flags test\n"
+                        "ntal     1\n"
+                        "    4\n"
+                        "tally    4   -2    0\n"
+                        " 0 1 0 0 0 0 0 0 1\n"
+                        "f       1\n"
+                        "       12\n"
+                        "d       1\nu       0\ns       0\nm       0\nc       0\ne       0\nt       0\n"
+                        "vals\n"
+                        "  4.52311E-03 0.0215\n"
+                        "tfc    1       1       1       1       1       1       1       1       1\n"
+                        "      10000  4.52311E-03  2.15000E-02  2.16373E+04\n")
+        mc_data = mcnp_mctal_reader.read_mctal(path)
+        tal = mc_data.tally_data[0]
+        self.assertEqual(tal.particle, "photons, protons")
+        self.assertEqual(tal.cells, ["12"])
+        self.assertEqual(tal.array.values.tolist(), [4.52311e-03])
+        self.assertEqual(mc_data.tfc_data[0].error.tolist(), [0.0215])
+
+    def test_short_exponent(self):
+        data = mcnp_mctal_reader.read_vals(b" 1.00000E-01 0.1000  2.50000-100 0.2000\n", 4)
+        np.testing.assert_allclose(data, [[0.1, 0.1], [2.5e-100, 0.2]])
+
+    def test_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            mcnp_mctal_reader.read_vals(b" 1.00000E-01 0.1000\n", 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
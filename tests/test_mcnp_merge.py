@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from neutron_tools.mcnp import mcnp_merge
+from neutron_tools.mcnp import mcnp_mctal_reader
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.utilities import synthetic_files
+
+
+class merge_test_case(unittest.TestCase):
+    """ tests tallies of several runs are merged weighted by nps """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = [synthetic_files.write_mctal(os.path.join(self.tmp.name, f"mctal{i}"),
+                                                  tallies=2, cells=5, energies=3, times=2,
+                                                  nps=1000 * (i + 1), seed=i)
+                      for i in range(3)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_moments(self):
+        merged = mcnp_merge.merge_outputs(self.paths)
+        runs = [mcnp_mctal_reader.read_mctal(path) for path in self.paths]
+        self.assertEqual(merged.tally_numbers, [4, 14])
+        for i, tally in enumerate(merged.tally_data):
+            nps = np.array([run.tally_data[i].nps for run in runs], dtype=float)
+            means = np.array([run.tally_data[i].array.values for run in runs])
+            errors = np.array([run.tally_data[i].array.rel_err for run in runs]) * means
+            shape = (-1,) + (1,) * (means.ndim - 1)
+            weights = nps.reshape(shape)
+            mean = (weights * means).sum(axis=0) / nps.sum()
+            second = (weights * ((weights - 1) * errors ** 2 + means ** 2)).sum(axis=0)
+            var = (second / nps.sum() - mean ** 2) / (nps.sum() - 1)
+            self.assertEqual(tally.nps, 6000)
+            np.testing.assert_allclose(tally.array.values, mean)
+            np.testing.assert_allclose(tally.array.rel_err, np.sqrt(var) / mean, rtol=1e-6)
+            self.assertEqual(tally.array.total.shape, (5, 3))
+            self.assertEqual(tally.cells, runs[0].tally_data[i].cells)
+
+    def test_single_run(self):
+        merged = mcnp_merge.merge_outputs(self.paths[:1])
+        run = mcnp_mctal_reader.read_mctal(self.paths[0])
+        np.testing.assert_allclose(merged.tally_data[0].array.values,
+                                   run.tally_data[0].array.values)
+        np.testing.assert_allclose(merged.tally_data[0].array.rel_err,
+                                   run.tally_data[0].array.rel_err, rtol=1e-6)
+
+    def test_outputs(self):
+        # the same run twice halves the variance
+        runs = (mcnp_output_reader.read_output_file("test_output/singles_erg.io")
+                for _ in range(2))
+        merged = mcnp_merge.merge_outputs(runs)
+        run = mcnp_output_reader.read_output_file("test_output/singles_erg.io")
+        self.assertEqual(merged.tally_numbers, [1, 2, 4, 5, 6, 8])
+        for tally, single in zip(merged.tally_data, run.tally_data):
+            self.assertEqual(tally.nps, 2 * single.nps)
+            self.assertIsNone(tally.stat_tests)
+            np.testing.assert_allclose(tally.array.values, single.array.values)
+            np.testing.assert_allclose(tally.array.rel_err, single.array.rel_err / np.sqrt(2),
+                                       rtol=1e-5)
+        detector = merged.tally_data[3]
+        self.assertEqual(detector.uncoll_flux.shape, (1, 14))
+        self.assertIsNone(detector.largest_scores)
+
+    def test_time_binned_outputs(self):
+        # time binned cell and surface tallies are merged from their frames
+        merged = mcnp_merge.merge_outputs(["test_output/singles_et.io"] * 2,
+                                          mcnp_output_reader.read_output_file)
+        run = mcnp_output_reader.read_output_file("test_output/singles_et.io")
+        self.assertEqual(merged.tally_numbers, run.tally_numbers)
+        for number in [1, 2, 4, 6]:
+            tally = merged.tally_data[merged.tally_numbers.index(number)]
+            single = run.tally_data[run.tally_numbers.index(number)]
+            self.assertIsNone(tally.array)
+            self.assertEqual(tally.nps, 2 * single.nps)
+            for key, df in single.result.items():
+                np.testing.assert_allclose(tally.result[key].values, df.values)
+                self.assertEqual(tally.result[key].columns.tolist(), df.columns.tolist())
+                np.testing.assert_allclose(tally.err[key].values,
+                                           single.err[key].values / np.sqrt(2), rtol=1e-5)
+        runs = (mcnp_output_reader.read_output_file("test_output/multiple_t.io")
+                for _ in range(2))
+        merged = mcnp_merge.merge_outputs(runs)
+        tally = merged.tally_data[merged.tally_numbers.index(4)]
+        for df in tally.result.values():
+            self.assertEqual(df.columns.tolist(), ["time", "result", "rel_err"])
+            self.assertEqual(df["time"].iloc[-1], "total")
+
+    def test_unmergeable_tally(self):
+        run = mcnp_output_reader.read_output_file("test_output/singles_t.io")
+        run.tally_data[0].result = {}
+        with self.assertRaises(ValueError):
+            mcnp_merge.merge_outputs([run, run])
+
+    def test_binning_mismatch(self):
+        other = synthetic_files.write_mctal(os.path.join(self.tmp.name, "other"), tallies=2,
+                                            cells=5, energies=4, times=2)
+        with self.assertRaises(ValueError):
+            mcnp_merge.merge_outputs([self.paths[0], other])
+        fewer = synthetic_files.write_mctal(os.path.join(self.tmp.name, "fewer"), cells=5,
+                                            energies=3, times=2)
+        with self.assertRaises(ValueError):
+            mcnp_merge.merge_outputs([self.paths[0], fewer])
+        with self.assertRaises(ValueError):
+            mcnp_merge.merge_outputs([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.mcnp import mcnp_output_cache
+
+
+class output_cache_test_case(unittest.TestCase):
+    """ tests for the on disk cache of parsed outputs """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        src = os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')
+        self.path = os.path.join(self.tmp.name, "singles.io")
+        shutil.copy(src, self.path)
+        self.cache = mcnp_output_cache.OutputCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_skips_parsing(self):
+        first = mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+        with mock.patch.object(mcnp_output_reader.ut, "get_lines",
+                               side_effect=AssertionError("file re-parsed")):
+            second = mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+
+        self.assertEqual(second.tally_numbers, first.tally_numbers)
+        self.assertEqual(second.num_rendevous, first.num_rendevous)
+        for t1, t2 in zip(first.tally_data, second.tally_data):
+            self.assertEqual(t1.number, t2.number)
+            for key, df in t1.result.items():
+                pd.testing.assert_frame_equal(t2.result[key], df)
+
+    def test_modified_file_invalidates(self):
+        self.assertIsNone(self.cache.get(self.path))
+        mc_data = mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        self.assertIsNotNone(self.cache.get(self.path))
+
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(self.cache.get(self.path))
+
+        mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        self.assertEqual(len(self.cache.entries()), 2)
+        self.assertEqual(self.cache.get(self.path).tally_numbers, mc_data.tally_numbers)
+
+    def test_parser_version_invalidates(self):
+        mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        self.cache.version = "changed"
+        self.assertIsNone(self.cache.get(self.path))
+
+    def test_library_versions_invalidate(self):
+        version = mcnp_output_cache.parser_version()
+        with mock.patch.object(mcnp_output_cache.pd, "__version__", "0.0.1"):
+            self.assertNotEqual(mcnp_output_cache.parser_version(), version)
+        with mock.patch.object(mcnp_output_cache.np, "__version__", "0.0.1"):
+            self.assertNotEqual(mcnp_output_cache.parser_version(), version)
+
+    def test_unreadable_entry_dropped(self):
+        mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        entry = self.cache.entries()[0]
+        entry.write_bytes(entry.read_bytes()[:100])
+        self.assertIsNone(self.cache.get(self.path))
+        self.assertFalse(entry.exists())
+
+    def test_pickle_not_loaded(self):
+        # a pickle planted as an entry is never unpickled
+        entry = self.cache.entry_path(self.cache.key(self.path))
+        entry.parent.mkdir(parents=True)
+        entry.write_bytes(pickle.dumps(mcnp_output_reader.MCNPOutput()))
+        with mock.patch.object(pickle, "load", side_effect=AssertionError("unpickled")):
+            self.assertIsNone(self.cache.get(self.path))
+        self.assertFalse(entry.exists())
+
+    def test_arrays_round_trip(self):
+        mc_data = mcnp_output_reader.MCNPOutput()
+        tally = mcnp_output_reader.MCNP_cell_tally()
+        tally.array = mcnp_output_reader.TallyArray(
+            np.arange(6.0).reshape(2, 3), np.full((2, 3), 0.1),
+            {"object": ["1<2[0 0 0]", "1<2[1 0 0]"], "energy": [0.1, 1.0, 10.0]},
+            np.array([3.0, 12.0]), np.array([0.05, 0.05]))
+        tally.lattice = mcnp_output_reader.LatticeBins(tally.array.axes["object"].tolist())
+        tally.result = None
+        mc_data.tally_data = [tally]
+        self.cache.put(self.path, mc_data)
+        loaded = self.cache.get(self.path).tally_data[0]
+        self.assertIs(type(loaded), mcnp_output_reader.MCNP_cell_tally)
+        np.testing.assert_array_equal(loaded.array.values, tally.array.values)
+        np.testing.assert_array_equal(loaded.array.axes["object"], tally.array.axes["object"])
+        self.assertEqual(loaded.lattice.chains, [("1", "2")])
+        self.assertEqual(loaded.lattice.shape, (2, 1, 1))
+        pd.testing.assert_frame_equal(loaded.result["1<2[1 0 0]"], tally.result["1<2[1 0 0]"])
+
+    def test_workers_share_entry(self):
+        mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        with mock.patch.object(mcnp_output_reader.ut, "get_lines",
+                               side_effect=AssertionError("file re-parsed")):
+            mcnp_output_reader.read_output_file(self.path, cache=self.cache, workers=2)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_lru_eviction(self):
+        other = os.path.join(self.tmp.name, "other.io")
+        shutil.copy(self.path, other)
+
+        mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        entry_size = self.cache.size()
+        self.cache.max_bytes = int(entry_size * 1.5)
+
+        # the second entry pushes the cache over the limit, evicting the first
+        mcnp_output_reader.read_output_file(other, cache=self.cache)
+        self.assertEqual(len(self.cache.entries()), 1)
+        self.assertIsNone(self.cache.get(self.path))
+        self.assertIsNotNone(self.cache.get(other))
+
+    def test_clear(self):
+        mcnp_output_reader.read_output_file(self.path, cache=self.cache)
+        self.cache.clear()
+        self.assertEqual(self.cache.entries(), [])
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_default_dir_from_env(self):
+        with mock.patch.dict(os.environ, {mcnp_output_cache.CACHE_ENV: self.tmp.name}):
+            self.assertEqual(str(mcnp_output_cache.default_cache_dir()), self.tmp.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.mcnp import mcnp_output_follower
+from neutron_tools.utilities import synthetic_files
+
+
+class follower_test_case(unittest.TestCase):
+    """ tests for incrementally reading a growing output file """
+
+    def setUp(self):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.expected = mcnp_output_reader.read_output_file(path)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "running.io")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data, mode="wb"):
+        with open(self.path, mode) as f:
+            f.write(data)
+
+    def test_incremental_polls(self):
+        seen = []
+        follower = mcnp_output_follower.MCNPOutputFollower(self.path, callback=seen.append)
+
+        # stop part way through a line in the middle of the tally output
+        cut = self.data.index(b"1tally        5        nps") + 10
+        self.write(self.data[:cut])
+        first = follower.poll()
+        self.assertEqual([t.number for t in first], [1, 2])
+        self.assertEqual(follower.offset, self.data.rfind(b"\n", 0, cut) + 1)
+        # the run terminated line before the final tallies has been read
+        self.assertFalse(follower.finished)
+
+        self.write(self.data[cut:], mode="ab")
+        second = follower.poll()
+        self.assertEqual([t.number for t in second], [4, 5, 6, 8])
+        self.assertTrue(follower.finished)
+        self.assertEqual(follower.offset, len(self.data))
+        self.assertEqual([t.number for t in seen], [1, 2, 4, 5, 6, 8])
+        self.assertEqual(follower.num_rendevous, self.expected.num_rendevous)
+
+        # nothing new to read
+        self.assertEqual(follower.poll(), [])
+
+    def test_results_match_full_read(self):
+        self.write(self.data)
+        follower = mcnp_output_follower.MCNPOutputFollower(self.path)
+        updates = list(follower.follow(interval=0.01, timeout=0.05))
+        self.assertEqual(len(updates), 1)
+        for tally in self.expected.tally_data:
+            latest = follower.latest[tally.number]
+            self.assertEqual(latest.nps, tally.nps)
+            self.assertEqual(latest.eng, tally.eng)
+            for key, df in tally.result.items():
+                pd.testing.assert_frame_equal(latest.result[key], df)
+
+    def test_starts_at_last_rendezvous(self):
+        # the earlier printouts of each tally are skipped on the first poll
+        synthetic_files.write_mcnp_output(self.path, tallies=2, cells=3, printouts=3)
+        expected = mcnp_output_reader.read_output_file(self.path)
+        seen = []
+        follower = mcnp_output_follower.MCNPOutputFollower(self.path, callback=seen.append)
+        follower.poll()
+        self.assertEqual([t.number for t in seen], [4, 14])
+        self.assertEqual([t.nps for t in seen], [1000000, 1000000])
+        self.assertEqual(follower.num_rendevous, expected.num_rendevous)
+
+    def test_bounded_chunks(self):
+        # chunks shorter than a line still give whole lines
+        self.write(self.data)
+        follower = mcnp_output_follower.MCNPOutputFollower(self.path, chunk_bytes=64)
+        with open(self.path, "rb") as f:
+            chunks = list(follower.chunks(f))
+        self.assertEqual(b"".join(data for data, _ in chunks), self.data)
+        self.assertTrue(all(self.data[start:].startswith(data) for data, start in chunks))
+        follower.poll()
+        self.assertEqual(sorted(follower.latest), self.expected.tally_numbers)
+        self.assertEqual(follower.num_rendevous, self.expected.num_rendevous)
+        self.assertEqual(follower.offset, len(self.data))
+
+    def test_shrunk_file_read_again(self):
+        self.write(self.data)
+        follower = mcnp_output_follower.MCNPOutputFollower(self.path)
+        follower.poll()
+        self.assertEqual(follower.offset, len(self.data))
+
+        # a rerun writes over the file
+        cut = self.data.index(b"1tally        5        nps")
+        self.write(self.data[:cut])
+        updates = follower.poll()
+        self.assertEqual([t.number for t in updates], [1, 2])
+        # the results of the first run are dropped, tally 4 is not complete yet
+        self.assertEqual(sorted(follower.latest), [1, 2])
+        self.assertEqual(follower.offset, cut)
+        self.assertEqual(follower.num_rendevous, self.expected.num_rendevous)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,12 @@ from unittest.mock import patch, mock_open
 import logging
 import pandas as pd
 import numpy as np
+from neutron_tools.mcnp import mcnp_analysis
 from neutron_tools.mcnp import mcnp_output_reader
 from neutron_tools.utilities import neut_utilities as ut
 import os
+import gzip
+import tempfile
 
 
 class version_test_case(unittest.TestCase):
@@ -127,6 +130,371 @@ class rendevous_test_case(unittest.TestCase):
         self.assertEqual(len(index), 76)
 
 
+class output_index_test_case(unittest.TestCase):
+    """ tests for the single pass output file index """
+
+    @classmethod
+    def setUpClass(cls):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')
+        cls.data = ut.get_lines(path)
+        cls.index = mcnp_output_reader.build_output_index(cls.data)
+
+    def test_index_matches_line_scans(self):
+        comments, warnings = mcnp_output_reader.read_comments_warnings(self.data)
+        self.assertEqual(self.index.rendevous,
+                         mcnp_output_reader.get_rendevous_index(self.data))
+        self.assertEqual(self.index.tables,
+                         mcnp_output_reader.get_table_dict(self.data))
+        self.assertEqual(self.index.term_line,
+                         mcnp_output_reader.find_term_line(self.data))
+        self.assertEqual(len(self.index.fatal) > 0,
+                         mcnp_output_reader.check_fatal(self.data))
+        self.assertEqual([self.data[i] for i in self.index.comments], comments)
+        self.assertEqual([self.data[i] for i in self.index.warnings], warnings)
+
+    def test_tally_numbers(self):
+        self.assertEqual(self.index.tally_numbers(), [1, 2, 4, 5, 6, 8])
+
+    def test_tally_block(self):
+        start, end = self.index.tally_block(4)
+        self.assertGreater(start, self.index.term_line)
+        self.assertTrue(self.data[start].startswith("1tally        4        nps ="))
+        self.assertTrue(self.data[end].startswith("1tally"))
+        self.assertRaises(ValueError, self.index.tally_block, 7)
+
+    def test_tally_printouts(self):
+        # input echo in print table 30 is before the first rendevous
+        printouts = self.index.tally_printouts(4)
+        self.assertEqual(len(printouts), 2)
+        self.assertEqual(printouts[0][0], -1)
+        self.assertEqual(printouts[-1][0], len(self.index.rendevous) - 1)
+
+    def test_read_tally_with_index(self):
+        tally = mcnp_output_reader.read_tally(self.data, 4, index=self.index)
+        self.assertEqual(tally.number, 4)
+        self.assertEqual(tally.tally_type, '4')
+
+
+class lazy_output_test_case(unittest.TestCase):
+    """ tests for lazily reading an output file by byte offset """
+
+    @classmethod
+    def setUpClass(cls):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        cls.eager = mcnp_output_reader.read_output_file(path)
+        cls.lazy = mcnp_output_reader.read_output_file(path, lazy=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.lazy.close()
+
+    def test_general_data(self):
+        self.assertEqual(self.lazy.version, self.eager.version)
+        self.assertEqual(self.lazy.date, self.eager.date)
+        self.assertEqual(self.lazy.comments, self.eager.comments)
+        self.assertEqual(self.lazy.warnings, self.eager.warnings)
+        self.assertEqual(self.lazy.num_rendevous, self.eager.num_rendevous)
+        self.assertEqual(list(self.lazy.tables), list(self.eager.tables))
+        self.assertEqual(self.lazy.tally_numbers, self.eager.tally_numbers)
+        pd.testing.assert_frame_equal(self.lazy.t60, self.eager.t60)
+        pd.testing.assert_frame_equal(self.lazy.t101, self.eager.t101)
+
+    def test_byte_index(self):
+        self.assertTrue(self.lazy.index.in_bytes)
+        start, end = self.lazy.index.tally_block(4)
+        self.assertTrue(self.lazy.source[start:end].startswith(b"1tally        4"))
+
+    def test_tally_on_demand(self):
+        tally = self.lazy.tally(4)
+        self.assertIs(self.lazy.tally(4), tally)
+        self.assertEqual(len([t for t in self.lazy.tally_data if t.number == 4]), 1)
+        expected = self.eager.tally(4)
+        self.assertEqual(tally.eng, expected.eng)
+        self.assertEqual(tally.cells, expected.cells)
+        pd.testing.assert_frame_equal(tally.result[2], expected.result[2])
+
+    def test_missing_tally(self):
+        self.assertRaises(ValueError, self.lazy.tally, 7)
+        self.assertRaises(ValueError, self.eager.tally, 7)
+
+
+class compressed_output_test_case(unittest.TestCase):
+    """ tests reading a gzip compressed output file """
+
+    def test_compressed_matches_plain(self):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        plain = mcnp_output_reader.read_output_file(path)
+        with tempfile.TemporaryDirectory() as tmp:
+            gz_path = os.path.join(tmp, "singles_erg.io.gz")
+            with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+                dst.write(src.read())
+            eager = mcnp_output_reader.read_output_file(gz_path)
+            lazy = mcnp_output_reader.read_output_file(gz_path, lazy=True)
+            try:
+                lazy_tally = lazy.tally(4)
+            finally:
+                lazy.close()
+        self.assertEqual(eager.tally_numbers, plain.tally_numbers)
+        pd.testing.assert_frame_equal(eager.tally(4).result[2], plain.tally(4).result[2])
+        pd.testing.assert_frame_equal(lazy_tally.result[2], plain.tally(4).result[2])
+
+
+class selective_read_test_case(unittest.TestCase):
+    """ tests for reading only some of the tallies and tables """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')
+        cls.full = mcnp_output_reader.read_output_file(cls.path)
+
+    def test_selected_tallies(self):
+        mc_data = mcnp_output_reader.read_output_file(self.path, tallies=[4, 2], tables=['60'])
+        self.assertEqual([t.number for t in mc_data.tally_data], [2, 4])
+        self.assertEqual(mc_data.tally_numbers, self.full.tally_numbers)
+        pd.testing.assert_frame_equal(mc_data.tally(4).result[2], self.full.tally(4).result[2])
+        pd.testing.assert_frame_equal(mc_data.t60, self.full.t60)
+        self.assertFalse(hasattr(mc_data, "t101"))
+        self.assertRaises(ValueError, mc_data.tally, 5)
+        # line numbers as for an eager read, no byte index once closed
+        self.assertEqual(mc_data.tables, self.full.tables)
+        self.assertIsNone(mc_data.index)
+
+    def test_metadata_only(self):
+        mc_data = mcnp_output_reader.read_output_file(self.path, metadata_only=True)
+        self.assertEqual(mc_data.tally_data, [])
+        self.assertIsNone(mc_data.t60)
+        self.assertEqual(mc_data.version, self.full.version)
+        self.assertEqual(mc_data.num_tallies, self.full.num_tallies)
+
+    def test_missing_tally(self):
+        self.assertRaises(ValueError, mcnp_output_reader.read_output_file, self.path, tallies=[7])
+
+
+class parallel_tally_test_case(unittest.TestCase):
+    """ tests parsing tallies in a process pool gives the serial result """
+
+    def assert_tallies_equal(self, serial, parallel):
+        self.assertEqual([t.number for t in serial], [t.number for t in parallel])
+        for s_tal, p_tal in zip(serial, parallel):
+            self.assertIs(type(s_tal), type(p_tal))
+            self.assertEqual(sorted(vars(s_tal)), sorted(vars(p_tal)))
+            for key, s_val in vars(s_tal).items():
+                p_val = getattr(p_tal, key)
+                if isinstance(s_val, dict):
+                    self.assertEqual(list(s_val), list(p_val))
+                    for k in s_val:
+                        if isinstance(s_val[k], pd.DataFrame):
+                            pd.testing.assert_frame_equal(s_val[k], p_val[k])
+                        else:
+                            self.assertEqual(s_val[k], p_val[k])
+                elif isinstance(s_val, list) and s_val and isinstance(s_val[0], pd.DataFrame):
+                    for s_df, p_df in zip(s_val, p_val):
+                        pd.testing.assert_frame_equal(s_df, p_df)
+                elif isinstance(s_val, mcnp_output_reader.TallyArray):
+                    np.testing.assert_array_equal(s_val.values, p_val.values)
+                    np.testing.assert_array_equal(s_val.rel_err, p_val.rel_err)
+                    self.assertEqual(list(s_val.axes), list(p_val.axes))
+                    for name in s_val.axes:
+                        np.testing.assert_array_equal(s_val.axes[name], p_val.axes[name])
+                elif isinstance(s_val, np.ndarray):
+                    np.testing.assert_array_equal(s_val, p_val)
+                else:
+                    np.testing.assert_array_equal(np.asarray(s_val, dtype=object),
+                                                  np.asarray(p_val, dtype=object))
+
+    def test_parallel_matches_serial(self):
+        for fname in ['multiple_et.io', 'singles_erg.io', 'r2s_1.io']:
+            path = os.path.join(os.path.dirname(__file__), 'test_output', fname)
+            serial = mcnp_output_reader.read_output_file(path)
+            parallel = mcnp_output_reader.read_output_file(path, workers=2)
+            self.assertEqual(parallel.num_tallies, serial.num_tallies)
+            self.assert_tallies_equal(serial.tally_data, parallel.tally_data)
+
+    def test_tally_number_order(self):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')
+        parallel = mcnp_output_reader.read_output_file(path, workers=2)
+        self.assertEqual([t.number for t in parallel.tally_data], [1, 2, 4, 5, 6, 8])
+
+
+class batch_read_test_case(unittest.TestCase):
+    """ tests for reading many output files into one table """
+
+    @classmethod
+    def setUpClass(cls):
+        out_dir = os.path.join(os.path.dirname(__file__), 'test_output')
+        cls.paths = [os.path.join(out_dir, 'singles.io'),
+                     os.path.join(out_dir, 'fis_in.i'),
+                     os.path.join(out_dir, 'multiple_et.io')]
+        cls.results, cls.meta = mcnp_output_reader.read_output_files(cls.paths, workers=2)
+
+    def test_metadata(self):
+        self.assertEqual(self.meta["file"].tolist(), self.paths)
+        self.assertEqual(self.meta["nps"].iloc[0], 1000000)
+        self.assertEqual(self.meta["num_tallies"].iloc[0], 6)
+        self.assertEqual(self.meta["warnings"].iloc[0], 4)
+        self.assertFalse(self.meta["fatal"].iloc[0])
+
+    def test_bad_file_reported(self):
+        self.assertTrue(pd.isna(self.meta["error"].iloc[0]))
+        self.assertIn("ValueError", self.meta["error"].iloc[1])
+        self.assertTrue(pd.isna(self.meta["error"].iloc[2]))
+        self.assertNotIn(self.paths[1], self.results["file"].tolist())
+
+    def test_results_table(self):
+        singles = self.results[self.results["file"] == self.paths[0]]
+        self.assertEqual(len(singles), 6)
+        row = singles[singles["tally"] == 4].iloc[0]
+        self.assertEqual(row["object"], 2)
+        self.assertAlmostEqual(row["result"], 1.91076E-03)
+        self.assertAlmostEqual(row["rel_err"], 0.0006)
+        et = self.results[(self.results["file"] == self.paths[2]) & (self.results["tally"] == 4)]
+        self.assertEqual(len(et), 5 * 14 * 13)
+        self.assertFalse(et["time"].isna().any())
+
+    def test_tally_selection_and_glob(self):
+        pattern = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_*.io')
+        results, meta = mcnp_output_reader.read_output_files(pattern, tallies=[4])
+        self.assertEqual(len(meta), 3)
+        self.assertEqual(set(results["tally"]), {4})
+
+    def test_tally_to_dataframe_totals(self):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        tally = mcnp_output_reader.read_output_file(path).tally(4)
+        df = mcnp_output_reader.tally_to_dataframe(tally)
+        self.assertEqual(len(df), 15)
+        self.assertTrue(np.isinf(df["energy"].iloc[-1]))
+        self.assertEqual(df["energy"].dtype, float)
+
+
+class tally_history_test_case(unittest.TestCase):
+    """ tests for reading every printout of a tally """
+
+    @classmethod
+    def setUpClass(cls):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        lines = ut.get_lines(path)
+        index = mcnp_output_reader.build_output_index(lines)
+        start, end = index.tally_block(4)
+        block = lines[start:end]
+        early = [block[0].replace("nps =     1000000", "nps =      500000")] + block[1:]
+        rend = " master set rendezvous nps =      500000,  work chunks =    11    07/25/25 09:19:04 "
+        # intermediate printout before the problem summary
+        pos = index.term_line - 2
+        cls.lines = lines[:pos] + [rend] + early + lines[pos:]
+        cls.final = mcnp_output_reader.read_tally(lines, 4)
+
+    def test_history_arrays(self):
+        history = mcnp_output_reader.read_tally_history(self.lines, 4)
+        self.assertEqual(history.number, 4)
+        np.testing.assert_array_equal(history.nps, [500000, 1000000])
+        self.assertEqual(history.result.shape, (2, 15))
+        self.assertEqual(history.rel_err.shape, (2, 15))
+        self.assertEqual(len(history.bins), 15)
+        np.testing.assert_allclose(history.result[-1],
+                                   self.final.result[2]["result"].to_numpy(dtype=float))
+        fom = history.relative_fom()
+        self.assertEqual(fom.shape, (2, 15))
+        self.assertTrue((fom >= 0).all())
+
+    def test_history_from_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.io")
+            ut.write_lines(path, self.lines)
+            history = mcnp_output_reader.read_tally_history(path, 4)
+        np.testing.assert_array_equal(history.nps, [500000, 1000000])
+
+    def test_read_tally_rnum(self):
+        index = mcnp_output_reader.build_output_index(self.lines)
+        early = mcnp_output_reader.read_tally(self.lines, 4, rnum=len(index.rendevous) - 1)
+        self.assertEqual(early.nps, 500000)
+        final = mcnp_output_reader.read_tally(self.lines, 4)
+        self.assertEqual(final.nps, 1000000)
+
+    def test_missing_tally(self):
+        self.assertRaises(ValueError, mcnp_output_reader.read_tally_history, self.lines, 7)
+
+
+class instrumentation_test_case(unittest.TestCase):
+    """ tests the phases of a read are recorded as spans """
+
+    def tearDown(self):
+        ut.disable_instrumentation()
+
+    def test_read_spans(self):
+        rec = ut.enable_instrumentation()
+        mc_data = mcnp_output_reader.read_output_file("test_output/singles_erg.io")
+        summary = rec.summary()
+        for name in ("read_output_file", "read_output_file/split_lines",
+                     "read_output_file/build_output_index", "read_output_file/read_tallies"):
+            self.assertEqual(summary[name]["calls"], 1)
+        self.assertEqual(summary["read_output_file/read_tallies/read_tally_block"]["calls"],
+                         mc_data.num_tallies)
+        self.assertEqual(rec.counters["tallies_parsed"], mc_data.num_tallies)
+        self.assertEqual(rec.counters["lines_scanned"], rec.counters["lines_read"])
+
+    def test_lazy_spans(self):
+        rec = ut.enable_instrumentation()
+        mc_data = mcnp_output_reader.read_output_file("test_output/singles_erg.io", lazy=True)
+        mc_data.tally(mc_data.tally_numbers[0])
+        mc_data.close()
+        summary = rec.summary()
+        self.assertIn("read_output_file/read_output_file_lazy/build_byte_index", summary)
+        self.assertEqual(summary["read_tally_block"]["calls"], 1)
+        self.assertEqual(rec.counters["bytes_scanned"], rec.counters["bytes_mapped"])
+
+
+class tally_array_test_case(unittest.TestCase):
+    """ tests for the dense array storage of tally results """
+
+    @classmethod
+    def setUpClass(cls):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'multiple_erg.io')
+        cls.lines = ut.get_lines(path)
+        cls.tally = mcnp_output_reader.read_tally(cls.lines, 4)
+
+    def test_energy_array(self):
+        arr = self.tally.array
+        self.assertIsInstance(arr, mcnp_output_reader.TallyArray)
+        self.assertEqual(list(arr.axes), ["object", "energy"])
+        self.assertEqual(arr.shape, (5, 14))
+        self.assertEqual(arr.axes["object"].tolist(), [2, 3, 4, 5, 6])
+        self.assertEqual(arr.axes["energy"].tolist(), self.tally.eng)
+        self.assertEqual(arr.total.shape, (5,))
+
+    def test_result_view_matches_dataframes(self):
+        index = mcnp_output_reader.build_output_index(self.lines)
+        start, end = index.tally_block(4)
+        expected = mcnp_output_reader.read_energy_bin_only_cell_tally(self.lines[start + 1:end - 1])
+        result = self.tally.result
+        self.assertEqual(list(result), list(expected))
+        for cell in expected:
+            pd.testing.assert_frame_equal(result[cell], expected[cell])
+
+    def test_sel(self):
+        arr = self.tally.array
+        sub = arr.sel(object=[6, 3])
+        self.assertEqual(sub.shape, (2, 14))
+        np.testing.assert_array_equal(sub.values, arr.values[[4, 1]])
+        np.testing.assert_array_equal(sub.total, arr.total[[4, 1]])
+        sub = arr.sel(energy=arr.axes["energy"][:3])
+        self.assertEqual(sub.shape, (5, 3))
+        self.assertIsNone(sub.total)
+        self.assertRaises(KeyError, arr.sel, object=[99])
+
+    def test_to_dataframe(self):
+        df = self.tally.array.to_dataframe()
+        self.assertEqual(len(df), 5 * 15)
+        self.assertTrue(np.isinf(df["energy"].iloc[14]))
+        self.assertEqual(df["result"].iloc[14], self.tally.array.total[0])
+
+    def test_single_value_array(self):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'multiple.io')
+        tally = mcnp_output_reader.read_tally(ut.get_lines(path), 4)
+        self.assertEqual(tally.array.shape, (5,))
+        self.assertAlmostEqual(tally.array.values[0], 2.19878E-03)
+        self.assertAlmostEqual(tally.result[6]["result"].iloc[0], 3.60573E-06)
+
+
 class stat_test_case(unittest.TestCase):
     """ test for reading the version of output file"""
 
@@ -135,6 +503,74 @@ class stat_test_case(unittest.TestCase):
         # need to add test for tally with all 0.0 bins
 
 
+class tfc_test_case(unittest.TestCase):
+    """ tests for the tally fluctuation charts and statistical checks """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        cls.mc_data = mcnp_output_reader.read_output_file(cls.path)
+
+    def test_stat_tests_read_with_tally(self):
+        tally = self.mc_data.tally(5)
+        self.assertEqual(tally.stat_tests.dtype, bool)
+        self.assertEqual(tally.stat_tests.tolist(), [True] * 9 + [False])
+        self.assertTrue(self.mc_data.tally(4).stat_tests.all())
+        # observed values, yes as 1 and descriptions such as random as nan
+        np.testing.assert_array_equal(tally.stat_values,
+                                      [np.nan, 0.0, 1.0, 1.0, 0.01, 1.0, 1.0, np.nan, np.nan, 2.14])
+        self.assertEqual(self.mc_data.tally(8).stat_values[-1], 10.0)
+
+    def test_read_stat_checks(self):
+        lines = [" observed     random        0.12      yes           no            0.00      yes"
+                 "         yes            constant    random       3.55",
+                 " passed?        yes           no      yes           no             yes      yes"
+                 "         yes               yes        yes         yes"]
+        passed, observed = mcnp_output_reader.read_stat_checks(lines)
+        self.assertEqual(passed.tolist(), [True, False, True, False] + [True] * 6)
+        self.assertEqual(observed[1], 0.12)
+        self.assertEqual(observed[3], 0.0)
+        self.assertIsNone(mcnp_output_reader.read_stat_checks(["1tally        5", " cell  2"]))
+
+    def test_tfc_arrays(self):
+        self.assertEqual([t.number for t in self.mc_data.tfc_data], [1, 2, 4, 5, 6, 8])
+        tfc = self.mc_data.tfc_data[3]
+        self.assertEqual(tfc.number, 5)
+        self.assertEqual(len(tfc.nps), 16)
+        self.assertEqual(tfc.nps[0], 64000)
+        self.assertEqual(tfc.nps[-1], 1000000)
+        self.assertAlmostEqual(tfc.mean[-1], 3.4295E-04)
+        self.assertAlmostEqual(tfc.error[-1], 0.0025)
+        self.assertAlmostEqual(tfc.vov[-1], 0.0087)
+        self.assertAlmostEqual(tfc.slope[-1], 2.1)
+        self.assertEqual(tfc.fom[-1], 563896)
+
+    def test_lazy_tfc(self):
+        lazy = mcnp_output_reader.read_output_file(self.path, lazy=True)
+        lazy.close()
+        for tfc, expected in zip(lazy.tfc_data, self.mc_data.tfc_data):
+            self.assertEqual(tfc.number, expected.number)
+            np.testing.assert_array_equal(tfc.fom, expected.fom)
+
+    def test_fom_trend(self):
+        tfc = mcnp_output_reader.MCNP_tfc_data()
+        tfc.nps = np.arange(1.0, 11.0)
+        tfc.fom = np.full(10, 5.0)
+        self.assertAlmostEqual(tfc.fom_trend(), 0.0)
+        tfc.fom = 10.0 - tfc.nps
+        self.assertLess(tfc.fom_trend(), 0.0)
+
+    def test_triage(self):
+        paths = [self.path, os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')]
+        triage = mcnp_output_reader.triage_outputs(paths)
+        self.assertEqual(len(triage), 12)
+        self.assertEqual(triage["failed"].tolist(), sorted(triage["failed"].tolist(), reverse=True))
+        row = triage[(triage["file"] == self.path) & (triage["tally"] == 5)].iloc[0]
+        self.assertEqual(row["failed"], 1)
+        self.assertEqual(row["failed_checks"], "pdf slope")
+        self.assertAlmostEqual(row["rel_err"], 0.0025)
+
+
 class tally_processing_tests(unittest.TestCase):
     """ tests for various generic tally processing functions """
 
@@ -207,6 +643,22 @@ class tally_processing_tests(unittest.TestCase):
         self.assertEqual(df["result"].tolist(), expected_res)
         self.assertEqual(df["rel_err"].tolist(), expected_rel_err)
 
+    def test_float_rows(self):
+        """ tests the bulk conversion of a block of numbers matches float() """
+        text = "    1.0000E-01   1.23456E-05 0.1234\n    2.0000E+01   7.00000E-22 0.0031\n"
+        expected = [[float(v) for v in line.split()] for line in text.splitlines()]
+        arr = mcnp_output_reader.float_rows(text)
+        self.assertEqual(arr.shape, (2, 3))
+        self.assertEqual(arr.tolist(), expected)
+
+        # no trailing newline and a given column count
+        arr = mcnp_output_reader.float_rows("1.0 2.0 3.0\n4.0 5.0 6.0", 3)
+        self.assertEqual(arr.tolist(), [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+        # text that is not all numbers
+        with self.assertRaises(ValueError):
+            mcnp_output_reader.float_rows("1.0 abc 3.0\n")
+
     def test_convert_et_tally_to_df(self):
         """ """
         # test valid data
@@ -250,6 +702,17 @@ class tally_type1_tests(unittest.TestCase):
                 self.assertAlmostEqual(df["result"].iloc[0], 1.16486E+00)
                 self.assertAlmostEqual(df["rel_err"].iloc[0], 0.0006)
 
+    def test_multiple_value_t1_tally(self):
+        """ surfaces are kept in the printed order, matching the results """
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'multiple.io')
+        multiple = mcnp_output_reader.read_output_file(path)
+        for tn in multiple.tally_data:
+            if tn.number == 1:
+                self.assertEqual(tn.surfaces, ['1', '2', '3', '4', '5', '6'])
+                self.assertEqual(tn.array.axes["object"].tolist(), [1, 2, 3, 4, 5, 6])
+                self.assertAlmostEqual(tn.array.values[2], 6.60137E-01)
+                self.assertAlmostEqual(tn.result[3]["result"].iloc[0], 6.60137E-01)
+
     def test_ebined_t1_tally(self):
         path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
         single = mcnp_output_reader.read_output_file(path)
@@ -680,6 +1143,8 @@ class tally_type5_tests(unittest.TestCase):
                 df = list(tn.result.values())[0]
                 self.assertIsInstance(df, pd.DataFrame)
                 self.assertAlmostEqual(df["result"].iloc[0], 1.20831E-05)
+                self.assertEqual(len(df), 14)
+                self.assertEqual(df["energy"].dtype, float)
                 self.assertEqual(tn.x, 15)
                 self.assertEqual(tn.y, 0.00)
                 self.assertEqual(tn.z, 0.00)
@@ -715,6 +1180,23 @@ class tally_type5_tests(unittest.TestCase):
                 self.assertEqual(tn.y, 0.00)
                 self.assertEqual(tn.z, 0.00)
 
+    def test_tbinned_t5_tally(self):
+        """ test case - f5 tally with time bins only, a single energy row """
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_t.io')
+        single = mcnp_output_reader.read_output_file(path)
+        tn = single.tally_data[single.tally_numbers.index(5)]
+        self.assertEqual(tn.eng, [0.0])
+        self.assertEqual(len(tn.times), 13)
+        self.assertIsInstance(tn.result, dict)
+        self.assertIsInstance(tn.err, dict)
+        res_df = tn.result[0]
+        self.assertEqual(res_df.shape, (1, 13))
+        self.assertEqual(res_df.index.tolist(), [0.0])
+        self.assertEqual(res_df.columns.tolist(), tn.times)
+        self.assertEqual(tn.err[0].shape, (1, 13))
+        peak = tn.times[int(np.argmax(res_df.values[0]))]
+        self.assertEqual(mcnp_analysis.find_peak_time(0.0, res_df), peak)
+
 
 class tally_type6_tests(unittest.TestCase):
     """ tests for type 6 tally """
@@ -798,6 +1280,318 @@ class tally_type8_tests(unittest.TestCase):
                 df = list(tn.result.values())[0]
                 self.assertIsInstance(df, pd.DataFrame)
                 self.assertAlmostEqual(df["result"].iloc[0], 5.16461E-01)
+                self.assertEqual(tn.cells, ["2"])
+                self.assertEqual(tn.array.shape, (1, 14))
+                self.assertEqual(tn.array.total[0], 1.0)
+                self.assertEqual(len(df), 14)
+                self.assertEqual(df["energy"].dtype, float)
+
+
+def pulse_height_lines(cells, energies, user_bins=None):
+    """ lines of a type 8 tally block with energy bins for each cell """
+    lines = ["1tally       18        nps =     1000000",
+             "           tally type 8    pulse height distribution.                   units   number",
+             "           particle(s): photons",
+             " "]
+    for cell in cells:
+        lines.append(f" cell  {cell}" + " " * 40)
+        for ubin in user_bins or [None]:
+            if ubin is not None:
+                lines.append(f" user bin  {ubin}")
+            lines.append("      energy   ")
+            for i, erg in enumerate(energies):
+                lines.append(f"    {erg:.4E}   {cell + i * 1e-3:.5E} 0.0010")
+            lines.append("      total      1.00000E+00 0.0000")
+    lines += ["", " " + "=" * 100, ""]
+    return lines
+
+
+class pulse_height_test_case(unittest.TestCase):
+    """ tests multi cell and user bin type 8 tallies """
+
+    def read(self, lines):
+        tally_data = mcnp_output_reader.MCNP_pulse_tally()
+        return mcnp_output_reader.read_type_8(tally_data, lines)
+
+    def test_multiple_cells(self):
+        energies = np.linspace(0.001, 3.0, 1200)
+        tally = self.read(pulse_height_lines([3, 7, 12], energies))
+        self.assertEqual(tally.cells, ["3", "7", "12"])
+        self.assertEqual(tally.user_bins, None)
+        self.assertEqual(tally.array.shape, (3, 1200))
+        self.assertEqual(len(tally.eng), 1200)
+        self.assertAlmostEqual(tally.array.values[1, 2], 7.002)
+        self.assertEqual(list(tally.result), [3, 7, 12])
+        # the total is only kept in the array, as before the arrays
+        self.assertEqual(len(tally.result[12]), 1200)
+        self.assertEqual(tally.result[12]["energy"].dtype, float)
+        self.assertEqual(tally.array.total[2], 1.0)
+
+    def test_user_bins(self):
+        lines = pulse_height_lines([2, 4], [0.1, 0.2, 0.3], user_bins=["1", "2", "total"])
+        tally = self.read(lines)
+        self.assertEqual(tally.cells, ["2", "4"])
+        self.assertEqual(tally.user_bins, ["1", "2", "total"])
+        self.assertEqual(tally.array.shape, (2, 3, 3))
+        self.assertEqual(tally.array.total.shape, (2, 3))
+        self.assertIn((4, "total"), tally.result)
+        data = mcnp_output_reader.tally_to_dataframe(tally)
+        self.assertEqual(len(data), 2 * 3 * 4)
+        self.assertEqual(data["user_bin"].iloc[-1], np.inf)
+        self.assertEqual(data["object"].iloc[-1], 4)
+
+    def test_single_values(self):
+        lines = [" cell  5", "                 2.00000E-01 0.0100",
+                 " cell  6", "                 3.00000E-01 0.0200", "", " ====="]
+        tally = self.read(lines)
+        self.assertEqual(tally.cells, ["5", "6"])
+        self.assertEqual(tally.eng, None)
+        self.assertEqual(tally.array.values.tolist(), [0.2, 0.3])
+        self.assertEqual(tally.result[6]["rel_err"].iloc[0], 0.02)
+
+    def test_irregular_bins(self):
+        lines = pulse_height_lines([1], [0.1, 0.2])[:-3] + pulse_height_lines([2], [0.1, 0.2, 0.3])
+        tally = self.read(lines)
+        self.assertEqual(tally.array, None)
+        self.assertEqual(len(tally.result[2]), 3)
+
+    def test_irregular_user_bins(self):
+        lines = (pulse_height_lines([1], [0.1, 0.2], user_bins=["1", "total"])[:-3]
+                 + pulse_height_lines([2], [0.1, 0.2, 0.3], user_bins=["1", "total"]))
+        tally = self.read(lines)
+        self.assertEqual(tally.array, None)
+        self.assertEqual(list(tally.result), [(1, "1"), (1, "total"), (2, "1"), (2, "total")])
+        data = mcnp_output_reader.tally_to_dataframe(tally)
+        self.assertEqual(len(data), 2 * 2 + 2 * 3)
+        self.assertEqual(data["object"].tolist(), [1] * 4 + [2] * 6)
+        self.assertEqual(data["user_bin"].tolist(), [1.0, 1.0, np.inf, np.inf] + [1.0] * 3 + [np.inf] * 3)
+        self.assertEqual(data["energy"].iloc[-1], 0.3)
+
+
+def angle_lines(surfaces, angles, energies=None, times=None):
+    """ lines of a type 1 tally block with angle bins for each surface,
+        results are surface + angle bin / 10 + energy bin / 1000 and
+        the time blocks end with a total column
+    """
+    lines = ["1tally        1        nps =     1000000",
+             "           tally type 1    number of particles crossing a surface.",
+             "           particle(s): neutrons",
+             " "]
+
+    def row(sur, a, e, label):
+        values = [sur + a / 10 + e / 1000 + t for t in range(len(times or [0]))]
+        if times:
+            values.append(sum(values))
+        return label + "".join(f"   {v:.5E} 0.0100" for v in values)
+
+    edges = np.linspace(-1, 1, angles + 1)
+    for sur in surfaces:
+        lines.append(f" surface  {sur}" + " " * 40)
+        for a in range(angles):
+            lines.append(f" angle  bin:  {edges[a]:.5E} to  {edges[a + 1]:.5E} mu")
+            if times:
+                lines.append("         time:" + "".join(f"       {t:.4E}" for t in times)
+                             + "             total")
+            if energies is None:
+                lines.append(row(sur, a, 0, "              "))
+                continue
+            lines.append("      energy   ")
+            for e, erg in enumerate(energies):
+                lines.append(row(sur, a, e, f"    {erg:.4E}"))
+            lines.append(row(sur, a, 0, "      total   "))
+    lines += ["", " " + "=" * 100, ""]
+    return lines
+
+
+class angle_surface_test_case(unittest.TestCase):
+    """ tests type 1 tallies with angle bins """
+
+    def read(self, lines):
+        tally_data = mcnp_output_reader.MCNP_surface_tally()
+        tally_data.tally_type = "1"
+        return mcnp_output_reader.read_type_surface(tally_data, lines)
+
+    def test_angle_only(self):
+        tally = self.read(angle_lines([1, 5], 4))
+        self.assertEqual(tally.surfaces, ["1", "5"])
+        self.assertEqual(tally.ang_bins, [-1.0, -0.5, 0.0, 0.5, 1.0])
+        self.assertEqual(tally.array.shape, (2, 4))
+        self.assertAlmostEqual(tally.array.values[1, 3], 5.3)
+        self.assertEqual(tally.result[5]["angle"].tolist(), [-0.5, 0.0, 0.5, 1.0])
+
+    def test_angle_energy(self):
+        energies = np.linspace(0.01, 14.0, 2500)
+        tally = self.read(angle_lines([1, 2, 3], 4, energies))
+        self.assertEqual(tally.array.shape, (3, 4, 2500))
+        self.assertEqual(len(tally.eng), 2500)
+        self.assertAlmostEqual(tally.array.values[2, 1, 10], 3.11)
+        self.assertEqual(tally.array.total.shape, (3, 4))
+        data = mcnp_output_reader.tally_to_dataframe(tally)
+        self.assertEqual(len(data), 3 * 4 * 2501)
+        self.assertEqual(data["angle"].iloc[-1], 1.0)
+        self.assertEqual(data["energy"].iloc[-1], np.inf)
+
+    def test_angle_energy_time(self):
+        tally = self.read(angle_lines([7, 8], 2, [0.1, 1.0, 10.0], times=[1.0, 5.0]))
+        self.assertEqual(tally.array.shape, (2, 2, 3, 2))
+        self.assertEqual(tally.times, [1.0, 5.0])
+        self.assertEqual(tally.eng, [0.1, 1.0, 10.0])
+        self.assertAlmostEqual(tally.array.values[1, 1, 2, 1], 9.102)
+        self.assertAlmostEqual(tally.array.total[1, 1, 2], 8.102 + 9.102)
+        selected = tally.array.sel(object=[8], angle=[0.0])
+        self.assertEqual(selected.shape, (1, 1, 3, 2))
+
+    def test_angle_time(self):
+        tally = self.read(angle_lines([4], 3, times=[1.0, 2.0, 3.0]))
+        self.assertEqual(tally.array.shape, (1, 3, 3))
+        self.assertEqual(tally.eng, None)
+        self.assertAlmostEqual(tally.array.values[0, 2, 2], 6.2)
+
+    def test_mismatched_angles(self):
+        lines = angle_lines([1], 2)[:-3] + angle_lines([2], 3)[4:]
+        with self.assertRaises(ValueError):
+            self.read(lines)
+
+
+def detector_lines(detectors, energies=None, rings=0):
+    """ lines of a type 5 tally block, results are detector + energy bin /
+        1000 with half of that uncollided
+    """
+    lines = ["1tally       15        nps =     1000000",
+             "           tally type 5    particle flux at a point detector.           units   1/cm**2",
+             "           particle(s): neutrons",
+             " "]
+    headers = [f" detector located at x,y,z = {d:.5E}{-d:12.5E} {2 * d:.5E}"
+               for d in range(detectors - rings)]
+    headers += [f" ring detector along y axis.  radius = {r + 1:.5E}  at y = {-r:.5E}"
+                for r in range(rings)]
+
+    def block(d, scale):
+        if energies is None:
+            return [f"                 {scale * d:.5E} 0.0100"]
+        rows = ["      energy   "]
+        rows += [f"    {erg:.4E}   {scale * (d + e / 1000):.5E} 0.0100"
+                 for e, erg in enumerate(energies)]
+        return rows + [f"      total      {scale * d:.5E} 0.0010"]
+
+    for scale, label in ((1.0, None), (0.5, " uncollided neutron flux")):
+        for d, header in enumerate(headers):
+            lines.append(header)
+            if label:
+                lines.append(label)
+            lines += block(d + 1, scale) + [" "]
+    for d in range(detectors):
+        lines += [" detector score diagnostics                  cumulative",
+                  "",
+                  f" average tally per history = {d + 1:.5E}            largest score = {d:.5E}",
+                  f" (largest score)/(average tally) = 6.79099E+02      nps of largest score =      {d + 10}",
+                  "",
+                  " score misses"]
+        lines += [f"   {name:<40}{d * 6 + i:>8}"
+                  for i, name in enumerate(mcnp_output_reader.MISS_NAMES)]
+        lines.append("")
+    lines += [" " + "=" * 100, ""]
+    return lines
+
+
+class detector_test_case(unittest.TestCase):
+    """ tests type 5 tallies with several detectors """
+
+    def read(self, lines):
+        tally_data = mcnp_output_reader.MCNP_type5_tally()
+        return mcnp_output_reader.read_type_5(tally_data, lines)
+
+    def test_many_detectors(self):
+        tally = self.read(detector_lines(200, energies=np.linspace(0.1, 14, 50)))
+        self.assertEqual(tally.positions.shape, (200, 3))
+        self.assertEqual(tally.positions[3].tolist(), [3.0, -3.0, 6.0])
+        self.assertEqual(tally.array.shape, (200, 50))
+        self.assertAlmostEqual(tally.array.values[9, 4], 10.004)
+        self.assertEqual(tally.array.total[9], 10.0)
+        self.assertEqual(tally.uncoll_flux.shape, (200, 50))
+        np.testing.assert_allclose(tally.uncollided_fraction, 0.5, rtol=1e-4)
+        self.assertEqual(tally.miss_counts.shape, (200, 6))
+        self.assertEqual(tally.miss_counts[2].tolist(), [12, 13, 14, 15, 16, 17])
+        self.assertEqual(tally.largest_scores_nps[-1], 209)
+        self.assertEqual(tally.averages_per_history[1], 2.0)
+        self.assertEqual(tally.misses["energy cutoff"], 5)
+        self.assertEqual((tally.x, tally.y, tally.z), (0.0, 0.0, 0.0))
+
+    def test_ring_detectors(self):
+        tally = self.read(detector_lines(3, rings=2))
+        self.assertEqual(tally.radii.tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(tally.positions[2].tolist(), [0.0, -1.0, 0.0])
+        self.assertEqual(tally.array.values.tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(list(tally.result), [0, 1, 2])
+
+    def test_single_detector_fixture(self):
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')
+        tally = mcnp_output_reader.read_output_file(path).tally(5)
+        self.assertEqual(tally.positions.tolist(), [[15.0, 0.0, 0.0]])
+        self.assertEqual(tally.miss_counts.tolist(), [[0, 0, 935317, 39376, 0, 0]])
+        self.assertAlmostEqual(tally.uncollided_fraction[0], 1.74366E-04 / 3.42950E-04)
+
+
+def lattice_lines(labels):
+    """ lines of a type 4 tally block over the given bins, the result of
+        bin n is n + 1
+    """
+    lines = ["1tally       14        nps =     1000000",
+             "           tally type 4    track length estimate of particle flux.      units   1/cm**2",
+             "           particle(s): neutrons",
+             "",
+             "           volumes "]
+    for start in range(0, len(labels), 4):
+        lines.append("                   cell:  " + "  ".join(labels[start:start + 4]))
+        lines.append("                         " + "  ".join(["1.00000E+00"] * len(labels[start:start + 4])))
+    lines.append(" ")
+    for n, label in enumerate(labels):
+        lines += [f" cell ({label})", f"                 {n + 1:.5E} 0.0100", " "]
+    lines += [" " + "=" * 100, ""]
+    return lines
+
+
+class lattice_test_case(unittest.TestCase):
+    """ tests type 4 tallies over lattice elements """
+
+    def read(self, lines):
+        tally_data = mcnp_output_reader.MCNP_cell_tally()
+        tally_data.tally_type = "4"
+        return mcnp_output_reader.read_type_cell(tally_data, lines)
+
+    def test_lattice(self):
+        labels = [f"1<2[{i} {j} {k}]<3" for k in range(2) for j in range(-1, 2) for i in range(4)]
+        tally = self.read(lattice_lines(labels))
+        self.assertEqual(tally.cells, labels)
+        self.assertEqual(len(tally.vols), 24)
+        self.assertEqual(tally.array.values[:3].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(tally.lattice.chains, [("1", "2", "3")])
+        self.assertEqual(tally.lattice.shape, (4, 3, 2))
+        self.assertEqual(tally.lattice.lower.tolist(), [0, -1, 0])
+        values, rel_err = tally.lattice_grid()
+        self.assertEqual(values.shape, (1, 4, 3, 2))
+        # 1<2[2 0 1]<3 is bin 2 + 4 * 1 + 12 * 1
+        self.assertEqual(values[0, 2, 1, 1], 19.0)
+        self.assertEqual(values[0, :, :, 0].sum(), sum(range(1, 13)))
+        self.assertTrue((rel_err == 0.01).all())
+
+    def test_chains(self):
+        labels = ["1<2[0 0 0]<3", "1<2[1 0 0]<3", "4<2[0 0 0]<3", "1<2[0 0 0]<5[1 0 0]<6"]
+        tally = self.read(lattice_lines(labels))
+        self.assertEqual(tally.lattice.chains,
+                         [("1", "2", "3"), ("4", "2", "3"), ("1", "2", "5[1 0 0]", "6")])
+        values = tally.lattice_grid()[0]
+        self.assertEqual(values.shape, (3, 2, 1, 1))
+        self.assertEqual(values[0, :, 0, 0].tolist(), [1.0, 2.0])
+        self.assertTrue(np.isnan(values[1, 1, 0, 0]))
+
+    def test_union_bins(self):
+        tally = self.read(lattice_lines(["1 2 3", "1<2[0:1 0:1 0:0]<3"]))
+        self.assertEqual(tally.cells, ["1 2 3", "1<2[0:1 0:1 0:0]<3"])
+        self.assertEqual(tally.array.values.tolist(), [1.0, 2.0])
+        self.assertIsNone(tally.lattice)
+        with self.assertRaises(ValueError):
+            tally.lattice_grid()
 
 
 class writelines_test_case(unittest.TestCase):
@@ -834,6 +1628,30 @@ class tables_testing(unittest.TestCase):
         self.assertEqual(len(self.t60.columns), 8)
         self.assertFalse(self.t60.empty)
 
+    def test_t60_numeric(self):
+        self.assertEqual(self.t60["cell"].dtype, np.int64)
+        self.assertEqual(self.t60["volume"].dtype, float)
+        self.assertEqual(list(self.t60.columns[-2:]), ["pieces", "photon importance"])
+
+    def test_cell_props(self):
+        props = self.single.cell_props([3, 1])
+        self.assertEqual(list(props.index), [3, 1])
+        np.testing.assert_allclose(props["volume"], [2.93215E+04, 5.23599E+02])
+        np.testing.assert_allclose(props["photon importance"], [1.0, 1.0])
+        self.assertAlmostEqual(self.single.cell_props(2)["mass"][2], 9.89602E+03)
+        with self.assertRaises(KeyError):
+            self.single.cell_props([1, 7])
+
+    def test_cell_props_lazy(self):
+        # table 60 is parsed on demand when it was not selected
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        lazy = mcnp_output_reader.read_output_file(path, lazy=True, tables=[])
+        try:
+            props = lazy.cell_props(np.array([1, 2, 3]))
+        finally:
+            lazy.close()
+        pd.testing.assert_frame_equal(props, self.single.cell_props([1, 2, 3]))
+
     def test_t101(self):
         # tests print table 101 - particles and energy limits
         self.assertEqual(len(self.single.t101['particle_name']), 2)
@@ -841,7 +1659,51 @@ class tables_testing(unittest.TestCase):
 
     def test_t126(self):
         # test print table 126 - activity in cells
-        self.assertTrue(True)
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles_erg.io')
+        mc_data = mcnp_output_reader.read_output_file(path, tables=[126])
+        t126 = mc_data.table(126)
+        self.assertEqual(list(t126["cell"]), [1, 2, 3])
+        self.assertEqual(t126["population"].dtype, np.int64)
+        with self.assertRaises(ValueError):
+            mc_data.table(130)
+
+    def test_eager_tables(self):
+        # a full read parses every supported table found in the output
+        self.assertEqual(sorted(self.single.print_tables), ["100", "101", "126", "60"])
+        t126 = self.single.table(126)
+        self.assertEqual(list(t126["cell"]), [1, 2, 3])
+        with self.assertRaises(ValueError):
+            self.single.table(130)
+
+    def test_lazy_table(self):
+        # tables are parsed on first access when read lazily
+        path = os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io')
+        lazy = mcnp_output_reader.read_output_file(path, lazy=True)
+        try:
+            t130 = lazy.table(130)
+        finally:
+            lazy.close()
+        self.assertIn("130", lazy.print_tables)
+        self.assertEqual(len(t130), 3)
+        self.assertEqual(list(lazy.print_tables["60"].columns[:2]), ["index", "cell"])
+
+    def test_read_print_table(self):
+        lines = ut.get_lines(os.path.join(os.path.dirname(__file__), 'test_output', 'singles.io'))
+        t140 = mcnp_output_reader.read_print_table(lines, 140)
+        self.assertEqual(t140["nuclides"][0], "13000.05p")
+        with self.assertRaises(ValueError):
+            mcnp_output_reader.read_print_table(lines, 128)
+
+    def test_summary(self):
+        # particle creation and loss tables of the problem summary
+        self.assertEqual(len(self.single.summary_data), 1)
+        summary = self.single.summary_data[0]
+        self.assertEqual(summary.particle, "photon")
+        self.assertEqual(summary.nps, 1000000)
+        self.assertEqual(summary.creation.loc["source", "tracks"], 1000000)
+        self.assertEqual(summary.creation.loc["(gamma,xgamma)", "tracks"], 0)
+        self.assertAlmostEqual(summary.loss.loc["capture", "weight"], 1.4908E-01)
+        self.assertEqual(summary.loss.loc["total", "tracks"], summary.creation.loc["total", "tracks"])
 
 
 class str_method_tests(unittest.TestCase):
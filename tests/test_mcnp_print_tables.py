@@ -0,0 +1,144 @@
+import os
+import unittest
+import numpy as np
+from neutron_tools.mcnp import mcnp_print_tables
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.utilities import neut_utilities as ut
+
+
+def table_lines(fname, number):
+    """ lines of an output file from the start of a print table """
+    lines = ut.get_lines(os.path.join(os.path.dirname(__file__), 'test_output', fname))
+    return lines[mcnp_output_reader.get_table_dict(lines)[str(number)]:]
+
+
+class row_table_test_case(unittest.TestCase):
+    """ tests tables with one row per line """
+
+    def test_table126(self):
+        df = mcnp_print_tables.read_print_table(table_lines("singles.io", 126))
+        self.assertEqual(df.attrs["title"], "photon activity in each cell")
+        self.assertEqual(list(df.columns[:5]),
+                         ["index", "cell", "tracks entering", "population", "collisions"])
+        self.assertEqual(df["population"].dtype, np.int64)
+        self.assertEqual(df["average track mfp (cm)"].dtype, float)
+        self.assertEqual(list(df["cell"]), [1, 2, 3])
+        self.assertEqual(df["population"][1], 1075214)
+        self.assertAlmostEqual(df["average track mfp (cm)"][1], 5.3208)
+
+    def test_table60(self):
+        df = mcnp_print_tables.read_print_table(table_lines("singles.io", 60))
+        self.assertEqual(list(df.columns),
+                         ["index", "cell", "mat", "atom density", "gram density",
+                          "volume", "mass", "pieces", "photon importance"])
+        self.assertEqual(len(df), 4)
+        self.assertAlmostEqual(df["mass"][1], 9.89602E+03)
+
+    def test_table60_mixed_column(self):
+        # materials with an s(a,b) table are printed as e.g. 5s
+        df = mcnp_print_tables.read_print_table(table_lines("r2s_1.io", 60))
+        self.assertEqual(df["mat"][1], "5s")
+        self.assertEqual(df["volume"].dtype, float)
+
+    def test_table60_importances(self):
+        lines = ["1cells                                      print table 60",
+                 "",
+                 "                               atom        gram                                            neutron"
+                 "     photon",
+                 "              cell      mat   density     density     volume       mass            pieces importance"
+                 "  importance",
+                 "",
+                 "        1        1        0  0.00000E+00 0.00000E+00 5.23599E+02 0.00000E+00           1  1.0000E+00"
+                 "  2.0000E+00",
+                 "        2        2        1  6.02616E-02 2.70000E+00 3.66519E+03 9.89602E+03           1  1.0000E+00"
+                 "  0.0000E+00",
+                 "",
+                 " total                                               3.35103E+04 9.89602E+03"]
+        df = mcnp_print_tables.read_print_table(lines)
+        self.assertEqual(list(df.columns[-2:]), ["neutron importance", "photon importance"])
+        self.assertEqual(list(df["photon importance"]), [2.0, 0.0])
+
+    def test_table140_carried_cell(self):
+        lines = ["1neutron  activity of each nuclide in each cell, per source particle      print table 140",
+                 "",
+                 "      cell     cell   nuclides     atom       total  collisions",
+                 "     index     name            fraction  collisions    * weight",
+                 "",
+                 "         1       10   1001.80c 6.67E-01       10000  1.0000E-01",
+                 "                      8016.80c 3.33E-01        2000  2.0000E-02",
+                 "",
+                 "              total                           12000  1.2000E-01",
+                 "",
+                 "         2       20   1001.80c 1.00E+00         500  5.0000E-03",
+                 "",
+                 "              total                             500  5.0000E-03",
+                 "",
+                 "        total over all cells by nuclide       total  collisions",
+                 "                     1001.80c                 10500  1.0500E-01"]
+        df = mcnp_print_tables.read_print_table(lines)
+        self.assertEqual(list(df.columns[:4]), ["cell index", "cell name", "nuclides", "atom fraction"])
+        self.assertEqual(list(df["cell name"]), [10, 10, 20])
+        self.assertEqual(list(df["nuclides"]), ["1001.80c", "8016.80c", "1001.80c"])
+        self.assertEqual(list(df["total collisions"]), [10000, 2000, 500])
+
+    def test_continued_page(self):
+        lines = table_lines("singles.io", 126)
+        title = lines[0]
+        pages = lines[:8] + [title] + lines[1:]
+        df = mcnp_print_tables.read_print_table(pages)
+        self.assertEqual(list(df["cell"]), [1, 2, 1, 2, 3])
+
+    def test_table101(self):
+        df = mcnp_print_tables.read_print_table(table_lines("singles.io", 101))
+        self.assertEqual(list(df["particle_name"]), ["photon", "electron"])
+        self.assertEqual(df["max_energy"].dtype, float)
+
+
+class other_table_test_case(unittest.TestCase):
+    """ tests tables with their own layouts """
+
+    def test_table100(self):
+        df = mcnp_print_tables.read_print_table(table_lines("r2s_1.io", 100))
+        self.assertEqual(df["table"][0], "1001.70c")
+        self.assertEqual(df["length"][0], 3652)
+        self.assertEqual(df["file"][0], "endf7_300k")
+        self.assertAlmostEqual(df["emin"][0], 1e-11)
+        self.assertAlmostEqual(df["emax"][1], 150.0)
+
+    def test_table130(self):
+        df = mcnp_print_tables.read_print_table(table_lines("singles.io", 130))
+        self.assertEqual(list(df["cell"]), [1, 2, 3])
+        self.assertAlmostEqual(df["entering"][1], 1.0824)
+        self.assertAlmostEqual(df["external events total"][1], 6.9975E-02)
+        self.assertAlmostEqual(df["physical events total"][1], -6.9975E-02)
+        self.assertAlmostEqual(df.attrs["total"]["capture"], -1.4908E-01)
+        self.assertEqual(df.attrs["title"], "photon weight balance in each cell")
+
+    def test_table128(self):
+        lines = ["1universe map                                         print table 128",
+                 "",
+                 "  universe      cells",
+                 "       0          1       2       3       4       5",
+                 "                  6       7",
+                 "      10        100     101",
+                 ""]
+        df = mcnp_print_tables.read_print_table(lines)
+        self.assertEqual(list(df["universe"]), [0] * 7 + [10, 10])
+        self.assertEqual(list(df["cell"]), [1, 2, 3, 4, 5, 6, 7, 100, 101])
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            mcnp_print_tables.read_print_table(["1surfaces          print table 70"])
+
+
+class typed_column_test_case(unittest.TestCase):
+    """ tests the column conversion """
+
+    def test_types(self):
+        self.assertEqual(mcnp_print_tables.typed_column(["1", "22"]).dtype, np.int64)
+        self.assertEqual(mcnp_print_tables.typed_column(["1", "2.0E+00"]).dtype, float)
+        self.assertEqual(list(mcnp_print_tables.typed_column(["1", "2s"])), ["1", "2s"])
+
+
+if __name__ == '__main__':
+    unittest.main()
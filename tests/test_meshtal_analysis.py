@@ -6,6 +6,7 @@ import os
 path = os.path.join(os.path.dirname(__file__), 'test_output', 'cup_low_res.imsht')
 meshes_path = os.path.join(os.path.dirname(__file__), 'test_output', 'meshes.imsht')
 timepath = os.path.join(os.path.dirname(__file__), 'test_output', 'time_msht')
+energypath = os.path.join(os.path.dirname(__file__), 'test_output', 'energy_msht')
 
 
 class calc_mid_points_test(unittest.TestCase):
@@ -57,6 +58,14 @@ class convert_to_df_test(unittest.TestCase):
         self.assertEqual(meshtally_test.data['z'].iloc[0], 5.00)
         self.assertEqual(meshtally_test.data['rel_err'].iloc[0], 1.00)
 
+    def test_df_convert_energy_total(self):
+        # the Total energy bin rows are dropped, as for time bins
+        mesh = ma.read_meshtally_file(energypath)[0]
+        self.assertEqual(mesh.ctype, "6col_e")
+        self.assertEqual(len(mesh.data), 2 * 10 * 10 * 10)
+        self.assertEqual(sorted(mesh.data["Energy"].unique().tolist()), [1.0, 2.0])
+        self.assertEqual(mesh.data["Energy"].dtype.kind, "f")
+
 
 class count_zeros_test(unittest.TestCase):
 
@@ -3,6 +3,10 @@ import tempfile
 from unittest.mock import patch, mock_open
 from neutron_tools.utilities import neut_utilities as ut
 import os
+import bz2
+import gzip
+import lzma
+import json
 import logging
 from datetime import datetime
 
@@ -23,6 +27,46 @@ class getlines_test_case(unittest.TestCase):
             os.remove(temp_file_path)
 
 
+class compressed_file_test_case(unittest.TestCase):
+    """ tests reading compressed files transparently """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.text = "Line 1\nline 2\nline 3\n"
+        self.paths = {None: os.path.join(self.tmp.name, "plain.txt")}
+        with open(self.paths[None], "w") as f:
+            f.write(self.text)
+        for name, module in (("gzip", gzip), ("bz2", bz2), ("xz", lzma)):
+            # no extension, detection is from the contents
+            self.paths[name] = os.path.join(self.tmp.name, name)
+            with module.open(self.paths[name], "wt") as f:
+                f.write(self.text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_detect_compression(self):
+        for name, path in self.paths.items():
+            self.assertEqual(ut.detect_compression(path), name)
+
+    def test_get_lines(self):
+        for path in self.paths.values():
+            self.assertEqual(ut.get_lines(path), ["Line 1", "line 2", "line 3"])
+
+    def test_open_file_streams_lines(self):
+        for path in self.paths.values():
+            with ut.open_file(path) as f:
+                self.assertEqual(next(iter(f)), "Line 1\n")
+
+    def test_map_file(self):
+        for path in self.paths.values():
+            buf = ut.map_file(path)
+            try:
+                self.assertEqual(buf[:], self.text.encode())
+            finally:
+                buf.close()
+
+
 class writelines_test_case(unittest.TestCase):
     """ tests write_lines function"""
 
@@ -167,6 +211,89 @@ class logger_test_case(unittest.TestCase):
             self.assertIn(mock_handler, logger.handlers)
 
 
+class instrumentation_test_case(unittest.TestCase):
+    """tests for the timing spans and counters"""
+
+    def tearDown(self):
+        ut.disable_instrumentation()
+
+    def test_disabled(self):
+        self.assertIsNone(ut.get_instrumentation())
+        with ut.span("phase"):
+            ut.count("lines_scanned", 10)
+        self.assertIs(ut.span("phase"), ut.span("other"))
+        self.assertIsNone(ut.get_instrumentation())
+
+    def test_nested_spans(self):
+        rec = ut.enable_instrumentation()
+        with ut.span("read"):
+            for _ in range(3):
+                with ut.span("parse"):
+                    ut.count("lines_scanned", 5)
+        self.assertEqual([r["span"] for r in rec.spans], ["read/parse"] * 3 + ["read"])
+        summary = rec.summary()
+        self.assertEqual(summary["read/parse"]["calls"], 3)
+        self.assertGreaterEqual(summary["read"]["total"], summary["read/parse"]["total"])
+        self.assertEqual(rec.counters, {"lines_scanned": 15})
+        self.assertIs(ut.disable_instrumentation(), rec)
+
+    def test_span_on_error(self):
+        rec = ut.enable_instrumentation()
+        with self.assertRaises(ValueError):
+            with ut.span("read"):
+                raise ValueError("bad line")
+        with ut.span("next"):
+            pass
+        self.assertEqual([r["span"] for r in rec.spans], ["read", "next"])
+
+    def test_timed(self):
+        @ut.timed()
+        def parse(x):
+            return x * 2
+
+        self.assertEqual(parse(2), 4)
+        rec = ut.enable_instrumentation()
+        self.assertEqual(parse(3), 6)
+        self.assertEqual(parse.__name__, "parse")
+        self.assertEqual(rec.summary()["parse"]["calls"], 1)
+
+    def test_get_lines_counters(self):
+        rec = ut.enable_instrumentation()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "f.txt")
+            with open(path, "w") as f:
+                f.write("a\nbb\n")
+            ut.get_lines(path)
+        self.assertEqual(rec.counters, {"characters_read": 5, "lines_read": 2})
+
+    def test_export(self):
+        rec = ut.enable_instrumentation()
+        with ut.span("read"):
+            ut.count("tallies_parsed", 2)
+        table = rec.summary_table()
+        self.assertTrue(table[0].startswith("span"))
+        self.assertTrue(table[1].startswith("read"))
+        self.assertIn("tallies_parsed", table[-1])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spans.jsonl")
+            rec.export_jsonl(path)
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]["span"], "read")
+        self.assertEqual(records[1], {"counter": "tallies_parsed", "value": 2})
+
+    def test_logger_methods(self):
+        nt_logger = ut.NeutronToolsLogger()
+        self.assertEqual(nt_logger.instrumentation_summary(), [])
+        rec = nt_logger.enable_instrumentation()
+        with self.assertLogs("nt_logger", level="DEBUG") as logs:
+            with ut.span("read"):
+                pass
+        self.assertIn("span read took", logs.output[0])
+        self.assertEqual(len(nt_logger.instrumentation_summary()), 2)
+        self.assertIs(nt_logger.disable_instrumentation(), rec)
+
+
 class tab_finder_test_case(unittest.TestCase):
     """test for the function """
     def test_find_tabs_in_list_with_tabs(self):
@@ -0,0 +1,217 @@
+mcnp6.mpi 6     07/24/25 09:38:16     2       1000000        32635054
+ c test input to generate output for MCNP output reader
+ntal     6
+    1    2    4    5    6    8
+tally    1    2    0
+f       1
+      1
+d       1
+u       0
+s       0
+m       0
+c       0       0
+et     15
+  1.00000E-01  2.00000E-01  3.00000E-01  4.00000E-01  5.00000E-01  6.00000E-01
+  8.00000E-01  9.00000E-01  1.00000E+00  1.10000E+00  1.20000E+00  1.30000E+00
+  1.40000E+00  1.50000E+00
+t       0
+vals
+  2.92000E-02 0.0096  5.88040E-02 0.0062  7.34360E-02 0.0051  3.02800E-03 0.0257
+  6.60000E-05 0.1741  3.26000E-04 0.0783  0.00000E+00 0.0000  0.00000E+00 0.0000
+  0.00000E+00 0.0000  0.00000E+00 0.0000  0.00000E+00 0.0000  0.00000E+00 0.0000
+  1.00000E+00 0.0000  0.00000E+00 0.0000  1.16486E+00 0.0006
+tfc   16       1       1       1       1       1       1       1       1
+      64000  1.16660E+00  2.30000E-03  8.52833E+06
+     128000  1.16680E+00  1.60000E-03  9.78742E+06
+     192000  1.16620E+00  1.30000E-03  1.00000E+07
+     256000  1.16540E+00  1.10000E-03  1.00000E+07
+     320000  1.16550E+00  1.00000E-03  9.98108E+06
+     384000  1.16500E+00  9.00000E-04  1.00000E+07
+     448000  1.16500E+00  9.00000E-04  1.00000E+07
+     512000  1.16440E+00  8.00000E-04  1.00000E+07
+     576000  1.16460E+00  8.00000E-04  1.00000E+07
+     640000  1.16490E+00  7.00000E-04  1.10000E+07
+     704000  1.16500E+00  7.00000E-04  1.10000E+07
+     768000  1.16500E+00  7.00000E-04  1.10000E+07
+     832000  1.16510E+00  6.00000E-04  1.10000E+07
+     896000  1.16500E+00  6.00000E-04  1.10000E+07
+     960000  1.16490E+00  6.00000E-04  1.10000E+07
+    1000000  1.16490E+00  6.00000E-04  1.10000E+07
+tally    2    2    0
+f       1
+      1
+d       1
+u       0
+s       0
+m       0
+c       0       0
+et     15
+  1.00000E-01  2.00000E-01  3.00000E-01  4.00000E-01  5.00000E-01  6.00000E-01
+  8.00000E-01  9.00000E-01  1.00000E+00  1.10000E+00  1.20000E+00  1.30000E+00
+  1.40000E+00  1.50000E+00
+t       0
+vals
+  1.92767E-04 0.0135  3.89408E-04 0.0090  4.82933E-04 0.0075  6.66145E-05 0.0332
+  7.60486E-07 0.2757  2.36478E-06 0.1132  0.00000E+00 0.0000  0.00000E+00 0.0000
+  0.00000E+00 0.0000  0.00000E+00 0.0000  0.00000E+00 0.0000  0.00000E+00 0.0000
+  3.18310E-03 0.0000  0.00000E+00 0.0000  4.31795E-03 0.0015
+tfc   16       1       1       1       1       1       1       1       1
+      64000  4.31100E-03  5.90000E-03  1.31579E+06
+     128000  4.31540E-03  4.20000E-03  1.50543E+06
+     192000  4.31190E-03  3.40000E-03  1.53910E+06
+     256000  4.31180E-03  3.00000E-03  1.55062E+06
+     320000  4.31780E-03  2.70000E-03  1.47801E+06
+     384000  4.31330E-03  2.40000E-03  1.48806E+06
+     448000  4.31240E-03  2.20000E-03  1.52756E+06
+     512000  4.30990E-03  2.10000E-03  1.55163E+06
+     576000  4.31240E-03  2.00000E-03  1.56095E+06
+     640000  4.31920E-03  1.90000E-03  1.56926E+06
+     704000  4.31830E-03  1.80000E-03  1.58142E+06
+     768000  4.31620E-03  1.70000E-03  1.56921E+06
+     832000  4.31640E-03  1.70000E-03  1.56857E+06
+     896000  4.31620E-03  1.60000E-03  1.57313E+06
+     960000  4.31710E-03  1.50000E-03  1.57764E+06
+    1000000  4.31790E-03  1.50000E-03  1.57775E+06
+tally    4    2    0
+f       1
+      2
+d       1
+u       0
+s       0
+m       0
+c       0       0
+et     15
+  1.00000E-01  2.00000E-01  3.00000E-01  4.00000E-01  5.00000E-01  6.00000E-01
+  8.00000E-01  9.00000E-01  1.00000E+00  1.10000E+00  1.20000E+00  1.30000E+00
+  1.40000E+00  1.50000E+00
+t       0
+vals
+  1.20226E-04 0.0039  2.42210E-04 0.0027  1.88692E-04 0.0029  9.47627E-05 0.0038
+  5.59334E-05 0.0045  4.14427E-05 0.0050  6.13264E-05 0.0039  2.63593E-05 0.0058
+  2.52410E-05 0.0059  2.44658E-05 0.0059  2.39046E-05 0.0060  2.39254E-05 0.0059
+  9.82269E-04 0.0005  0.00000E+00 0.0000  1.91076E-03 0.0006
+tfc   16       1       1       1       1       1       1       1       1
+      64000  1.90980E-03  2.30000E-03  8.64909E+06
+     128000  1.90980E-03  1.60000E-03  9.91524E+06
+     192000  1.91030E-03  1.30000E-03  1.00000E+07
+     256000  1.90910E-03  1.10000E-03  1.00000E+07
+     320000  1.91000E-03  1.00000E-03  1.00000E+07
+     384000  1.91040E-03  9.00000E-04  1.00000E+07
+     448000  1.91000E-03  9.00000E-04  1.00000E+07
+     512000  1.91010E-03  8.00000E-04  1.00000E+07
+     576000  1.91010E-03  8.00000E-04  1.00000E+07
+     640000  1.91040E-03  7.00000E-04  1.10000E+07
+     704000  1.91020E-03  7.00000E-04  1.10000E+07
+     768000  1.91060E-03  7.00000E-04  1.10000E+07
+     832000  1.91070E-03  6.00000E-04  1.10000E+07
+     896000  1.91070E-03  6.00000E-04  1.10000E+07
+     960000  1.91070E-03  6.00000E-04  1.10000E+07
+    1000000  1.91080E-03  6.00000E-04  1.10000E+07
+tally    5    2    1
+f       1
+d       2
+u       0
+s       0
+m       0
+c       0       0
+et     15
+  1.00000E-01  2.00000E-01  3.00000E-01  4.00000E-01  5.00000E-01  6.00000E-01
+  8.00000E-01  9.00000E-01  1.00000E+00  1.10000E+00  1.20000E+00  1.30000E+00
+  1.40000E+00  1.50000E+00
+t       0
+vals
+  1.20831E-05 0.0258  2.83320E-05 0.0088  1.83960E-05 0.0186  1.39473E-05 0.0091
+  1.31047E-05 0.0091  1.17261E-05 0.0100  2.12588E-05 0.0091  9.88176E-06 0.0155
+  9.63360E-06 0.0173  9.69897E-06 0.0195  9.64169E-06 0.0216  9.34586E-06 0.0250
+  1.75900E-04 0.0008  0.00000E+00 0.0000  3.42950E-04 0.0025  7.81023E-07 0.1466
+  4.01905E-07 0.1397  1.55635E-07 0.2090  1.16981E-07 0.3842  4.85621E-08 0.3622
+  1.78768E-07 0.0781  9.33565E-09 0.3425  4.15696E-10 0.5187  3.83255E-10 0.7121
+  1.14762E-10 1.0000  0.00000E+00 0.0000  0.00000E+00 0.0000  1.72673E-04 0.0000
+  0.00000E+00 0.0000  1.74366E-04 0.0008
+tfc   16       1       1       1       1       1       1       1       1
+      64000  3.45560E-04  1.09000E-02  3.80439E+05
+     128000  3.42930E-04  7.00000E-03  5.31405E+05
+     192000  3.42660E-04  5.50000E-03  5.94327E+05
+     256000  3.42180E-04  4.70000E-03  6.13873E+05
+     320000  3.42930E-04  4.20000E-03  5.97309E+05
+     384000  3.43490E-04  3.90000E-03  5.78632E+05
+     448000  3.42980E-04  3.60000E-03  6.07326E+05
+     512000  3.43060E-04  3.60000E-03  5.41753E+05
+     576000  3.42740E-04  3.30000E-03  5.59529E+05
+     640000  3.42780E-04  3.20000E-03  5.49961E+05
+     704000  3.42810E-04  3.00000E-03  5.55527E+05
+     768000  3.43100E-04  3.00000E-03  5.33216E+05
+     832000  3.42830E-04  2.80000E-03  5.42331E+05
+     896000  3.42770E-04  2.70000E-03  5.54989E+05
+     960000  3.43030E-04  2.60000E-03  5.59493E+05
+    1000000  3.42950E-04  2.50000E-03  5.63896E+05
+tally    6    2    0
+f       1
+      2
+d       1
+u       0
+s       0
+m       0
+c       0       0
+et     15
+  1.00000E-01  2.00000E-01  3.00000E-01  4.00000E-01  5.00000E-01  6.00000E-01
+  8.00000E-01  9.00000E-01  1.00000E+00  1.10000E+00  1.20000E+00  1.30000E+00
+  1.40000E+00  1.50000E+00
+t       0
+vals
+  5.60997E-07 0.0043  1.02136E-06 0.0028  1.28533E-06 0.0029  9.25644E-07 0.0038
+  7.15846E-07 0.0045  6.48718E-07 0.0050  1.20451E-06 0.0039  6.19356E-07 0.0058
+  6.52007E-07 0.0059  6.86664E-07 0.0059  7.21678E-07 0.0060  7.71479E-07 0.0059
+  3.32431E-05 0.0005  0.00000E+00 0.0000  4.30567E-05 0.0002
+tfc   16       1       1       1       1       1       1       1       1
+      64000  4.30570E-05  7.00000E-04  8.70000E+07
+     128000  4.30060E-05  5.00000E-04  9.90000E+07
+     192000  4.30370E-05  4.00000E-04  1.00000E+08
+     256000  4.30380E-05  4.00000E-04  1.00000E+08
+     320000  4.30480E-05  3.00000E-04  1.00000E+08
+     384000  4.30490E-05  3.00000E-04  1.00000E+08
+     448000  4.30530E-05  3.00000E-04  1.00000E+08
+     512000  4.30550E-05  3.00000E-04  1.00000E+08
+     576000  4.30580E-05  2.00000E-04  1.10000E+08
+     640000  4.30580E-05  2.00000E-04  1.10000E+08
+     704000  4.30530E-05  2.00000E-04  1.10000E+08
+     768000  4.30580E-05  2.00000E-04  1.10000E+08
+     832000  4.30560E-05  2.00000E-04  1.10000E+08
+     896000  4.30530E-05  2.00000E-04  1.10000E+08
+     960000  4.30550E-05  2.00000E-04  1.10000E+08
+    1000000  4.30570E-05  2.00000E-04  1.10000E+08
+tally    8    2    0
+f       1
+      2
+d       1
+u       0
+s       0
+m       0
+c       0       0
+et     15
+  1.00000E-01  2.00000E-01  3.00000E-01  4.00000E-01  5.00000E-01  6.00000E-01
+  8.00000E-01  9.00000E-01  1.00000E+00  1.10000E+00  1.20000E+00  1.30000E+00
+  1.40000E+00  1.50000E+00
+t       0
+vals
+  5.16461E-01 0.0010  2.65130E-02 0.0061  2.62190E-02 0.0061  2.62500E-02 0.0061
+  2.60900E-02 0.0061  2.69150E-02 0.0060  5.72240E-02 0.0041  3.18470E-02 0.0055
+  3.36300E-02 0.0054  3.79320E-02 0.0050  6.24910E-02 0.0039  5.15180E-02 0.0043
+  7.69100E-02 0.0035  0.00000E+00 0.0000  1.00000E+00 0.0000
+tfc   16       1       1       1       1       1       1       1       1
+      64000  1.00000E+00  0.00000E+00  1.00000E+30
+     128000  1.00000E+00  0.00000E+00  1.00000E+30
+     192000  1.00000E+00  0.00000E+00  1.00000E+30
+     256000  1.00000E+00  0.00000E+00  1.00000E+30
+     320000  1.00000E+00  0.00000E+00  1.00000E+30
+     384000  1.00000E+00  0.00000E+00  1.00000E+30
+     448000  1.00000E+00  0.00000E+00  1.00000E+30
+     512000  1.00000E+00  0.00000E+00  1.00000E+30
+     576000  1.00000E+00  0.00000E+00  1.00000E+30
+     640000  1.00000E+00  0.00000E+00  1.00000E+30
+     704000  1.00000E+00  0.00000E+00  1.00000E+30
+     768000  1.00000E+00  0.00000E+00  1.00000E+30
+     832000  1.00000E+00  0.00000E+00  1.00000E+30
+     896000  1.00000E+00  0.00000E+00  1.00000E+30
+     960000  1.00000E+00  0.00000E+00  1.00000E+30
+    1000000  1.00000E+00  0.00000E+00  1.00000E+30
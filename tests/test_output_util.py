@@ -2,7 +2,10 @@ import unittest
 from unittest.mock import patch, mock_open, call
 from neutron_tools.mcnp import mcnp_output_reader as mor
 from neutron_tools.utilities import output_utilities
+from neutron_tools.utilities import synthetic_files
+import importlib.util
 import os
+import tempfile
 
 class wrap_tokens_test_case(unittest.TestCase):
     """ tests of wrap tokens function"""
@@ -105,5 +108,87 @@ class csv_test_case(unittest.TestCase):
         open_mock.assert_called_with("output.txt", "w")
 
 
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+HAS_TABLES = importlib.util.find_spec("tables") is not None
+
+
+class export_test_case(unittest.TestCase):
+    """ tests exporting all tallies to columnar files """
+
+    def setUp(self):
+        self.mc_data = mor.read_output_file("test_output/singles_et.io")
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frame(self):
+        data, metadata = output_utilities.tallies_frame(self.mc_data)
+        self.assertEqual(list(data.columns), mor.TALLY_COLUMNS)
+        self.assertEqual(sorted(data["tally"].unique()), self.mc_data.tally_numbers)
+        self.assertEqual(metadata["nps"], "1000000")
+        self.assertEqual(metadata["version"], self.mc_data.version)
+        self.assertEqual(metadata["tallies"], "1,2,4,5,6,8")
+
+    def test_select_format(self):
+        with self.assertRaises(ValueError):
+            output_utilities.select_export_format("xlsx")
+        with patch("importlib.util.find_spec", return_value=None):
+            self.assertEqual(output_utilities.available_export_formats(), [])
+            with self.assertRaises(ImportError):
+                output_utilities.select_export_format()
+            with self.assertRaises(ImportError):
+                output_utilities.select_export_format("parquet")
+
+    def round_trip(self, fmt):
+        path = os.path.join(self.tmp.name, "tallies")
+        data, metadata = output_utilities.tallies_frame(self.mc_data)
+        self.assertEqual(output_utilities.export_tallies(self.mc_data, path, fmt), fmt)
+        self.assertEqual(output_utilities.detect_export_format(path), fmt)
+        read, read_metadata = output_utilities.read_tally_export(path)
+        self.assertEqual(read_metadata, metadata)
+        self.assertEqual(list(read.columns), mor.TALLY_COLUMNS)
+        self.assertEqual(len(read), len(data))
+        self.assertAlmostEqual(read["result"].sum(), data["result"].sum())
+
+        four, _ = output_utilities.read_tally_export(path, tallies=[4], columns=["tally", "result"])
+        self.assertEqual(list(four.columns), ["tally", "result"])
+        self.assertEqual(len(four), (data["tally"] == 4).sum())
+        self.assertEqual(set(four["tally"]), {4})
+
+    @unittest.skipUnless(HAS_PYARROW, "needs pyarrow")
+    def test_parquet(self):
+        self.round_trip("parquet")
+        self.assertTrue(os.path.isdir(os.path.join(self.tmp.name, "tallies", "tally=4")))
+
+    @unittest.skipUnless(HAS_PYARROW, "needs pyarrow")
+    def test_feather(self):
+        self.round_trip("feather")
+        path = os.path.join(self.tmp.name, "tallies")
+        table, metadata = output_utilities.read_tally_export(path, as_arrow=True)
+        self.assertEqual(table.num_rows, sum(len(mor.tally_to_dataframe(t))
+                                             for t in self.mc_data.tally_data))
+        self.assertEqual(metadata["nps"], "1000000")
+
+    @unittest.skipUnless(HAS_TABLES, "needs tables")
+    def test_hdf5(self):
+        self.round_trip("hdf5")
+
+    def test_labelled_bins(self):
+        # lattice element bins are labels such as 1<2[0 0 0]<3, not numbers
+        path = synthetic_files.write_mcnp_output(os.path.join(self.tmp.name, "lat.io"),
+                                                 cells=2, lattice=(2, 2, 1))
+        mc_data = mor.read_output_file(path)
+        labels = mc_data.tally_data[0].cells
+        data, _ = output_utilities.tallies_frame(mc_data)
+        self.assertEqual(data["object"].tolist(), labels)
+        self.assertEqual(output_utilities.tallies_frame(self.mc_data)[0]["object"].iloc[0], "1")
+        for fmt in output_utilities.available_export_formats():
+            export = os.path.join(self.tmp.name, fmt)
+            output_utilities.export_tallies(mc_data, export, fmt)
+            read, _ = output_utilities.read_tally_export(export)
+            self.assertEqual(read["object"].tolist(), labels)
+
+
 if __name__ == '__main__':
     unittest.main()
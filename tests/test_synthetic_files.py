@@ -0,0 +1,181 @@
+import os
+import tempfile
+import unittest
+from neutron_tools.utilities import synthetic_files
+from neutron_tools.mcnp import mcnp_output_reader
+from neutron_tools.mcnp import mcnp_mctal_reader
+from neutron_tools.mcnp import meshtal_analysis
+from neutron_tools.mcnp import mcnp_ptrac_reader
+from neutron_tools.mcnp import mcnp_input_reader
+from neutron_tools.fispact import fispact_output_reader
+from neutron_tools.fispact import fispact_printlib_reader
+from neutron_tools.nuclear_data_readers import xsdir_reader
+
+
+class synthetic_test_case(unittest.TestCase):
+    """ base case writing files to a temporary directory """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+
+class mcnp_output_test_case(synthetic_test_case):
+    """ tests the synthetic MCNP output is read back """
+
+    def test_single_values(self):
+        path = synthetic_files.write_mcnp_output(self.path("out.io"), tallies=3, cells=7,
+                                                 rendezvous=12)
+        mc_data = mcnp_output_reader.read_output_file(path)
+        self.assertEqual(mc_data.tally_numbers, [4, 14, 24])
+        self.assertEqual(mc_data.num_rendevous, 12)
+        self.assertEqual(len(mc_data.t60), 7)
+        self.assertEqual(mc_data.summary_data[0].nps, 1000000)
+        tally = mc_data.tally_data[0]
+        self.assertEqual(len(tally.cells), 7)
+        self.assertEqual(len(tally.stat_tests), 10)
+        self.assertEqual([tfc.number for tfc in mc_data.tfc_data], [4, 14, 24])
+
+    def test_energy_time_bins(self):
+        path = synthetic_files.write_mcnp_output(self.path("out.io"), cells=6, energies=4,
+                                                 times=7)
+        tally = mcnp_output_reader.read_output_file(path).tally_data[0]
+        self.assertEqual(len(tally.result), 6)
+        self.assertEqual(tally.eng, [0.1, 0.2, 0.3, 0.4])
+        self.assertEqual(len(tally.times), 7)
+
+    def test_lattice(self):
+        path = synthetic_files.write_mcnp_output(self.path("out.io"), lattice=(17, 17, 2),
+                                                 energies=3)
+        tally = mcnp_output_reader.read_output_file(path).tally_data[0]
+        self.assertEqual(len(tally.cells), 578)
+        self.assertEqual(tally.cells[17], "1<2[0 1 0]<3")
+        self.assertEqual(tally.lattice_grid()[0].shape, (1, 17, 17, 2, 3))
+
+    def test_printouts(self):
+        path = synthetic_files.write_mcnp_output(self.path("out.io"), cells=3, energies=2,
+                                                 rendezvous=20, printouts=4)
+        history = mcnp_output_reader.read_tally_history(path, 4)
+        self.assertEqual(len(history.nps), 4)
+        self.assertEqual(history.nps[-1], 1000000)
+        self.assertEqual(history.result.shape, (4, 9))
+
+    def test_mctal(self):
+        path = synthetic_files.write_mctal(self.path("mctal"), tallies=2, cells=6, energies=3)
+        mc_data = mcnp_mctal_reader.read_mctal(path)
+        self.assertEqual(mc_data.tally_numbers, [4, 14])
+        tally = mc_data.tally_data[1]
+        self.assertEqual(len(tally.cells), 6)
+        self.assertEqual(tally.eng, [0.1, 0.2, 0.3])
+        self.assertEqual(len(mc_data.tfc_data[0].nps), 10)
+
+    def test_deterministic(self):
+        first = synthetic_files.write_mcnp_output(self.path("a.io"), cells=5, times=3)
+        second = synthetic_files.write_mcnp_output(self.path("b.io"), cells=5, times=3)
+        other = synthetic_files.write_mcnp_output(self.path("c.io"), cells=5, times=3, seed=1)
+        with open(first) as a, open(second) as b, open(other) as c:
+            text = a.read()
+            self.assertEqual(text, b.read())
+            self.assertNotEqual(text, c.read())
+
+
+class meshtal_test_case(synthetic_test_case):
+    """ tests the synthetic meshtal files are read back """
+
+    def test_energy_bins(self):
+        path = synthetic_files.write_meshtal(self.path("meshtal"), (3, 4, 5), energies=3)
+        mesh = meshtal_analysis.read_meshtally_file(path)[0]
+        self.assertEqual(mesh.ctype, "6col_e")
+        self.assertEqual(len(mesh.data), 3 * 60)
+        self.assertEqual(len(mesh.x_bounds), 4)
+        self.assertEqual(len(mesh.e_bounds), 4)
+
+    def test_time_bins(self):
+        path = synthetic_files.write_meshtal(self.path("meshtal"), (2, 2, 2), times=4)
+        mesh = meshtal_analysis.read_meshtally_file(path)[0]
+        self.assertEqual(mesh.ctype, "6col_t")
+        self.assertEqual(len(mesh.data), 4 * 8)
+
+    def test_energy_and_time(self):
+        with self.assertRaises(ValueError):
+            synthetic_files.write_meshtal(self.path("meshtal"), energies=2, times=2)
+
+
+class ptrac_test_case(synthetic_test_case):
+    """ tests the synthetic PTRAC file is read back """
+
+    def test_histories(self):
+        path = synthetic_files.write_ptrac(self.path("ptrac"), histories=25, events=4)
+        histories = mcnp_ptrac_reader.read_ptrac(path)
+        self.assertEqual([h.nps for h in histories], list(range(1, 26)))
+        # the event line gives the type of the next event, 9000 ends a history
+        self.assertTrue(all(h.events[-1].type == 9000 for h in histories))
+        self.assertEqual(histories[0].events[0].x, 0.0)
+        self.assertTrue(all(len(h.events) >= 2 for h in histories))
+
+    def test_fortran_format(self):
+        row = synthetic_files.fortran_e([2.5424, -0.97993, 0.0, 0.999999, 1e-5, 1.0, 2.0, 3.0, 4.0])[0]
+        text = synthetic_files.PTRAC_FLOATS % tuple(row)
+        self.assertEqual(text[:42], "   0.25424E+01  -0.97993E+00   0.00000E+00")
+        self.assertEqual(text[42:56], "   0.10000E+01")
+
+
+class fispact_test_case(synthetic_test_case):
+    """ tests the synthetic FISPACT-II output is read back """
+
+    def test_steps(self):
+        path = synthetic_files.write_fispact_output(self.path("fis.out"), steps=4, nuclides=30)
+        fo = fispact_output_reader.read_fis_out(path)
+        self.assertTrue(fo.isFisII)
+        self.assertEqual(len(fo.timestep_data), 4)
+        self.assertEqual(len(fo.sumdat), 4)
+        self.assertEqual(fo.num_irrad_step, 2)
+        self.assertEqual(fo.cooling_step_index, 2)
+        step = fo.timestep_data[0]
+        self.assertEqual(step.num_nuclides, 30)
+        self.assertEqual(len(step.inventory), 30)
+        self.assertEqual(step.step_length, 600.0)
+        self.assertEqual(len(step.gspec), 24)
+        self.assertEqual(len(step.dom_data), 26)
+
+    def test_nuclide_names(self):
+        names = synthetic_files.nuclide_names(2000)
+        self.assertEqual(len(set(names)), 2000)
+        self.assertTrue(all(len(name) == 6 for name in names))
+
+
+
+class small_formats_test_case(synthetic_test_case):
+    """ tests the synthetic input, xsdir and printlib files are read back """
+
+    def test_mcnp_input(self):
+        path = synthetic_files.write_mcnp_input(self.path("in.i"), cells=40, materials=4)
+        mc_in = mcnp_input_reader.read_mcnp_input(path)
+        self.assertEqual(len(mc_in.cells), 42)
+        self.assertEqual(len(mc_in.surfaces_dict), 41)
+        self.assertEqual(len(mc_in.materials), 4)
+        self.assertEqual(len(mc_in.tallies[4].cells), 40)
+
+    def test_xsdir(self):
+        path = synthetic_files.write_xsdir(self.path("xsdir"), entries=101)
+        xs = xsdir_reader.XSDir.from_file(path)
+        self.assertEqual(len(xs.directory), 101)
+        self.assertEqual(len(xs.awr), 26)
+        self.assertEqual(xs.awr["H-1"], 0.999167)
+        self.assertTrue(xs.is_nuclide_in_directory_and_library("1001.80c"))
+
+    def test_printlib(self):
+        path = synthetic_files.write_printlib(self.path("printlib"), nuclides=20, lines=5)
+        data = fispact_printlib_reader.read_fispact_printlib(path)
+        self.assertEqual(len(data), 100)
+        self.assertEqual(data["nuclide"].nunique(), 20)
+        self.assertEqual(set(data["particle"]), {"gamma", "beta"})
+
+
+if __name__ == '__main__':
+    unittest.main()